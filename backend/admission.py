@@ -0,0 +1,151 @@
+# admission.py
+# ================================================
+# 추천 엔드포인트 앞단 동시성 제한 + 대기열 (load shedding)
+# - 동시에 max_concurrent 개까지만 추천 계산 실행
+# - 나머지는 최대 max_queue 개까지 queue_timeout 동안 대기
+#   대기열은 FIFO: 슬롯이 비면 가장 먼저 온 대기 요청에게 바로 넘겨줌
+#   (대기 요청이 있는 동안 새 요청은 빈 슬롯을 먼저 가져가지 못함)
+# - 대기열이 꽉 찼거나 대기 시간이 지나면 바로 거절 (Retry-After 포함)
+# - 요청 deadline 이 queue_timeout 보다 먼저 끝나면 그때까지만 기다림 (reason="deadline")
+# ================================================
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+
+class AdmissionRejected(Exception):
+    """대기열이 꽉 찼거나 대기 시간이 초과돼 요청을 거절할 때 사용"""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self):
+        self.event = threading.Event()
+        # 슬롯을 넘겨받았는지 (잠금 안에서만 바꾸고 읽음)
+        self.granted = False
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_sec: float,
+        shed_status_code: int = 503,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_sec = max(0.0, queue_timeout_sec)
+        self.shed_status_code = shed_status_code
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: Deque[_Waiter] = deque()
+
+        # 통계
+        self._admitted = 0
+        self._bypassed = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+        self._rejected_deadline = 0
+        self._max_queue_depth = 0
+        # 처리 시간 지수이동평균 (Retry-After 계산용)
+        self._avg_service_sec = 0.5
+
+    def _retry_after(self) -> int:
+        # 지금 대기열이 다 빠지는 데 걸릴 시간 추정 (최소 1초)
+        backlog = len(self._waiters) + self._active
+        est = backlog * self._avg_service_sec / self.max_concurrent
+        return max(1, int(math.ceil(est)))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        return AdmissionRejected(self.shed_status_code, self._retry_after(), reason)
+
+    @contextmanager
+    def slot(self, max_wait_sec: Optional[float] = None) -> Iterator[None]:
+        """
+        with ADMISSION.slot(): ... 형태로 사용.
+        슬롯을 못 얻으면 AdmissionRejected 발생
+        max_wait_sec: 요청 deadline 까지 남은 시간 (queue_timeout 보다 짧으면 그만큼만 대기)
+        """
+        wait_sec = self.queue_timeout_sec
+        by_deadline = max_wait_sec is not None and max_wait_sec < wait_sec
+        if by_deadline:
+            wait_sec = max(0.0, max_wait_sec)
+
+        waiter = None
+        with self._lock:
+            # 빈 슬롯이 있어도 앞선 대기 요청이 있으면 뒤에 줄 섬
+            # (대기 요청이 있으면 슬롯은 항상 다 차 있음 — 비는 즉시 넘겨주므로)
+            if self._active < self.max_concurrent and not self._waiters:
+                self._active += 1
+                self._admitted += 1
+            else:
+                if len(self._waiters) >= self.max_queue:
+                    self._rejected_queue_full += 1
+                    raise self._reject("queue_full")
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+
+        if waiter is not None:
+            waiter.event.wait(wait_sec)
+            with self._lock:
+                # 시간이 다 된 직후에 슬롯을 넘겨받았을 수도 있으므로 잠금 안에서 다시 확인
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    if by_deadline:
+                        self._rejected_deadline += 1
+                        raise self._reject("deadline")
+                    self._rejected_timeout += 1
+                    raise self._reject("queue_timeout")
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._avg_service_sec = 0.8 * self._avg_service_sec + 0.2 * elapsed
+                if self._waiters:
+                    # 슬롯을 반납하지 않고 맨 앞 대기 요청에게 그대로 넘김 (_active 그대로)
+                    nxt = self._waiters.popleft()
+                    nxt.granted = True
+                    self._admitted += 1
+                    nxt.event.set()
+                else:
+                    self._active -= 1
+
+    def record_bypass(self) -> None:
+        """룰 기반 응답처럼 대기열을 거치지 않은 요청 수 기록"""
+        with self._lock:
+            self._bypassed += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout_sec": self.queue_timeout_sec,
+                "active": self._active,
+                "queue_depth": len(self._waiters),
+                "max_queue_depth_seen": self._max_queue_depth,
+                "admitted": self._admitted,
+                "bypassed": self._bypassed,
+                "rejected_queue_full": self._rejected_queue_full,
+                "rejected_timeout": self._rejected_timeout,
+                "rejected_deadline": self._rejected_deadline,
+                "rejected_total": self._rejected_queue_full + self._rejected_timeout + self._rejected_deadline,
+                "avg_service_sec": round(self._avg_service_sec, 4),
+            }
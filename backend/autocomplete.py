@@ -0,0 +1,207 @@
+# autocomplete.py
+# ================================================
+# 검색창 자동완성 (GET /autocomplete)
+# - 장소 이름 / 태그 / 지역 이름을 인덱스 만들 때 한 번 prefix 인덱스로 만들어 둠
+# - 한글은 자모 단위로 풀어서 비교 → 입력 중인 음절도 맞음
+#     "성ㅅ" → ㅅㅓㅇㅅ  →  "성산일출봉"(ㅅㅓㅇㅅㅏㄴ...) 의 prefix
+#     "석"   → ㅅㅓㄱ    →  "서귀포"(ㅅㅓㄱㅜㅣ...) 의 prefix (받침이 다음 글자 초성이 되는 중간 상태)
+#   겹모음 / 겹받침도 나눠서 (ㅘ → ㅗㅏ, ㄺ → ㄹㄱ) 키보드로 치는 순서와 같게 맞춤
+# - 순위는 미리 정한 정적 인기도(prior) 순. 항목을 prior 순으로 번호를 매겨 두고
+#     키가 많은 prefix(= trie 의 큰 노드) : 종류별 상위 k 개 번호를 미리 보관
+#     키가 적은 prefix                 : 정렬된 키 배열에서 bisect 로 범위를 찾아 바로 고름
+#   → 요청마다 훑는 키 수가 일정해서 카탈로그가 커져도 1ms 미만
+# ================================================
+
+import heapq
+import sys
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+KINDS = ("area", "tag", "place")
+
+MAX_LIMIT = 20
+# 키가 이 수보다 많은 prefix 만 상위 후보를 미리 보관 (나머지는 요청 때 범위를 훑음)
+HEAVY_PREFIX_KEYS = 64
+
+# ------------------------------------------------
+# 1. 한글 자모 분해
+# ------------------------------------------------
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+
+# 겹모음 / 겹받침 → 입력 순서대로 나눈 자모
+_COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+
+def _split(jamo: str) -> str:
+    return _COMPOUND_JAMO.get(jamo, jamo)
+
+
+def decompose(text: str) -> str:
+    """
+    비교용 키: NFC 정규화 → 소문자 → 공백 제거 → 한글 음절은 호환 자모로 분해
+    (호환 자모로 직접 친 "ㅅ" 과 음절 안의 초성 ㅅ 이 같은 글자가 되도록)
+    """
+    out: List[str] = []
+    for ch in unicodedata.normalize("NFC", text).lower():
+        if ch.isspace():
+            continue
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            out.append(_CHOSEONG[offset // 588])
+            out.append(_split(_JUNGSEONG[(offset % 588) // 28]))
+            out.append(_split(_JONGSEONG[offset % 28]))
+        else:
+            out.append(_split(ch))
+    return "".join(out)
+
+
+# ------------------------------------------------
+# 2. prefix 인덱스
+# ------------------------------------------------
+
+class Suggestion(NamedTuple):
+    text: str
+    kind: str  # area / tag / place
+    prior: float
+    extra: Dict[str, object] = {}
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"text": self.text, "kind": self.kind, **self.extra}
+
+
+def suggestion_keys(text: str) -> List[str]:
+    """전체 이름 + 띄어쓰기로 나뉜 각 단어부터 시작하는 나머지 ("숙성도 중문점" → 중문점 으로도 찾음)"""
+    words = text.split()
+    keys = {decompose(" ".join(words[i:])) for i in range(len(words))}
+    return sorted(k for k in keys if k)
+
+
+class AutocompleteIndex:
+    def __init__(
+        self,
+        suggestions: Iterable[Suggestion],
+        top_k: int = MAX_LIMIT,
+        previous: Optional["AutocompleteIndex"] = None,
+    ):
+        """
+        previous: 이전 인덱스 (카탈로그 부분 갱신). 이름이 같은 항목은 자모 분해한 키를 그대로 씀
+        """
+        started = time.perf_counter()
+        # prior 높은 순 → 짧은 이름 → 가나다 순으로 번호 (번호가 작을수록 앞)
+        # 같은 종류·이름은 하나만 (장소는 id 가 다르면 따로)
+        unique: Dict[tuple, Suggestion] = {}
+        for s in suggestions:
+            key = (s.kind, s.text, s.extra.get("id"))
+            if key not in unique or unique[key].prior < s.prior:
+                unique[key] = s
+        self.entries: List[Suggestion] = sorted(
+            unique.values(), key=lambda s: (-s.prior, len(s.text), s.text, s.kind)
+        )
+        self.kind_of: List[int] = [KINDS.index(s.kind) for s in self.entries]
+
+        known = previous.keys_by_text() if previous is not None else {}
+        pairs = sorted(
+            (key, entry_id)
+            for entry_id, s in enumerate(self.entries)
+            for key in (known.get(s.text) or suggestion_keys(s.text))
+        )
+        self.keys: List[str] = [key for key, _ in pairs]
+        self.entry_ids: List[int] = [entry_id for _, entry_id in pairs]
+        self.top_k = top_k
+
+        # 큰 prefix 노드 → 종류별 상위 top_k 번호 (오름차순)
+        self.heavy: Dict[str, List[List[int]]] = {}
+        self._build_heavy(0, len(self.keys), 0)
+        self.build_ms = (time.perf_counter() - started) * 1000
+
+    def keys_by_text(self) -> Dict[str, set]:
+        """항목 이름 → 비교용 키 집합"""
+        known: Dict[str, set] = {}
+        for key, entry_id in zip(self.keys, self.entry_ids):
+            known.setdefault(self.entries[entry_id].text, set()).add(key)
+        return known
+
+    def _best(self, lo: int, hi: int) -> List[List[int]]:
+        by_kind: List[set] = [set() for _ in KINDS]
+        for entry_id in self.entry_ids[lo:hi]:
+            by_kind[self.kind_of[entry_id]].add(entry_id)
+        return [heapq.nsmallest(self.top_k, ids) for ids in by_kind]
+
+    def _build_heavy(self, lo: int, hi: int, depth: int) -> None:
+        """정렬된 키 [lo, hi) 가 같은 prefix(depth 글자)를 공유 → 다음 글자별로 나눠 내려감"""
+        if hi - lo <= HEAVY_PREFIX_KEYS:
+            return
+        if depth:
+            self.heavy[self.keys[lo][:depth]] = self._best(lo, hi)
+        start = lo
+        # 이 prefix 와 똑같은 키(더 짧아서 다음 글자가 없는 키)는 건너뜀
+        while start < hi and len(self.keys[start]) <= depth:
+            start += 1
+        while start < hi:
+            ch = self.keys[start][depth]
+            end = bisect_left(self.keys, self.keys[start][:depth] + chr(ord(ch) + 1), start, hi)
+            self._build_heavy(start, end, depth + 1)
+            start = end
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def suggest(self, query: str, limit: int = 8, kinds: Optional[Iterable[str]] = None) -> List[Suggestion]:
+        prefix = decompose(query)
+        if not prefix:
+            return []
+        limit = max(1, min(limit, self.top_k))
+        wanted = [KINDS.index(k) for k in (kinds or KINDS) if k in KINDS]
+
+        best = self.heavy.get(prefix)
+        if best is not None:
+            ids = heapq.nsmallest(limit, heapq.merge(*(best[k] for k in wanted)))
+        else:
+            lo, hi = self._range(prefix)
+            allowed = set(wanted)
+            ids = heapq.nsmallest(
+                limit, {e for e in self.entry_ids[lo:hi] if self.kind_of[e] in allowed}
+            )
+        return [self.entries[e] for e in ids]
+
+    @property
+    def nbytes(self) -> int:
+        """키 문자열 + 번호 목록 + 미리 보관한 상위 후보 (대략)"""
+        keys = sys.getsizeof(self.keys) + sum(sys.getsizeof(k) for k in self.keys)
+        ids = sys.getsizeof(self.entry_ids) + sys.getsizeof(self.kind_of)
+        heavy = sys.getsizeof(self.heavy) + sum(
+            sys.getsizeof(prefix) + sum(sys.getsizeof(ids_) for ids_ in best)
+            for prefix, best in self.heavy.items()
+        )
+        entries = sum(sys.getsizeof(s.text) for s in self.entries)
+        return int(keys + ids + heavy + entries)
+
+    def stats(self) -> Dict[str, object]:
+        counts = {kind: 0 for kind in KINDS}
+        for s in self.entries:
+            counts[s.kind] += 1
+        return {
+            "entries": counts,
+            "keys": len(self.keys),
+            "heavy_prefixes": len(self.heavy),
+            "bytes": self.nbytes,
+            "build_ms": round(self.build_ms, 2),
+        }
@@ -0,0 +1,755 @@
+# benchmarks.py
+# ================================================
+# 백엔드 성능 측정 스크립트
+#   python benchmarks.py tag-matrix
+#   python benchmarks.py memory
+#   python benchmarks.py catalog-load
+#   python benchmarks.py scorers
+#   python benchmarks.py shards
+#   python benchmarks.py facets
+#   python benchmarks.py autocomplete
+#   python benchmarks.py result-cache
+#   python benchmarks.py interactions
+#   python benchmarks.py nearby
+#   python benchmarks.py ingest
+#   python benchmarks.py payload
+#   python benchmarks.py regions
+# ================================================
+
+import argparse
+import itertools
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from typing import Callable, Dict, List
+
+warnings.filterwarnings("ignore")
+
+
+def _time_per_call_ms(fn: Callable[[], object], repeat: int) -> float:
+    fn()  # 첫 호출(캐시/할당) 제외
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+# ------------------------------------------------
+# 1. 태그 점수 행렬 vs transform + linear_kernel
+# ------------------------------------------------
+
+def bench_tag_matrix(repeat: int) -> None:
+    import numpy as np
+    from sklearn.metrics.pairwise import linear_kernel
+
+    from catalog_io import load_catalog
+    from recommender import prepare_catalog, tag_query_texts
+    from scorers import TfidfScorer
+    from settings import settings
+    from tags import BASE_TAGS, build_query_from_tags
+
+    df, _ = prepare_catalog(load_catalog(settings.catalog_path))
+    scorer = TfidfScorer(df["search_text"], tag_query_texts())
+    tags = sorted(t["key"] for t in BASE_TAGS if t["key"] != "더보기")
+    queries: List[List[str]] = [list(c) for c in itertools.combinations(tags, 1)]
+    queries += [list(c) for c in itertools.combinations(tags, 2)][:20]
+
+    def transform_path(q: List[str]):
+        query_text, _ = build_query_from_tags(q)
+        return linear_kernel(scorer.vectorizer.transform([query_text]), scorer.matrix).ravel()
+
+    def matrix_path(q: List[str]):
+        return scorer.tag_scores.score(q)
+
+    same_order = 0
+    for q in queries:
+        ref = transform_path(q)
+        got = matrix_path(q).astype(np.float64)
+        if np.array_equal(np.argsort(-ref, kind="stable"), np.argsort(-got, kind="stable")):
+            same_order += 1
+
+    results: Dict[str, float] = {
+        "transform + linear_kernel": sum(_time_per_call_ms(lambda q=q: transform_path(q), repeat) for q in queries) / len(queries),
+        "tag_scores.score": sum(_time_per_call_ms(lambda q=q: matrix_path(q), repeat) for q in queries) / len(queries),
+    }
+
+    print(f"places={scorer.matrix.shape[0]} vocab={scorer.matrix.shape[1]} "
+          f"tags={len(scorer.tag_scores.tags)} matrix_bytes={scorer.tag_scores.nbytes}")
+    print(f"queries={len(queries)} same_ranking={same_order}/{len(queries)}")
+    for name, ms in results.items():
+        print(f"  {name:<28} {ms:8.4f} ms/query")
+    print(f"  speedup x{results['transform + linear_kernel'] / results['tag_scores.score']:.1f}")
+
+
+# ------------------------------------------------
+# 2. 카탈로그 메모리 (기존 레이아웃 vs compact 레이아웃)
+# ------------------------------------------------
+
+def _synthetic_raw_catalog(n_rows: int):
+    """현재 CSV 를 n_rows 까지 복제 (id/name 은 서로 다르게)"""
+    import pandas as pd
+
+    from catalog_io import load_catalog
+    from settings import settings
+
+    base = load_catalog(settings.catalog_path, columns=None)
+    reps = -(-n_rows // len(base))
+    raw = pd.concat([base] * reps, ignore_index=True).head(n_rows).copy()
+    suffix = pd.Series(range(n_rows), dtype="int64").astype(str)
+    raw["id"] = raw["id"].astype(str) + "-" + suffix
+    raw["name"] = raw["name"].astype(str) + " " + suffix
+    return raw
+
+
+def _matrix_nbytes(m) -> int:
+    return int(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes)
+
+
+def bench_memory(repeat: int) -> None:
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    import recommender
+
+    for n_rows in (10_000, 100_000):
+        raw, _ = recommender.prepare_catalog(_synthetic_raw_catalog(n_rows))
+
+        # 기존: object 문자열 + search_text 유지 + float64 행렬
+        before_df = raw.astype({c: object for c in raw.columns if raw[c].dtype != np.float64})
+        before_matrix = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b").fit_transform(before_df["search_text"])
+
+        # compact: category 코드 + arrow 문자열, search_text 제거, float32 행렬
+        after_matrix = TfidfVectorizer(
+            token_pattern=r"(?u)\b\w+\b", dtype=np.float32
+        ).fit_transform(raw["search_text"])
+        after_df = recommender.compact_catalog(raw.drop(columns=["search_text"]))
+
+        rows = {
+            "before": (int(before_df.memory_usage(deep=True).sum()), _matrix_nbytes(before_matrix)),
+            "after": (int(after_df.memory_usage(deep=True).sum()), _matrix_nbytes(after_matrix)),
+        }
+        print(f"rows={n_rows}")
+        for name, (frame_bytes, matrix_bytes) in rows.items():
+            total = frame_bytes + matrix_bytes
+            print(f"  {name:<7} frame={frame_bytes / n_rows:8.1f} B/place "
+                  f"matrix={matrix_bytes / n_rows:8.1f} B/place "
+                  f"total={total / n_rows:8.1f} B/place ({total / 2**20:.1f} MiB)")
+        b, a = sum(rows["before"]), sum(rows["after"])
+        print(f"  saved {100 * (1 - a / b):.1f}%")
+
+
+# ------------------------------------------------
+# 3. 카탈로그 로드 시간 / 최대 메모리 (CSV vs Parquet vs Arrow IPC)
+# ------------------------------------------------
+
+def _measure_load(mode: str, path: str) -> Dict[str, float]:
+    """별도 프로세스에서 한 번 로드하고 시간 + 최대 RSS 증가량 측정"""
+    out = subprocess.run(
+        [sys.executable, __file__, "_load", "--mode", mode, "--path", path],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _peak_rss_kib() -> int:
+    # ru_maxrss 는 exec 전 부모 프로세스 값을 물려받을 수 있어서 VmHWM 을 우선 사용
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _load_once(mode: str, path: str) -> None:
+    import pandas as pd
+
+    from catalog_io import load_catalog
+
+    base_rss = _peak_rss_kib()
+    started = time.perf_counter()
+    if mode == "read_csv":
+        frame = pd.read_csv(path)
+    else:
+        frame = load_catalog(path)
+    elapsed = time.perf_counter() - started
+    peak_rss = _peak_rss_kib()
+    print(json.dumps({
+        "sec": elapsed,
+        "peak_mib": (peak_rss - base_rss) / 1024,
+        "rows": len(frame),
+        "cols": len(frame.columns),
+    }))
+
+
+def bench_catalog_load(repeat: int) -> None:
+    from pathlib import Path
+
+    from catalog_io import convert_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in (100_000, 500_000):
+            csv_path = Path(tmp) / f"catalog_{n_rows}.csv"
+            _synthetic_raw_catalog(n_rows).to_csv(csv_path, index=False, encoding="utf-8-sig")
+            parquet_path = convert_csv(csv_path, Path(tmp) / f"catalog_{n_rows}.parquet")
+            arrow_path = convert_csv(csv_path, Path(tmp) / f"catalog_{n_rows}.arrow")
+
+            cases = [
+                ("pd.read_csv (all columns)", "read_csv", csv_path),
+                ("load_catalog csv", "load_catalog", csv_path),
+                ("load_catalog parquet", "load_catalog", parquet_path),
+                ("load_catalog arrow ipc", "load_catalog", arrow_path),
+            ]
+            print(f"rows={n_rows} csv={csv_path.stat().st_size / 2**20:.1f} MiB "
+                  f"parquet={parquet_path.stat().st_size / 2**20:.1f} MiB "
+                  f"arrow={arrow_path.stat().st_size / 2**20:.1f} MiB")
+            for label, mode, path in cases:
+                runs = [_measure_load(mode, str(path)) for _ in range(max(1, min(repeat, 3)))]
+                best = min(runs, key=lambda r: r["sec"])
+                print(f"  {label:<28} {best['sec'] * 1000:9.1f} ms  peak +{best['peak_mib']:7.1f} MiB  "
+                      f"cols={best['cols']}")
+
+
+# ------------------------------------------------
+# 4. 검색 점수 계산기 (TF-IDF vs BM25 uint8)
+# ------------------------------------------------
+
+# 고정 쿼리 세트: 태그 1개 / 태그 2개 / 자유 문장 (freeText)
+SCORER_FREE_TEXTS = [
+    "바다 보이는 조용한 카페",
+    "아이랑 가기 좋은 체험",
+    "비 오는 날 실내 데이트",
+    "흑돼지 맛집",
+    "오름 일출 산책",
+    "감성 숙소 오션뷰",
+    "현지인 국수 맛집",
+    "해변 근처 게스트하우스",
+    "숲길 걷기 힐링",
+    "전통시장 먹거리",
+]
+
+
+def _scorer_queries() -> List[str]:
+    from tags import BASE_TAGS, build_query_from_tags
+
+    tags = sorted(t["key"] for t in BASE_TAGS if t["key"] != "더보기")
+    queries = [build_query_from_tags([t])[0] for t in tags]
+    queries += [build_query_from_tags(list(c))[0] for c in itertools.combinations(tags, 2)][:20]
+    queries += [build_query_from_tags([], free_text=text)[0] for text in SCORER_FREE_TEXTS]
+    return [q for q in queries if q.strip()]
+
+
+def _top_k(scores, k: int):
+    import numpy as np
+
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [int(i) for i in order if scores[i] > 0]
+
+
+def _overlap(a: List[int], b: List[int]) -> float:
+    """두 top-k 목록이 겹치는 비율 (점수가 있는 후보가 k 개보다 적으면 더 긴 목록 기준)"""
+    if not a and not b:
+        return 1.0
+    return len(set(a) & set(b)) / max(len(a), len(b))
+
+
+def bench_scorers(repeat: int) -> None:
+    import numpy as np
+
+    from catalog_io import load_catalog
+    from recommender import prepare_catalog, tag_query_texts
+    from scorers import BM25Scorer, TfidfScorer, bm25_impacts
+    from settings import settings
+
+    df, _ = prepare_catalog(load_catalog(settings.catalog_path))
+    texts = df["search_text"]
+    rows = list(range(len(df)))
+    queries = _scorer_queries()
+
+    built: Dict[str, object] = {}
+    build_ms: Dict[str, float] = {}
+    for name, make in (
+        ("tfidf", lambda: TfidfScorer(texts, tag_query_texts())),
+        ("bm25", lambda: BM25Scorer(texts, k1=settings.bm25_k1, b=settings.bm25_b)),
+    ):
+        started = time.perf_counter()
+        built[name] = make()
+        build_ms[name] = (time.perf_counter() - started) * 1000
+
+    # 양자화 오차: 같은 BM25 를 float64 impact 로 계산한 것과 top-10 비교
+    bm25 = built["bm25"]
+    exact_impacts, _ = bm25_impacts(bm25.vectorizer.transform(texts).tocsc(), bm25.k1, bm25.b)
+    exact_overlap = []
+    for q in queries:
+        terms = bm25.query_terms(q)
+        cols = list(terms)
+        exact = exact_impacts[:, cols] @ np.array([terms[j] for j in cols], dtype=np.float64)
+        exact_overlap.append(_overlap(_top_k(bm25.score_all(q), 10), _top_k(exact, 10)))
+
+    print(f"places={len(df)} queries={len(queries)} (tags 1개/2개 + 자유 문장 {len(SCORER_FREE_TEXTS)}개)")
+    for name, scorer in built.items():
+        per_query = sum(
+            _time_per_call_ms(lambda q=q: scorer.score(q, rows), repeat) for q in queries
+        ) / len(queries)
+        print(f"  {name:<6} build={build_ms[name]:7.1f} ms  score={per_query:7.4f} ms/query  "
+              f"index={scorer.nbytes / 1024:8.1f} KiB  vocab={scorer.vocabulary_size}")
+
+    for k in (5, 10, 20):
+        overlaps = [
+            _overlap(_top_k(built["tfidf"].score(q, rows), k), _top_k(built["bm25"].score(q, rows), k))
+            for q in queries
+        ]
+        print(f"  top-{k:<2} overlap tfidf↔bm25: mean={np.mean(overlaps):.3f} min={np.min(overlaps):.3f}")
+    print(f"  top-10 overlap bm25 uint8↔float64: mean={np.mean(exact_overlap):.3f} min={np.min(exact_overlap):.3f}")
+
+
+# ------------------------------------------------
+# 5. 사분면 shard scatter-gather vs 전체 한 번에 정렬
+# ------------------------------------------------
+
+def bench_shards(repeat: int) -> None:
+    import os
+
+    import recommender
+    from settings import settings
+    from shards import ShardedScorer
+    from tags import BASE_TAGS
+
+    tags = sorted(t["key"] for t in BASE_TAGS if t["key"] != "더보기")
+    cases = [
+        ("tags only", dict(selected_tags=tags[:2])),
+        ("free text", dict(selected_tags=tags[:1], free_text="바다 보이는 조용한 카페")),
+        ("1 subregion", dict(selected_tags=tags[:1], free_text="산책", region_filter_subregions=["제주 서"])),
+    ]
+    top_k = 3 * (3 + 2)  # 3일 × (하루 3곳 + 맛집·숙소)
+    workers = settings.shard_workers or min(5, os.cpu_count() or 1)
+    print(f"cpus={os.cpu_count()} workers={workers} top_k={top_k}")
+
+    for n_rows in (10_000, 100_000):
+        index = recommender.build_index_from_frame(_synthetic_raw_catalog(n_rows), source="synthetic")
+        sharded: ShardedScorer = index.scorer
+        print(f"rows={n_rows} shards=" + ", ".join(f"{n}:{len(s.rows)}" for n, s in sharded.shards.items()))
+        n = max(3, repeat // 20)
+        for label, kwargs in cases:
+            results: Dict[str, float] = {
+                "unsharded (pandas sort)": _time_per_call_ms(lambda: index.rank_candidates_unsharded(**kwargs), n),
+            }
+            sharded.parallel_min_rows = 1 << 62
+            results["shards serial + top_k"] = _time_per_call_ms(lambda: index.rank_candidates(**kwargs, top_k=top_k), n)
+            if workers > 1:
+                sharded.workers = workers
+                sharded.parallel_min_rows = 0
+                results["shards parallel + top_k"] = _time_per_call_ms(lambda: index.rank_candidates(**kwargs, top_k=top_k), n)
+            print(f"  {label}")
+            for name, ms in results.items():
+                print(f"    {name:<26} {ms:9.2f} ms")
+        for name, shard in sharded.shards.items():
+            st = shard.stats()
+            print(f"  shard {name:<6} rows={st['rows']:7d} avg={st['avg_ms']} ms max={st['max_ms']} ms")
+
+
+# ------------------------------------------------
+# 6. facet 개수 (bitset vs pandas 문자열 검색)
+# ------------------------------------------------
+
+def bench_facets(repeat: int) -> None:
+    import recommender
+    from places import PlaceCatalog
+
+    filters = [
+        ("no filter", [], [], []),
+        ("subregion", [], [], ["서귀포 서"]),
+        ("subregion + tag", [], ["반려동물 동반"], ["서귀포 서"]),
+        ("category + 2 tags", ["food"], ["가족여행", "한식"], []),
+    ]
+    for n_rows in (10_000, 100_000):
+        prepared, _ = recommender.prepare_catalog(_synthetic_raw_catalog(n_rows))
+        df = recommender.compact_catalog(prepared.drop(columns=["search_text"]))
+        started = time.perf_counter()
+        catalog = PlaceCatalog(df, "bench")
+        build_ms = (time.perf_counter() - started) * 1000
+        facets = catalog.facets
+        tag_values = list(facets.values["tag"])
+
+        def pandas_counts(categories, tags, subregions):
+            mask = df["subregion"].isin(subregions) if subregions else None
+            base = df if mask is None else df[mask]
+            if categories:
+                base = base[base["category"].isin(categories) | base["category_mapped"].isin(categories)]
+            for tag in tags:
+                base = base[base["tags"].str.contains(tag, regex=False)]
+            return {tag: int(base["tags"].str.contains(tag, regex=False).sum()) for tag in tag_values}
+
+        print(f"rows={n_rows} tags={len(tag_values)} build={build_ms:.1f} ms facet_bytes={facets.nbytes / 1024:.1f} KiB")
+        n = max(3, repeat // 10)
+        for label, categories, tags, subregions in filters:
+            bitset_ms = _time_per_call_ms(lambda: facets.counts(categories, tags, subregions), repeat)
+            pandas_ms = _time_per_call_ms(lambda: pandas_counts(categories, tags, subregions), n)
+            print(f"  {label:<18} bitset={bitset_ms * 1000:9.1f} µs  pandas={pandas_ms:8.2f} ms  "
+                  f"x{pandas_ms / bitset_ms:.0f}")
+
+
+def bench_autocomplete(repeat: int) -> None:
+    import recommender
+    from autocomplete import decompose
+    from places import PlaceCatalog
+
+    queries = ["ㅅ", "성ㅅ", "석", "제주", "흑ㄷ", "애월", "가족여", "우도 1"]
+    for n_rows in (10_000, 100_000):
+        prepared, _ = recommender.prepare_catalog(_synthetic_raw_catalog(n_rows))
+        df = recommender.compact_catalog(prepared.drop(columns=["search_text"]))
+        index = recommender.build_autocomplete(df, PlaceCatalog(df, "bench"))
+        stats = index.stats()
+
+        # 비교: 이름마다 자모 키를 들고 전체를 훑는 방식
+        names = [(decompose(s.text), i) for i, s in enumerate(index.entries)]
+
+        def scan(query):
+            prefix = decompose(query)
+            return [i for key, i in names if key.startswith(prefix)][:8]
+
+        print(f"rows={n_rows} keys={stats['keys']} heavy={stats['heavy_prefixes']} "
+              f"build={stats['build_ms']:.0f} ms bytes={stats['bytes'] / 1024 / 1024:.1f} MiB")
+        n = max(3, repeat // 10)
+        for query in queries:
+            index_ms = _time_per_call_ms(lambda: index.suggest(query, 8), repeat)
+            scan_ms = _time_per_call_ms(lambda: scan(query), n)
+            print(f"  {query:<6} index={index_ms * 1000:7.1f} µs  scan={scan_ms:7.2f} ms  "
+                  f"x{scan_ms / index_ms:.0f}")
+
+
+# ------------------------------------------------
+# 8. 추천 결과 캐시 (로컬 LRU / 공유 RESP 서버 / 공유 서버 장애)
+# ------------------------------------------------
+
+def bench_result_cache(repeat: int) -> None:
+    import recommender
+    import resp_server
+    from result_cache import build_result_cache, make_cache_key
+
+    index = recommender.build_index_from_frame(_synthetic_raw_catalog(10_000), source="synthetic")
+    kwargs = dict(selected_tags=["자연"], days=3, max_places_per_day=3, free_text="바다 보이는 조용한 카페")
+    key = make_cache_key("bench:", index.version, sorted(kwargs.items()))
+    days = index.recommend_days(**kwargs)
+    blob = index.encode_days(days)
+    n = max(3, repeat // 10)
+
+    server = resp_server.start_background()
+    try:
+        cache = build_result_cache(16, server.url, timeout_ms=20)
+        cache.put(key, days, index.encode_days)
+        cache.shared.flush()
+        items = sum(len(d.items) for d in days)
+        print(f"items={items} value={len(blob)} bytes "
+              f"(JSON {len(json.dumps([d.model_dump() for d in days], ensure_ascii=False).encode())} bytes)")
+
+        def shared_hit():
+            cache.local = type(cache.local)(16)  # 다른 워커 흉내 (로컬은 비어 있음)
+            return cache.get(key, index.decode_days)
+
+        results = {
+            "compute (recommend_days)": _time_per_call_ms(lambda: index.recommend_days(**kwargs), n),
+            "local LRU hit": _time_per_call_ms(lambda: cache.get(key, index.decode_days), repeat),
+            "shared hit (GET + decode)": _time_per_call_ms(shared_hit, repeat),
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # 공유 서버 장애: 응답 지연 (timeout 까지만 기다린 뒤 breaker 가 열림) / 서버 없음
+    slow = resp_server.start_background(delay_ms=200)
+    try:
+        for label, url in (("shared slow (200 ms)", slow.url), ("shared down", server.url)):
+            cache = build_result_cache(16, url, timeout_ms=20)
+            timings = []
+            for _ in range(6):
+                started = time.perf_counter()
+                cache.get(key, index.decode_days)
+                timings.append((time.perf_counter() - started) * 1000)
+            breaker = cache.shared.breaker.stats()["state"]
+            print(f"  {label:<22} miss timings=" + ", ".join(f"{t:.1f}" for t in timings) + f" ms breaker={breaker}")
+    finally:
+        slow.shutdown()
+        slow.server_close()
+    for name, ms in results.items():
+        print(f"  {name:<26} {ms:9.3f} ms")
+
+
+# ------------------------------------------------
+# 9. 이벤트 기록 / 인기도 집계 / 인기도를 섞은 랭킹
+# ------------------------------------------------
+
+def bench_interactions(repeat: int) -> None:
+    import os
+
+    import numpy as np
+
+    import recommender
+    from interactions import InteractionLog, PopularityFolder
+    from settings import settings
+
+    index = recommender.build_index_from_frame(_synthetic_raw_catalog(100_000), source="synthetic")
+    ids = index.df["id"].tolist()
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "interactions.log")
+        log = InteractionLog(path, queue_size=100_000, batch_size=256, flush_interval_sec=0.05)
+        n_events = 200_000
+        picks = rng.integers(0, len(ids), n_events)
+        started = time.perf_counter()
+        accepted = sum(log.record("view" if i % 4 else "accept", ids[p]) for i, p in enumerate(picks))
+        record_us = (time.perf_counter() - started) / n_events * 1e6
+        log.flush(timeout_sec=60)
+        st = log.stats()
+        print(f"record: {record_us:.2f} µs/event accepted={accepted} dropped={st['dropped']} "
+              f"batches={st['batches']} log={os.path.getsize(path) / 1024 / 1024:.1f} MiB")
+
+        folder = PopularityFolder(path)
+        started = time.perf_counter()
+        folder.fold()
+        fold_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        index.set_popularity(folder.counts(), folder.version)
+        publish_ms = (time.perf_counter() - started) * 1000
+        print(f"fold (full log): {fold_ms:.0f} ms  set_popularity: {publish_ms:.1f} ms  places={len(folder.counts())}")
+
+    kwargs = dict(selected_tags=["자연"], free_text="바다 보이는 조용한 카페", top_k=15)
+    n = max(3, repeat // 20)
+    index.scorer.set_boost(None)
+    plain_ms = _time_per_call_ms(lambda: index.rank_candidates(**kwargs), n)
+    index.scorer.set_boost(index.popularity.astype(np.float64) * max(settings.popularity_weight, 0.1), tag="bench")
+    boosted_ms = _time_per_call_ms(lambda: index.rank_candidates(**kwargs), n)
+    print(f"rank_candidates rows={len(ids)}: similarity only={plain_ms:.2f} ms  + popularity={boosted_ms:.2f} ms")
+
+
+# ------------------------------------------------
+# 10. 관광지 근처 맛집 / 숙소 표
+# ------------------------------------------------
+
+def _haversine_km(lat1, lng1, lat2, lng2) -> float:
+    import math
+
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    h = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+def bench_nearby(repeat: int) -> None:
+    import numpy as np
+
+    import recommender
+    from nearby import NearbyTable
+    from settings import settings
+
+    # 1) 표 만들기 시간 / 크기 (복제한 장소는 좌표를 조금씩 흩뜨림)
+    rng = np.random.default_rng(0)
+    for n_rows in (10_000, 100_000):
+        df, _ = recommender.prepare_catalog(_synthetic_raw_catalog(n_rows))
+        lat = df["lat"].to_numpy(dtype=np.float64) + rng.normal(0, 0.02, n_rows)
+        lng = df["lng"].to_numpy(dtype=np.float64) + rng.normal(0, 0.02, n_rows)
+        table = NearbyTable(lat, lng, df["category_mapped"].astype(str).to_numpy(), k=settings.nearby_k)
+        print(f"rows={n_rows} k={table.k} build={table.build_ms:.0f} ms bytes={table.nbytes / 1024 / 1024:.1f} MiB")
+
+    # 2) 실제 카탈로그: 관광지 → 맛집 / 숙소 거리 (근처 표 사용 vs 사분면만)
+    index = recommender.build_index(settings.catalog_path)
+    queries = [
+        dict(selected_tags=["자연"], days=2),
+        dict(selected_tags=["가족여행"], days=3),
+        dict(selected_tags=["카페"], days=2, free_text="바다 보이는 조용한 카페"),
+        dict(selected_tags=["흑돼지"], days=2, region_filter_address="애월"),
+        dict(selected_tags=["휴식", "사진"], days=3),
+    ]
+    table = index.nearby
+    for label, nearby in (("subregion only", None), (f"nearby (≤{settings.nearby_max_km:g} km)", table)):
+        index.nearby = nearby
+        food_km, stay_km, sims = [], [], []
+        for q in queries:
+            for day in index.recommend_days(**q):
+                places = [i for i in day.items if i.category == "관광"]
+                if not places:
+                    continue
+                for item in day.items:
+                    if item.category == "식사":
+                        food_km.append(_haversine_km(places[0].lat, places[0].lng, item.lat, item.lng))
+                    elif item.category == "숙소":
+                        stay_km.append(_haversine_km(places[-1].lat, places[-1].lng, item.lat, item.lng))
+                    else:
+                        continue
+                    sims.append(item.similarity)
+        print(f"  {label:<20} food avg={np.mean(food_km):5.1f} km max={np.max(food_km):5.1f}  "
+              f"stay avg={np.mean(stay_km):5.1f} km max={np.max(stay_km):5.1f}  avg similarity={np.mean(sims):.3f}")
+    index.nearby = table
+
+
+# ------------------------------------------------
+# 11. 카탈로그 부분 갱신 vs 전체 다시 빌드
+# ------------------------------------------------
+
+def bench_ingest(repeat: int) -> None:
+    import numpy as np
+    import pandas as pd
+
+    import ingest
+    import recommender
+
+    rng = np.random.default_rng(0)
+    for n_rows in (10_000, 50_000):
+        raw = _synthetic_raw_catalog(n_rows)
+        index = recommender.build_index_from_frame(raw, source="bench")
+
+        # 1% 변경: 설명 수정 0.5% + 상세(전화번호)만 수정 0.25% + 추가 / 삭제 0.125% 씩
+        n = max(1, n_rows // 800)
+        new = raw.copy()
+        rows = rng.choice(n_rows, size=7 * n, replace=False)
+        text_rows, detail_rows, deleted = rows[: 4 * n], rows[4 * n: 6 * n], rows[6 * n:]
+        new.loc[text_rows, "descriptionShort"] = new.loc[rng.choice(n_rows, size=len(text_rows)), "descriptionShort"].to_numpy()
+        new.loc[detail_rows, "phone"] = "064-000-0000"
+        inserted = raw.iloc[rng.choice(n_rows, size=n)].copy()
+        inserted["id"] = [f"new-{i}" for i in range(n)]
+        new = pd.concat([new.drop(index=deleted), inserted], ignore_index=True)
+
+        _, delta_report = ingest.refresh_index(index, raw=new)
+        _, full_report = ingest.refresh_index(index, raw=new, force_full=True)
+        d = delta_report["delta"]
+        print(f"rows={n_rows} inserted={d['inserted']} updated={d['updated']} deleted={d['deleted']} "
+              f"new_terms={delta_report.get('new_terms', {}).get('count', 0)}")
+        print(f"  delta total={delta_report['total_ms']:.0f} ms  " + " ".join(
+            f"{k}={v:.0f}" for k, v in delta_report["phases_ms"].items()))
+        print(f"  full  total={full_report['total_ms']:.0f} ms  " + " ".join(
+            f"{k}={v:.0f}" for k, v in full_report["phases_ms"].items()))
+
+
+# ------------------------------------------------
+# 12. 추천 응답 크기 / 인코딩 시간 (필드 선택 × JSON / MessagePack)
+# ------------------------------------------------
+
+def bench_payload(repeat: int) -> None:
+    import gzip
+
+    import recommender
+    from http_cache import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode_payload, msgpack
+    from projection import FIELD_PRESETS, dump_response
+    from schemas import RecommendResponse
+    from settings import settings
+
+    index = recommender.build_index(settings.catalog_path)
+    media_types = [JSON_MEDIA_TYPE] + ([MSGPACK_MEDIA_TYPE] if msgpack is not None else [])
+    if msgpack is None:
+        print("msgpack 이 없어서 JSON 만 측정")
+
+    # 며칠짜리 코스 하나 / 대량 호출 한 번(여러 조건 코스 묶음)
+    single = RecommendResponse(days=index.recommend_days(selected_tags=["자연"], days=5, max_places_per_day=4))
+    batch = [
+        RecommendResponse(days=index.recommend_days(selected_tags=[tag], days=3, max_places_per_day=4))
+        for tag in ("자연", "가족여행", "카페", "휴식", "사진", "맛집", "커플", "액티비티")
+    ]
+    cases = {"5-day course": [single], f"batch of {len(batch)} (3-day)": batch}
+    selections = {"all fields": None, "fields=pin": FIELD_PRESETS["pin"]}
+
+    for case, responses in cases.items():
+        print(case)
+        for label, fields in selections.items():
+            for media_type in media_types:
+                def encode():
+                    return [encode_payload(dump_response(r, fields), media_type) for r in responses]
+
+                bodies = encode()
+                raw_bytes = sum(len(b) for b in bodies)
+                gz_bytes = sum(len(gzip.compress(b, compresslevel=6)) for b in bodies)
+                ms = _time_per_call_ms(encode, repeat)
+                print(f"  {label:<11} {media_type.split('/')[1]:<8} bytes={raw_bytes:>7} gzip={gz_bytes:>6} "
+                      f"encode={ms:.3f} ms")
+
+
+# ------------------------------------------------
+# 13. 여행지 레지스트리 (첫 요청 로드 시간 / 메모리 예산 LRU)
+# ------------------------------------------------
+
+def bench_regions(repeat: int) -> None:
+    import os
+
+    import recommender
+    from gazetteer import JEJU, Gazetteer
+    from memdebug import index_footprint
+    from regions import Destination, RegionRegistry
+
+    n_rows = 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.csv")
+        _synthetic_raw_catalog(n_rows).to_csv(path, index=False)
+        names = ["a", "b", "c"]
+        destinations = {
+            name: Destination(name, path, Gazetteer(name, JEJU.cities, JEJU.places)) for name in names
+        }
+
+        def build(destination):
+            return recommender.build_index(destination.catalog_path, gazetteer=destination.gazetteer)
+
+        def measure(index):
+            return index_footprint(index)["total_bytes"]
+
+        # 예산 = 인덱스 2개 남짓 → 세 번째 목적지를 올리면 가장 오래 안 쓴 목적지를 내림
+        probe = measure(build(destinations["a"]))
+        registry = RegionRegistry(destinations, build, measure, budget_bytes=int(probe * 2.5))
+        print(f"rows={n_rows} index={probe / 2**20:.1f} MiB budget={registry.budget_bytes / 2**20:.1f} MiB")
+
+        for name in ["a", "b", "a", "c", "b", "a"]:
+            started = time.perf_counter()
+            registry.get(name)
+            ms = (time.perf_counter() - started) * 1000
+            stats = registry.stats()
+            print(f"  get({name}) {ms:8.1f} ms  resident={list(stats['resident'])} "
+                  f"bytes={stats['resident_bytes'] / 2**20:.1f} MiB")
+
+        hit_ms = _time_per_call_ms(lambda: registry.get("a"), repeat)
+        print(f"  resident hit {hit_ms * 1000:.1f} us")
+        for name, d in registry.stats()["destinations"].items():
+            print(f"  {name}: loads={d['loads']} evictions={d['evictions']} "
+                  f"last_load={d['last_load_ms']} ms max_load={d['max_load_ms']} ms")
+
+
+BENCHMARKS = {
+    "tag-matrix": bench_tag_matrix,
+    "memory": bench_memory,
+    "catalog-load": bench_catalog_load,
+    "scorers": bench_scorers,
+    "shards": bench_shards,
+    "facets": bench_facets,
+    "autocomplete": bench_autocomplete,
+    "result-cache": bench_result_cache,
+    "interactions": bench_interactions,
+    "nearby": bench_nearby,
+    "ingest": bench_ingest,
+    "payload": bench_payload,
+    "regions": bench_regions,
+}
+
+
+def main_cli() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "_load":
+        # bench_catalog_load 가 띄우는 측정용 하위 프로세스
+        sub = argparse.ArgumentParser()
+        sub.add_argument("cmd")
+        sub.add_argument("--mode", required=True)
+        sub.add_argument("--path", required=True)
+        sub_args = sub.parse_args()
+        _load_once(sub_args.mode, sub_args.path)
+        return
+
+    parser = argparse.ArgumentParser(description="놀멍쉬멍 백엔드 성능 측정")
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    BENCHMARKS[args.name](args.repeat)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,228 @@
+# bulk.py
+# ================================================
+# 오프라인 대량 코스 생성 (마케팅 / QA 용)
+#   python bulk.py prompts.txt -o courses.jsonl --workers 8
+#   python bulk.py prompts.txt --fields pin          # 코스 항목은 id / 이름 / 카테고리 / 좌표만
+#
+# 입력: 한 줄에 하나
+#   - 그냥 문장                      → /recommend_text 와 같은 처리
+#   - JSON 문자열 / {"query": ...}   → /recommend_text 와 같은 처리
+#   - RecommendRequest JSON          → /recommend 와 같은 처리
+#   ("id" 키를 넣으면 결과에 그대로 붙여줌)
+# 출력: 끝나는 순서대로 JSONL 한 줄씩 (line 번호로 입력과 매칭)
+#   - 성공: {"line", "id", "ok": true, "kind", "result", "elapsed_ms"}
+#   - 실패: {"line", "id", "ok": false, "error"}
+#
+# 인덱스는 부모 프로세스에서 한 번만 만들고, fork 로 worker 들이
+# copy-on-write 로 같이 씀 (fork 가 없는 OS 에서는 worker 마다 만듦)
+# ================================================
+
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+import warnings
+from typing import Dict, Iterator, List, Optional, Tuple
+
+warnings.filterwarnings("ignore")
+
+_INDEX = None  # worker 가 쓰는 recommender.RecommenderIndex
+_FIELDS = None  # 코스 항목에 남길 필드 (projection.parse_fields, None 이면 전체)
+
+
+def _init_worker(catalog_path: Optional[str], fields=None) -> None:
+    """fork 가 아닌 경우에만 worker 마다 인덱스 생성"""
+    global _INDEX, _FIELDS
+    _FIELDS = fields
+    if _INDEX is None:
+        import recommender
+
+        _INDEX = recommender.build_index(catalog_path)
+
+
+def parse_input_line(raw: str) -> Tuple[str, Dict[str, object]]:
+    """입력 한 줄 → ("text", {"query": ...}) 또는 ("request", RecommendRequest 필드)"""
+    text = raw.strip()
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return "text", {"query": text}
+    if isinstance(value, str):
+        return "text", {"query": value}
+    if not isinstance(value, dict):
+        raise ValueError("JSON 입력은 문자열 또는 객체여야 합니다.")
+    for key in ("query", "prompt", "text"):
+        if key in value:
+            return "text", dict(value, query=value[key])
+    return "request", value
+
+
+def run_one(task: Tuple[int, str]) -> Dict[str, object]:
+    from main import ParsedQuery, format_itinerary_message, parse_user_query_advanced
+    from projection import dump_day
+    from schemas import RecommendRequest, RecommendTextRequest
+
+    line_no, raw = task
+    item_id = None
+    started = time.perf_counter()
+    try:
+        kind, payload = parse_input_line(raw)
+        item_id = payload.get("id")
+
+        if kind == "text":
+            req = RecommendTextRequest(
+                query=str(payload["query"]),
+                max_places_per_day=int(payload.get("max_places_per_day", 3)),
+            )
+            parsed = parse_user_query_advanced(req.query)
+            days = _INDEX.recommend_days(
+                selected_tags=parsed["tags"],
+                region_filter_address=parsed["region_address"],
+                region_filter_subregions=parsed["region_subregions"],
+                days=parsed["days"],
+                max_places_per_day=req.max_places_per_day,
+                free_text=parsed["freeText"],
+            )
+            parsed_model = ParsedQuery(
+                original=parsed["original"],
+                days=parsed["days"],
+                tags=parsed["tags"],
+                region_address=parsed["region_address"],
+                region_subregions=parsed["region_subregions"],
+                freeText=parsed["freeText"],
+            )
+            result = {
+                "parsed": parsed_model.model_dump(),
+                "days": [dump_day(d, _FIELDS) for d in days],
+                "message": format_itinerary_message(parsed_model, days),
+            }
+        else:
+            req = RecommendRequest(**{k: v for k, v in payload.items() if k != "id"})
+            days = _INDEX.recommend_days(
+                selected_tags=req.tags,
+                region_filter_address=req.region,
+                region_filter_subregions=req.subregions,
+                days=req.days,
+                max_places_per_day=req.max_places_per_day,
+                free_text=req.freeText or "",
+            )
+            result = {"days": [dump_day(d, _FIELDS) for d in days]}
+    except Exception as e:
+        # 여러 줄짜리 에러(pydantic 등)도 한 줄로
+        message = " ".join(str(e).split())[:300]
+        return {"line": line_no, "id": item_id, "ok": False, "error": f"{type(e).__name__}: {message}"}
+
+    return {
+        "line": line_no,
+        "id": item_id,
+        "ok": True,
+        "kind": kind,
+        "result": result,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def read_tasks(path: str) -> List[Tuple[int, str]]:
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8-sig")
+    try:
+        return [(n, line) for n, line in enumerate(stream, start=1) if line.strip()]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _results(tasks, workers: int, chunksize: int, catalog_path: Optional[str], fields=None) -> Iterator[Dict[str, object]]:
+    if workers <= 1:
+        for task in tasks:
+            yield run_one(task)
+        return
+
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(catalog_path, fields)) as pool:
+        yield from pool.imap_unordered(run_one, tasks, chunksize=chunksize)
+
+
+def prepare(workers: int, catalog_path: Optional[str], fields=None) -> float:
+    """
+    부모 프로세스 준비: 단일 프로세스이거나 fork 가 가능하면 여기서 인덱스를 만듦
+    반환: 인덱스 생성 시간(초)
+    """
+    import main  # noqa: F401  (파서/스키마 import 도 fork 전에)
+
+    started = time.perf_counter()
+    if workers <= 1 or "fork" in mp.get_all_start_methods():
+        _init_worker(catalog_path, fields)
+        # 인덱스 객체를 GC 추적에서 빼서 worker 에서 refcount/GC 로 페이지가 복사되는 걸 줄임
+        gc.freeze()
+    return time.perf_counter() - started
+
+
+def main_cli() -> int:
+    parser = argparse.ArgumentParser(description="놀멍쉬멍 대량 코스 생성")
+    parser.add_argument("input", help="입력 파일 (문장 또는 JSON lines, - 면 stdin)")
+    parser.add_argument("-o", "--output", default="-", help="출력 JSONL (기본 stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("--catalog", default=None, help="카탈로그 경로 (기본 JEJU_CATALOG_PATH)")
+    parser.add_argument("--progress-every", type=float, default=2.0, help="진행 상황 출력 간격(초)")
+    parser.add_argument("--fields", default="", help="코스 항목에 남길 필드 (예: id,name,lat,lng 또는 pin)")
+    args = parser.parse_args()
+
+    from projection import FieldsError, parse_fields
+
+    try:
+        fields = parse_fields([args.fields])
+    except FieldsError as e:
+        parser.error(str(e))
+
+    tasks = read_tasks(args.input)
+    total = len(tasks)
+    build_sec = prepare(args.workers, args.catalog, fields)
+    print(f"[bulk] {total} items, index ready in {build_sec:.1f}s", file=sys.stderr)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    started = time.perf_counter()
+    last_report = started
+    done = 0
+    failures: List[Dict[str, object]] = []
+    try:
+        for result in _results(tasks, args.workers, args.chunksize, args.catalog, fields):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            done += 1
+            if not result["ok"]:
+                failures.append(result)
+
+            now = time.perf_counter()
+            if now - last_report >= args.progress_every or done == total:
+                rate = done / (now - started)
+                eta = (total - done) / rate if rate > 0 else 0.0
+                print(
+                    f"[bulk] {done}/{total} done, {len(failures)} failed, "
+                    f"{rate:.1f} items/s, eta {eta:.0f}s",
+                    file=sys.stderr,
+                )
+                last_report = now
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"[bulk] finished {done} items in {elapsed:.1f}s "
+        f"({done / elapsed if elapsed > 0 else 0:.1f} items/s, workers={args.workers}), "
+        f"{len(failures)} failed",
+        file=sys.stderr,
+    )
+    for failure in failures[:20]:
+        print(f"[bulk]   line {failure['line']}: {failure['error']}", file=sys.stderr)
+    if len(failures) > 20:
+        print(f"[bulk]   ... {len(failures) - 20} more", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,168 @@
+# catalog_io.py
+# ================================================
+# 장소 카탈로그 파일 읽기/변환
+# - 지원 형식: CSV(UTF-8, BOM 허용) / Parquet / Arrow IPC(.arrow, .feather, .ipc)
+# - 서버에서 쓰는 컬럼(추천 + 장소 상세)만 읽음 (Parquet/Arrow 는 컬럼 단위로 읽어서 빠르고 가벼움)
+# - CSV → Parquet/Arrow 변환:
+#     python catalog_io.py convert "data/놀멍쉬멍 데이터.csv" data/places.parquet
+# - 장소별 내용 fingerprint (카탈로그 부분 갱신용, ingest.py)
+# ================================================
+
+import argparse
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+# 추천 로직에서 실제로 쓰는 컬럼
+RECOMMENDER_COLUMNS: List[str] = [
+    "id",
+    "name",
+    "category",
+    "address",
+    "tags",
+    "descriptionShort",
+    "lat",
+    "lng",
+]
+
+# 장소 조회 API(GET /places)에서만 내려주는 상세 컬럼
+DETAIL_COLUMNS: List[str] = [
+    "thumbnailUrl",
+    "openingHours",
+    "phone",
+    "priceInfo",
+]
+
+# 서버가 메모리에 올리는 컬럼 전체
+CATALOG_COLUMNS: List[str] = RECOMMENDER_COLUMNS + DETAIL_COLUMNS
+
+NUMERIC_COLUMNS = {"lat", "lng"}
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
+CSV_SUFFIXES = {".csv"}
+
+
+def catalog_format(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    if suffix in CSV_SUFFIXES:
+        return "csv"
+    raise ValueError(f"지원하지 않는 카탈로그 형식입니다: {path}")
+
+
+def load_catalog(path, columns: Optional[Sequence[str]] = CATALOG_COLUMNS) -> pd.DataFrame:
+    """
+    카탈로그 파일을 DataFrame 으로 읽음.
+    columns 가 주어지면 파일에 있는 컬럼 중 그것만 읽고, 없는 컬럼은 건너뜀
+    (columns=None 이면 전체)
+    """
+    path = Path(path)
+    fmt = catalog_format(path)
+    wanted = list(columns) if columns is not None else None
+
+    if fmt == "csv":
+        usecols = (lambda c: c in wanted) if wanted is not None else None
+        return pd.read_csv(path, usecols=usecols, encoding="utf-8-sig")
+
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        names = pq.read_schema(path).names
+        selected = [c for c in wanted if c in names] if wanted is not None else None
+        table = pq.read_table(path, columns=selected)
+    else:
+        import pyarrow.ipc as ipc
+
+        # Arrow IPC 는 memory map 으로 열어서 필요한 컬럼 버퍼만 건드림
+        with pa.memory_map(str(path), "r") as source:
+            table = ipc.open_file(source).read_all()
+        if wanted is not None:
+            table = table.select([c for c in wanted if c in table.column_names])
+
+    return table.to_pandas()
+
+
+def row_fingerprints(raw: pd.DataFrame) -> Optional[pd.Series]:
+    """
+    장소 id → 카탈로그 컬럼 내용 해시 (uint64, 행 순서)
+    id 컬럼이 없거나 비어 있거나 중복이면 None (id 기준으로 비교할 수 없음)
+    """
+    if "id" not in raw.columns or raw["id"].isna().any():
+        return None
+    ids = raw["id"].astype(str)
+    if ids.duplicated().any():
+        return None
+    cols = [c for c in CATALOG_COLUMNS if c in raw.columns]
+    hashes = pd.util.hash_pandas_object(raw[cols].astype(str), index=False)
+    # id 는 object Index 로 (비교 / 위치 찾기가 hashtable 로 돌아서 Arrow 문자열보다 훨씬 빠름)
+    index = pd.Index(ids.to_numpy(dtype=object), dtype=object, name="id")
+    return pd.Series(hashes.to_numpy(), index=index, name="fingerprint")
+
+
+def convert_csv(src, dst, columns: Optional[Sequence[str]] = None) -> Path:
+    """
+    CSV 카탈로그를 Parquet / Arrow IPC 로 변환.
+    문자열 컬럼은 string, lat/lng 는 float64 로 타입을 고정해서 저장
+    """
+    import pyarrow as pa
+
+    src, dst = Path(src), Path(dst)
+    fmt = catalog_format(dst)
+    if fmt == "csv":
+        raise ValueError("변환 대상은 .parquet 또는 .arrow/.feather/.ipc 여야 합니다.")
+
+    frame = load_catalog(src, columns=columns)
+    fields = []
+    for col in frame.columns:
+        if col in NUMERIC_COLUMNS:
+            frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("float64")
+            fields.append(pa.field(col, pa.float64()))
+        else:
+            frame[col] = frame[col].astype("string")
+            fields.append(pa.field(col, pa.string()))
+    table = pa.Table.from_pandas(frame, schema=pa.schema(fields), preserve_index=False)
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, dst, compression="zstd")
+    else:
+        import pyarrow.ipc as ipc
+
+        # 압축 없이 저장해야 memory map 으로 바로 읽을 수 있음
+        with pa.OSFile(str(dst), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    return dst
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="장소 카탈로그 변환")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    conv = sub.add_parser("convert", help="CSV → Parquet / Arrow IPC")
+    conv.add_argument("src")
+    conv.add_argument("dst")
+    conv.add_argument(
+        "--all-columns",
+        action="store_true",
+        help="서버가 쓰는 컬럼만이 아니라 CSV 의 모든 컬럼을 저장",
+    )
+
+    args = parser.parse_args()
+    if args.command == "convert":
+        columns = None if args.all_columns else CATALOG_COLUMNS
+        out = convert_csv(args.src, args.dst, columns=columns)
+        print(f"saved: {out}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,160 @@
+# deadline.py
+# ================================================
+# 요청별 마감 시간(deadline) + 단계별 소요 시간 추정
+# - 클라이언트가 X-Deadline-Ms 헤더로 원하는 응답 시간을 보내면 서버 최대값으로 자르고,
+#   안 보내면 서버 기본값을 씀
+# - 대기열 / single-flight 대기 / 랭킹 / 코스 구성 단계가 남은 시간을 보고
+#   모자라면 더 싼 경로로 넘어감 (적용한 것을 degradations 로 응답에 표시)
+# - 단계별 소요 시간은 지수이동평균으로 추정 (admission 의 처리 시간 추정과 같은 방식)
+# ================================================
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+# 응답 degradations 값
+CACHED_RANKING = "cached_ranking"            # 최근에 계산해 둔 같은 조건 랭킹 재사용
+PRECOMPUTED_RANKING = "precomputed_ranking"  # freeText / 주소 조건을 빼고 warm-up 표 사용
+TAG_ONLY_RANKING = "tag_only_ranking"        # freeText 를 빼고 태그 점수 표로 계산
+SKIPPED_SUBREGION_MATCHING = "skipped_subregion_matching"  # 맛집/숙소를 같은 사분면에서 고르는 단계 생략
+FEWER_DAYS = "fewer_days"                    # 요청보다 적은 일수로 코스 구성
+
+DEGRADATIONS = (
+    CACHED_RANKING,
+    PRECOMPUTED_RANKING,
+    TAG_ONLY_RANKING,
+    SKIPPED_SUBREGION_MATCHING,
+    FEWER_DAYS,
+)
+
+
+class DeadlineExceeded(Exception):
+    """남은 시간이 없고 더 싼 경로도 없을 때 (→ 504)"""
+
+    def __init__(self, stage: str):
+        super().__init__(stage)
+        self.stage = stage
+
+
+class DeadlineMonitor:
+    """degradation 종류별 / 마감 초과 횟수 (/stats 용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._degraded_requests = 0
+        self._exceeded = 0
+        self._by_kind: Dict[str, int] = {kind: 0 for kind in DEGRADATIONS}
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    def record_degradation(self, kind: str, first: bool) -> None:
+        with self._lock:
+            self._by_kind[kind] = self._by_kind.get(kind, 0) + 1
+            if first:
+                self._degraded_requests += 1
+
+    def record_exceeded(self) -> None:
+        with self._lock:
+            self._exceeded += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "degraded_requests": self._degraded_requests,
+                "exceeded": self._exceeded,
+                "degradations": dict(self._by_kind),
+            }
+
+
+class Deadline:
+    def __init__(self, budget_sec: float, monitor: Optional[DeadlineMonitor] = None):
+        self.budget_sec = budget_sec
+        self.expires_at = time.monotonic() + budget_sec
+        self.degradations: List[str] = []
+        self._monitor = monitor
+        if monitor is not None:
+            monitor.record_request()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def allows(self, cost_sec: float) -> bool:
+        """cost_sec 만큼 걸리는 단계를 마감 전에 끝낼 수 있는지"""
+        return self.remaining() >= cost_sec
+
+    def degrade(self, kind: str) -> None:
+        if kind in self.degradations:
+            return
+        self.degradations.append(kind)
+        if self._monitor is not None:
+            self._monitor.record_degradation(kind, first=len(self.degradations) == 1)
+
+    def merge(self, kinds) -> None:
+        """single-flight 로 공유받은 결과의 degradations 를 이 요청에도 표시"""
+        for kind in kinds:
+            self.degrade(kind)
+
+
+def deadline_budget_sec(raw: Optional[str], default_ms: int, max_ms: int) -> float:
+    """
+    X-Deadline-Ms 헤더 값 → 예산(초), 서버 최대값 이하로
+    없거나 숫자가 아니거나 유한한 양수가 아니면(inf, nan, 1e400, 0, -5) 기본값
+    """
+    budget_ms: float = default_ms
+    if raw is not None and raw.strip():
+        try:
+            value = float(raw)
+        except (ValueError, OverflowError):
+            value = float("nan")
+        if math.isfinite(value) and value > 0:
+            budget_ms = value
+    return max(1, int(min(budget_ms, max_ms))) / 1000.0
+
+
+class StageCosts:
+    """
+    단계 이름 → 소요 시간(초) 지수이동평균
+    처음에는 initial 값을 쓰고 실제로 돌 때마다 갱신
+    """
+
+    def __init__(self, initial: Dict[str, float], alpha: float = 0.2):
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._avg: Dict[str, float] = dict(initial)
+        self._count: Dict[str, int] = {name: 0 for name in initial}
+
+    def estimate(self, stage: str) -> float:
+        with self._lock:
+            return self._avg.get(stage, 0.0)
+
+    def observe(self, stage: str, elapsed_sec: float) -> None:
+        with self._lock:
+            prev = self._avg.get(stage)
+            self._avg[stage] = elapsed_sec if prev is None else (1 - self.alpha) * prev + self.alpha * elapsed_sec
+            self._count[stage] = self._count.get(stage, 0) + 1
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {
+                name: {"avg_ms": round(avg * 1000, 3), "observed": self._count.get(name, 0)}
+                for name, avg in self._avg.items()
+            }
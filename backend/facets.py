@@ -0,0 +1,215 @@
+# facets.py
+# ================================================
+# 필터 조합별 장소 수 (facet count)
+# - 태그 값 / category / category_mapped / subregion 마다 "그 값을 가진 장소" 집합을
+#   인덱스 만들 때 미리 bitset 으로 만들어 둠
+#   (장소 수가 적은 값은 행 위치 배열, 많은 값은 uint64 비트맵 — 더 작은 쪽으로 보관)
+# - 요청 시에는 필터 bitset 을 AND / OR 로 만든 뒤 컬럼마다
+#     비트맵 값들: (값 × word) 행렬 & 필터 → popcount 행 합
+#     배열 값들  : 모든 행 위치를 이어 붙인 배열에서 필터 비트 확인 → 값별 bincount
+#   두 번의 NumPy 연산으로 값 개수와 상관없이 한 번에 셈
+#   → pandas 로 tags 문자열을 매번 검색하지 않음
+# - GET /facets 와 GET /places 필터가 같이 씀
+# ================================================
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# 요청에서 쓰는 facet 이름 → 내부 컬럼
+FACET_FIELDS = {
+    "category": "category_mapped",
+    "subregion": "subregion",
+    "tag": "tag",
+}
+
+
+def _n_words(n_rows: int) -> int:
+    return (n_rows + 63) // 64
+
+
+def positions_to_words(positions: np.ndarray, n_rows: int) -> np.ndarray:
+    words = np.zeros(_n_words(n_rows), dtype=np.uint64)
+    if len(positions):
+        positions = positions.astype(np.int64, copy=False)
+        np.bitwise_or.at(words, positions >> 6, np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64)))
+    return words
+
+
+def words_to_positions(words: np.ndarray, n_rows: int) -> np.ndarray:
+    """비트맵 → 오름차순 행 위치"""
+    bits = np.unpackbits(words.view(np.uint8), bitorder="little")[:n_rows]
+    return np.flatnonzero(bits)
+
+
+def popcount(words: np.ndarray) -> int:
+    return int(np.bitwise_count(words).sum())
+
+
+class FacetBitset:
+    """
+    값 하나의 장소 집합. 행 위치 배열(int32)과 비트맵(uint64) 중 작은 쪽만 보관
+    (장소 64 곳 중 2 곳 미만이면 배열이 더 작음)
+    """
+
+    __slots__ = ("count", "positions", "words")
+
+    def __init__(self, positions: np.ndarray, n_rows: int):
+        positions = np.unique(positions).astype(np.int32)
+        self.count = int(len(positions))
+        if positions.nbytes < _n_words(n_rows) * 8:
+            self.positions: Optional[np.ndarray] = positions
+            self.words: Optional[np.ndarray] = None
+        else:
+            self.positions = None
+            self.words = positions_to_words(positions, n_rows)
+
+    def to_words(self, n_rows: int) -> np.ndarray:
+        if self.words is not None:
+            return self.words
+        return positions_to_words(self.positions, n_rows)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.words.nbytes if self.words is not None else self.positions.nbytes)
+
+
+def test_bits(base: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """positions 의 비트가 base 에 켜져 있는지 (0/1 uint64)"""
+    return (base[positions >> 6] >> (positions & 63).astype(np.uint64)) & np.uint64(1)
+
+
+class FacetColumn:
+    """컬럼 하나의 값별 bitset 을 개수 세기용으로 묶어 둔 것"""
+
+    def __init__(self, bitsets: Dict[str, FacetBitset]):
+        self.names: List[str] = list(bitsets)
+        self.totals = np.array([b.count for b in bitsets.values()], dtype=np.int64)
+
+        dense = [i for i, b in enumerate(bitsets.values()) if b.words is not None]
+        sparse = [i for i, b in enumerate(bitsets.values()) if b.words is None]
+        values = list(bitsets.values())
+        self.dense_ids = np.array(dense, dtype=np.int64)
+        self.dense = np.stack([values[i].words for i in dense]) if dense else None
+        self.sparse_ids = np.repeat(
+            np.array(sparse, dtype=np.int64), [values[i].count for i in sparse]
+        ).astype(np.int32)
+        self.sparse_positions = (
+            np.concatenate([values[i].positions for i in sparse]).astype(np.int64)
+            if sparse else np.empty(0, dtype=np.int64)
+        )
+
+    def counts(self, base: Optional[np.ndarray]) -> np.ndarray:
+        """값별로 base 와 겹치는 장소 수 (base=None 이면 전체)"""
+        if base is None:
+            return self.totals
+        counts = np.zeros(len(self.names), dtype=np.int64)
+        if self.dense is not None:
+            counts[self.dense_ids] = np.bitwise_count(self.dense & base).sum(axis=1, dtype=np.int64)
+        if len(self.sparse_positions):
+            hits = test_bits(base, self.sparse_positions)
+            counts += np.bincount(self.sparse_ids, weights=hits, minlength=len(self.names)).astype(np.int64)
+        return counts
+
+    @property
+    def nbytes(self) -> int:
+        dense = self.dense.nbytes if self.dense is not None else 0
+        return int(dense + self.sparse_ids.nbytes + self.sparse_positions.nbytes + self.totals.nbytes)
+
+
+class FacetIndex:
+    def __init__(self, rows_by_value: Dict[str, Dict[str, np.ndarray]], n_rows: int):
+        """
+        rows_by_value: 컬럼(category / category_mapped / subregion / tag) → 값 → 행 위치
+        """
+        self.n_rows = n_rows
+        self.values: Dict[str, Dict[str, FacetBitset]] = {
+            column: {value: FacetBitset(rows, n_rows) for value, rows in by_value.items()}
+            for column, by_value in rows_by_value.items()
+        }
+        self.columns: Dict[str, FacetColumn] = {
+            column: FacetColumn(self.values[column])
+            for column in FACET_FIELDS.values()
+            if column in self.values
+        }
+
+    def match_any(self, columns: Iterable[str], values: Iterable[str]) -> np.ndarray:
+        """columns 중 어느 컬럼이든 values 중 하나를 가진 장소 (OR)"""
+        words = np.zeros(_n_words(self.n_rows), dtype=np.uint64)
+        for column in columns:
+            for value in values:
+                bitset = self.values.get(column, {}).get(value)
+                if bitset is not None:
+                    words |= bitset.to_words(self.n_rows)
+        return words
+
+    def filter_words(
+        self,
+        categories: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        subregions: Optional[List[str]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        필터에 맞는 장소 비트맵 (조건이 없으면 None = 전체)
+        - categories: 원본(attraction/food/stay) 또는 place/food/stay 중 하나라도 (OR)
+        - tags: 모두 포함 (AND)
+        - subregions: 하나라도 (OR)
+        """
+        words: Optional[np.ndarray] = None
+
+        def narrow(current: Optional[np.ndarray], part: np.ndarray) -> np.ndarray:
+            return part if current is None else current & part
+
+        if categories:
+            words = narrow(words, self.match_any(("category", "category_mapped"), categories))
+        if subregions:
+            words = narrow(words, self.match_any(("subregion",), subregions))
+        for tag in tags or []:
+            words = narrow(words, self.match_any(("tag",), [tag]))
+        return words
+
+    def positions(self, words: Optional[np.ndarray]) -> np.ndarray:
+        if words is None:
+            return np.arange(self.n_rows)
+        return words_to_positions(words, self.n_rows)
+
+    def count(self, words: Optional[np.ndarray]) -> int:
+        return self.n_rows if words is None else popcount(words)
+
+    def counts(
+        self,
+        categories: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        subregions: Optional[List[str]] = None,
+        facets: Optional[List[str]] = None,
+    ) -> Dict[str, object]:
+        """
+        필터에 맞는 장소 수 + facet 값별 장소 수
+        - category / subregion 은 여러 개 고르면 OR 이라서, 그 facet 의 값별 수는
+          자기 필터를 빼고 센다 (다른 값을 추가로 골랐을 때의 수를 보여주려고)
+        - tag 는 AND 라서 현재 필터 전체에 그 태그를 더했을 때의 수
+        """
+        wanted = [f for f in (facets or list(FACET_FIELDS)) if f in FACET_FIELDS]
+        current = self.filter_words(categories, tags, subregions)
+        bases = {
+            "category": self.filter_words(None, tags, subregions),
+            "subregion": self.filter_words(categories, tags, None),
+            "tag": current,
+        }
+
+        result: Dict[str, Dict[str, int]] = {}
+        for facet in wanted:
+            column = self.columns.get(FACET_FIELDS[facet])
+            if column is None:
+                result[facet] = {}
+                continue
+            by_value = dict(zip(column.names, column.counts(bases[facet]).tolist()))
+            if facet == "tag":
+                by_value = dict(sorted(by_value.items(), key=lambda kv: (-kv[1], kv[0])))
+            result[facet] = by_value
+        return {"total": self.count(current), "facets": result}
+
+    @property
+    def nbytes(self) -> int:
+        bitsets = sum(b.nbytes for by_value in self.values.values() for b in by_value.values())
+        return int(bitsets + sum(c.nbytes for c in self.columns.values()))
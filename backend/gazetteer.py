@@ -0,0 +1,216 @@
+# gazetteer.py
+# ================================================
+# 여행지별 지명 사전 (시 / 사분면 / 지명 → 사분면)
+# - 추천 인덱스는 이 사전으로 주소 → 시(region_city), 사분면(subregion)을 나눔
+#   1) 주소에 아는 지명이 있으면 그 사분면
+#   2) 아니면 시마다 경도 중앙값으로 동/서 (좌표가 없으면 동)
+#   3) 어느 시에도 안 걸리면 "기타"
+# - 사분면 순서(시 순서 × 동/서, 마지막 "기타")가 곧 추천 순위의 사분면 순서
+# - 제주는 코드에 내장(JEJU), 다른 여행지는 JSON (regions.py 의 목적지 목록)
+#   {
+#     "name": "busan",
+#     "cities": [{"key": "busan", "name": "부산", "east": "부산 동", "west": "부산 서"}],
+#     "places": {"해운대": "부산 동", "송도": "부산 서"},
+#     "default_lng_mid": 129.05
+#   }
+# ================================================
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+OTHER = "기타"
+
+
+@dataclass(frozen=True)
+class City:
+    key: str    # 동/서 기준 경도(lng_mid) key
+    name: str   # 주소에 들어가는 시 이름
+    east: str   # 동쪽 사분면 이름
+    west: str   # 서쪽 사분면 이름
+
+
+class Gazetteer:
+    def __init__(
+        self,
+        name: str,
+        cities: Iterable[City],
+        places: Mapping[str, str],
+        default_lng_mid: float = 126.6,
+        directions: Optional[Mapping[str, List[str]]] = None,
+    ):
+        """
+        places         : 지명 → 사분면 (주소에 먼저 나오는 순서가 아니라 이 순서대로 검사)
+        default_lng_mid: 시에 좌표 있는 장소가 하나도 없을 때 동/서 기준 경도
+        directions     : warm-up 에 미리 계산해 둘 방향 범위 (기본: east / west)
+        """
+        self.name = name
+        self.cities: Tuple[City, ...] = tuple(cities)
+        self.places: Dict[str, str] = dict(places)
+        self.default_lng_mid = float(default_lng_mid)
+        self.subregion_order: List[str] = [s for c in self.cities for s in (c.east, c.west)] + [OTHER]
+        self.city_values: List[str] = [c.name for c in self.cities] + [OTHER]
+        self._by_city = {c.name: c for c in self.cities}
+
+        unknown = sorted(set(self.places.values()) - set(self.subregion_order))
+        if unknown:
+            raise ValueError(f"{name}: 지명 사전에 없는 사분면이에요: {', '.join(unknown)}")
+
+        if directions is None:
+            directions = {
+                "east": [c.east for c in self.cities],
+                "west": [c.west for c in self.cities],
+            }
+        # 태그 조합 warm-up 범위: 전체 / 사분면마다 / 방향
+        self.warmup_scopes: Dict[str, Optional[List[str]]] = {"전체": None}
+        self.warmup_scopes.update({s: [s] for s in self.subregion_order})
+        self.warmup_scopes.update({k: list(v) for k, v in directions.items()})
+
+    # --- 분류 ---
+
+    def region_city(self, address) -> str:
+        if not isinstance(address, str):
+            return OTHER
+        for city in self.cities:
+            if city.name in address:
+                return city.name
+        return OTHER
+
+    def default_lng_mids(self) -> Dict[str, float]:
+        return {c.key: self.default_lng_mid for c in self.cities}
+
+    def classify(self, address, city: str, lng: float, lng_mid: Mapping[str, float]) -> str:
+        # 1) 주소에 지명이 있으면 우선 사용
+        if isinstance(address, str):
+            for name, sub in self.places.items():
+                if name in address:
+                    return sub
+
+        spec = self._by_city.get(city)
+        if spec is None:
+            return OTHER
+        # 2) lng 없으면 도시 기준으로 대충 분류
+        try:
+            lng = float(lng)
+        except (TypeError, ValueError):
+            lng = float("nan")
+        if lng != lng:
+            return spec.east
+        # 3) lng 기준으로 동/서 분할
+        return spec.east if lng >= lng_mid[spec.key] else spec.west
+
+    # --- 자연어 지역 파싱 (/recommend_text) ---
+
+    def parse_region(self, text: str) -> Tuple[Optional[str], Optional[List[str]]]:
+        """
+        (주소 키워드, 사분면 목록) — 지명 → 시 이름 → 서쪽/동쪽 순
+        (제주는 main.parse_region 의 손으로 다듬은 규칙을 그대로 씀)
+        """
+        for name in self.places:
+            if name in text:
+                return name, None
+        for city in self.cities:
+            if city.name in text:
+                return city.name, None
+        if "서쪽" in text or "서부" in text:
+            return None, [c.west for c in self.cities]
+        if "동쪽" in text or "동부" in text:
+            return None, [c.east for c in self.cities]
+        return None, None
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "cities": [c.name for c in self.cities],
+            "subregions": list(self.subregion_order),
+            "places": len(self.places),
+        }
+
+    # --- JSON ---
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object], name: Optional[str] = None) -> "Gazetteer":
+        try:
+            cities = [City(**c) for c in data["cities"]]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"지명 사전 형식이 올바르지 않아요: {e!r}")
+        if not cities:
+            raise ValueError("지명 사전에 시가 하나도 없어요")
+        return cls(
+            name=str(name or data.get("name") or ""),
+            cities=cities,
+            places=data.get("places") or {},
+            default_lng_mid=float(data.get("default_lng_mid", 126.6)),
+            directions=data.get("directions"),
+        )
+
+    @classmethod
+    def load(cls, path, name: Optional[str] = None) -> "Gazetteer":
+        with open(Path(path), encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), name=name)
+
+
+# ------------------------------------------------
+# 제주 (제주 동/서, 서귀포 동/서)
+# ------------------------------------------------
+
+JEJU = Gazetteer(
+    name="jeju",
+    cities=[
+        City(key="jeju", name="제주시", east="제주 동", west="제주 서"),
+        City(key="seogwipo", name="서귀포시", east="서귀포 동", west="서귀포 서"),
+    ],
+    # 실제 지명 기반 사분면 매핑
+    places={
+        # 제주시 서쪽
+        "애월": "제주 서",
+        "애월읍": "제주 서",
+        "한림": "제주 서",
+        "한림읍": "제주 서",
+        "협재": "제주 서",
+        "한경": "제주 서",
+        "한경면": "제주 서",
+        "고산": "제주 서",
+        "이호": "제주 서",
+        "이호동": "제주 서",
+        "도두": "제주 서",
+        "도두동": "제주 서",
+        # 제주시 동쪽
+        "조천": "제주 동",
+        "조천읍": "제주 동",
+        "함덕": "제주 동",
+        "함덕리": "제주 동",
+        "구좌": "제주 동",
+        "구좌읍": "제주 동",
+        "김녕": "제주 동",
+        "김녕리": "제주 동",
+        "세화": "제주 동",
+        "월정": "제주 동",
+        "평대": "제주 동",
+        "우도": "제주 동",
+        # 서귀포 동쪽
+        "성산": "서귀포 동",
+        "성산읍": "서귀포 동",
+        "표선": "서귀포 동",
+        "표선면": "서귀포 동",
+        "남원": "서귀포 동",
+        "남원읍": "서귀포 동",
+        # 서귀포 서쪽
+        "중문": "서귀포 서",
+        "중문동": "서귀포 서",
+        "안덕": "서귀포 서",
+        "안덕면": "서귀포 서",
+        "대정": "서귀포 서",
+        "대정읍": "서귀포 서",
+        "모슬포": "서귀포 서",
+        "화순": "서귀포 서",
+    },
+    # 룰 기반 코스 방향 (동/서/남/북)
+    directions={
+        "east": ["제주 동", "서귀포 동"],
+        "west": ["제주 서", "서귀포 서"],
+        "south": ["서귀포 동", "서귀포 서"],
+        "north": ["제주 동", "제주 서"],
+    },
+)
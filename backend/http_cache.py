@@ -0,0 +1,183 @@
+# http_cache.py
+# ================================================
+# HTTP 캐시 / 압축 헬퍼
+# - strong ETag: 요청을 정규화한 값 + 인덱스 버전으로 만듦
+#   → If-None-Match 가 맞으면 응답 본문을 만들지 않고 바로 304
+# - Accept-Encoding 에 따라 br(brotli 설치 시) / gzip 압축
+#   (압축 방식마다 표현이 다르므로 ETag 에 접미사를 붙임)
+# - Accept 에 application/msgpack 이 있으면 MessagePack(msgpack 설치 시)으로 인코딩
+#   (JSON 보다 작고 인코딩이 빠름, ETag 에 -mp 접미사)
+# ================================================
+
+import gzip
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli  # 선택 의존성
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack  # 선택 의존성
+except ImportError:
+    msgpack = None
+
+# 이보다 작은 응답은 압축하지 않음
+MIN_COMPRESS_BYTES = 1024
+
+_ENCODING_SUFFIX = {"br": "-br", "gzip": "-gz"}
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# MessagePack 으로 받는다고 보는 Accept 값 (등록된 이름이 없어서 여러 이름이 쓰임)
+MSGPACK_ACCEPT = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+_MEDIA_SUFFIX = {MSGPACK_MEDIA_TYPE: "-mp"}
+
+
+def make_etag(*parts: Any) -> str:
+    """요청 구성 요소들로 strong ETag 생성 (따옴표 포함)"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # weak 비교는 W/ 접두사를 떼고 비교 (If-None-Match 는 weak 비교 허용)
+    candidates |= {tag[2:] for tag in candidates if tag.startswith("W/")}
+    return etag in candidates
+
+
+def _parse_q_values(header: str) -> Dict[str, float]:
+    """Accept / Accept-Encoding 값 → 토큰별 q"""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            param = param.strip()
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[token.strip().lower()] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """지원하는 압축 방식 중 클라이언트가 받는 것 (br 우선)"""
+    if not accept_encoding:
+        return None
+    accepted = _parse_q_values(accept_encoding)
+
+    def ok(name: str) -> bool:
+        return accepted.get(name, accepted.get("*", 0.0)) > 0.0
+
+    if brotli is not None and ok("br"):
+        return "br"
+    if ok("gzip"):
+        return "gzip"
+    return None
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    응답 형식: Accept 에 MessagePack 을 명시했고 JSON 보다 q 가 낮지 않으면 MessagePack,
+    아니면 JSON (msgpack 미설치 / Accept 없음 / */* 만 있을 때도 JSON)
+    """
+    if msgpack is None or not accept:
+        return JSON_MEDIA_TYPE
+    accepted = _parse_q_values(accept)
+    q_msgpack = max((accepted.get(name, 0.0) for name in MSGPACK_ACCEPT), default=0.0)
+    q_json = accepted.get(JSON_MEDIA_TYPE, accepted.get("application/*", accepted.get("*/*", 0.0)))
+    if q_msgpack > 0.0 and q_msgpack >= q_json:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def encode_payload(payload: Any, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def negotiated_response(request: Request, payload: Any, status_code: int = 200) -> Response:
+    """캐시하지 않는 응답 (POST 등): Accept 에 맞춰 JSON 또는 MessagePack"""
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    headers = {"Vary": "Accept"} if msgpack is not None else None
+    return Response(
+        content=encode_payload(payload, media_type),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def cached_json_response(
+    request: Request,
+    etag: str,
+    build_payload: Callable[[], Any],
+    max_age: int,
+    status_code: int = 200,
+    extra_headers: Optional[Dict[str, str]] = None,
+    cacheable: Optional[Callable[[Any], bool]] = None,
+) -> Response:
+    """
+    ETag + Cache-Control + 압축을 적용한 JSON(또는 MessagePack) 응답.
+    If-None-Match 가 맞으면 build_payload 를 호출하지 않고 304
+    cacheable(payload) 가 False 면 ETag 없이 no-store 로 (deadline 때문에 줄인 결과 등)
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    # 형식마다 표현이 다르므로 ETag 도 다르게
+    etag = etag[:-1] + _MEDIA_SUFFIX.get(media_type, "") + '"'
+    representation_etag = etag
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Accept, Accept-Encoding" if msgpack is not None else "Accept-Encoding",
+        **(extra_headers or {}),
+    }
+
+    def with_suffix(enc: Optional[str]) -> str:
+        return etag[:-1] + _ENCODING_SUFFIX[enc] + '"' if enc else etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag) or etag_matches(if_none_match, with_suffix(encoding)):
+        headers["ETag"] = with_suffix(encoding)
+        return Response(status_code=304, headers=headers)
+
+    payload = build_payload()
+    store = cacheable is None or cacheable(payload)
+    if not store:
+        headers["Cache-Control"] = "no-store"
+    body = encode_payload(payload, media_type)
+    if encoding is not None and len(body) >= MIN_COMPRESS_BYTES:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        representation_etag = with_suffix(encoding)
+
+    if store:
+        headers["ETag"] = representation_etag
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
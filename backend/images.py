@@ -0,0 +1,245 @@
+# images.py
+# ================================================
+# 장소 썸네일 (리사이즈 + 재인코딩) 과 디스크 캐시
+# - 원본: public/spotimage 아래 이미지 (mmap 으로 열어서 디코딩)
+# - 요청한 폭을 정해진 단계(ALLOWED_WIDTHS)로 올림해서 변형 수를 제한
+# - 결과는 크기 제한이 있는 디스크 LRU 캐시에 저장
+# - 같은 변형을 동시에 요청하면 SingleFlight 로 한 번만 인코딩
+# - Pillow 는 선택 의존성 (없으면 원본을 그대로 내려줌)
+# ================================================
+
+import hashlib
+import importlib.util
+import io
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from singleflight import SingleFlight
+
+# Pillow 는 선택 의존성이고, 서버 시작을 가볍게 하려고 첫 인코딩 때 import
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+
+ALLOWED_WIDTHS = (160, 320, 480, 640, 960, 1280)
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+# fmt → (Pillow 포맷, Content-Type, 캐시 파일 확장자)
+FORMATS: Dict[str, Tuple[str, str, str]] = {
+    "webp": ("WEBP", "image/webp", ".webp"),
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+}
+
+
+class ImageError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def snap_width(width: int) -> int:
+    """요청 폭 이상인 가장 작은 허용 폭 (없으면 최대 폭)"""
+    for allowed in ALLOWED_WIDTHS:
+        if width <= allowed:
+            return allowed
+    return ALLOWED_WIDTHS[-1]
+
+
+def encode_variant(source: Path, width: int, fmt: str, quality: int) -> bytes:
+    """원본을 mmap 으로 열어서 width 이하로 줄이고 fmt 로 인코딩"""
+    from PIL import Image, ImageOps
+
+    pil_format = FORMATS[fmt][0]
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with Image.open(mm) as im:
+            # JPEG 은 디코딩 단계에서 1/2, 1/4, 1/8 로 줄여서 읽을 수 있음
+            # (회전 정보가 있어도 안전하도록 가로·세로 모두 width 이상 유지)
+            im.draft("RGB", (width, width))
+            img = ImageOps.exif_transpose(im)
+            if img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.Resampling.LANCZOS)
+
+            if pil_format == "JPEG" and img.mode != "RGB":
+                img = img.convert("RGB")
+            elif img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+            buf = io.BytesIO()
+            if pil_format == "JPEG":
+                img.save(buf, pil_format, quality=quality, optimize=True, progressive=True)
+            else:
+                img.save(buf, pil_format, quality=quality, method=4)
+            return buf.getvalue()
+
+
+# ------------------------------------------------
+# 디스크 LRU 캐시
+# ------------------------------------------------
+
+class DiskLRUCache:
+    """
+    key → 파일 하나. 전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 것부터 삭제.
+    순서는 파일 mtime 으로도 남겨서 재시작 후에도 이어서 사용
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # 파일명 → 크기 (오래된 순)
+        self._total = 0
+        self._loaded = False
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(".tmp"):
+                # 쓰다가 죽은 임시 파일
+                os.unlink(entry.path)
+                continue
+            st = entry.stat()
+            found.append((st.st_mtime, entry.name, st.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self._total += size
+        self._loaded = True
+        self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total -= size
+            self._evictions += 1
+            try:
+                os.unlink(self.directory / name)
+            except FileNotFoundError:
+                pass
+
+    def get(self, name: str, count: bool = True) -> Optional[Path]:
+        with self._lock:
+            self._ensure_loaded()
+            if name not in self._entries:
+                self._misses += count
+                return None
+            self._entries.move_to_end(name)
+            self._hits += count
+        path = self.directory / name
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # 누가 캐시 디렉터리를 지웠으면 miss 로 처리
+            with self._lock:
+                self._total -= self._entries.pop(name, 0)
+            return None
+        return path
+
+    def put(self, name: str, data: bytes) -> Path:
+        with self._lock:
+            self._ensure_loaded()
+        path = self.directory / name
+        tmp = self.directory / f"{name}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)  # 읽는 쪽은 항상 완성된 파일만 봄
+        with self._lock:
+            self._total -= self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._total += len(data)
+            # 방금 넣은 항목은 가장 최근이라 여기서 지워지지 않음
+            self._evict_locked()
+        return path
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+            }
+
+
+# ------------------------------------------------
+# 썸네일 서비스
+# ------------------------------------------------
+
+class ThumbnailService:
+    def __init__(self, source_dir: Union[str, Path], cache: DiskLRUCache, quality: int = 80):
+        self.source_dir = Path(source_dir).resolve()
+        self.cache = cache
+        self.quality = quality
+        self.flight = SingleFlight()
+        self._encodes = 0
+        self._encode_errors = 0
+
+    @property
+    def available(self) -> bool:
+        return HAS_PILLOW
+
+    def resolve_source(self, name: str) -> Path:
+        """요청한 이름 → 원본 경로 (source_dir 밖은 거부)"""
+        if not name or "\x00" in name:
+            raise ImageError(400, "잘못된 이미지 이름입니다.")
+        path = (self.source_dir / name).resolve()
+        if not path.is_relative_to(self.source_dir):
+            raise ImageError(400, "잘못된 이미지 이름입니다.")
+        if path.suffix.lower() not in SOURCE_SUFFIXES or not path.is_file():
+            raise ImageError(404, "이미지를 찾을 수 없어요.")
+        return path
+
+    def variant_name(self, source: Path, width: int, fmt: str) -> str:
+        """원본 경로 + 수정 시각 + 크기 + 옵션 → 캐시 파일명 (원본이 바뀌면 다른 이름)"""
+        st = source.stat()
+        raw = f"{source.relative_to(self.source_dir)}|{st.st_mtime_ns}|{st.st_size}|{width}|{fmt}|{self.quality}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest() + FORMATS[fmt][2]
+
+    def get_variant(self, source: Path, name: str, width: int, fmt: str) -> Union[Path, bytes]:
+        """
+        캐시에 있으면 파일 경로, 없으면 인코딩한 bytes
+        (동시에 같은 변형을 요청하면 한 요청만 인코딩하고 나머지는 결과를 공유)
+        """
+        cached = self.cache.get(name)
+        if cached is not None:
+            return cached
+
+        def encode() -> bytes:
+            # 기다리는 동안 다른 leader 가 이미 만들었을 수 있음
+            path = self.cache.get(name, count=False)
+            if path is not None:
+                return path.read_bytes()
+            try:
+                data = encode_variant(source, width, fmt, self.quality)
+            except Exception:
+                self._encode_errors += 1
+                raise ImageError(415, "이미지를 변환할 수 없어요.")
+            self._encodes += 1
+            self.cache.put(name, data)
+            return data
+
+        return self.flight.do(name, encode)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "pillow": self.available,
+            "encodes": self._encodes,
+            "encode_errors": self._encode_errors,
+            "cache": self.cache.stats(),
+            "singleflight": self.flight.stats(),
+        }
@@ -0,0 +1,305 @@
+# ingest.py
+# ================================================
+# 카탈로그 부분 갱신 (바뀐 장소만 다시 계산)
+# - 장소마다 카탈로그 컬럼 내용 fingerprint(uint64, catalog_io.row_fingerprints)를 만들어
+#   지금 인덱스의 fingerprint 와 id 기준으로 비교 → 추가 / 수정 / 삭제
+# - 바뀐 장소만 파생 컬럼(region_city, subregion, category_mapped)과 TF-IDF 벡터 / 태그 점수를 계산하고
+#   나머지 장소는 지금 인덱스의 행을 그대로 가져와 새 인덱스를 만듦 (교체는 main.py 에서 한 번에)
+#   - 사전 / idf 는 마지막 전체 빌드 기준 그대로 (새 단어는 다음 전체 빌드 때 반영 → 보고서 new_terms)
+#   - 동/서 분할 기준 경도도 그대로 (몇 곳이 바뀌었다고 다른 장소의 사분면이 바뀌지 않게)
+#   - 장소 조회 / 자동완성 / 근처 표는 행 위치를 쓰므로 새 인덱스에서 전체를 다시 만듦
+#     (자동완성은 이름이 그대로인 항목의 자모 분해 키를 이전 인덱스에서 가져옴)
+# - 이럴 때는 전체 다시 빌드: 바뀐 비율 > ingest_max_delta_ratio, id 가 비었거나 중복,
+#   incremental 이 아닌 scorer (BM25: 문서 길이 평균 / idf / 양자화 스케일이 전체 기준)
+# - 단계별 소요 시간(ms)과 바뀐 장소 수 / 예시 id 를 보고서(dict)로 돌려줌
+#
+# 사용 예)
+#   python ingest.py diff "data/놀멍쉬멍 데이터.csv" data/places_new.csv    # 무엇이 바뀌었는지만
+#   python ingest.py apply "data/놀멍쉬멍 데이터.csv" data/places_new.csv   # 인덱스에 적용 + 단계별 시간
+# ================================================
+
+import argparse
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from catalog_io import load_catalog, row_fingerprints
+from recommender import (
+    RecommenderIndex,
+    build_index_from_frame,
+    catalog_version,
+    compact_catalog,
+    prepare_catalog,
+    subregion_shard_rows,
+)
+from settings import settings
+from shards import ShardedScorer
+
+# 보고서에 넣는 예시 id / 새 단어 수
+REPORT_SAMPLE = 10
+
+
+class CatalogDelta(NamedTuple):
+    inserted: List[str]
+    updated: List[str]
+    deleted: List[str]
+    unchanged: int
+
+    @property
+    def changed(self) -> int:
+        return len(self.inserted) + len(self.updated) + len(self.deleted)
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "inserted": len(self.inserted),
+            "updated": len(self.updated),
+            "deleted": len(self.deleted),
+            "unchanged": self.unchanged,
+            "sample": {
+                "inserted": self.inserted[:REPORT_SAMPLE],
+                "updated": self.updated[:REPORT_SAMPLE],
+                "deleted": self.deleted[:REPORT_SAMPLE],
+            },
+        }
+
+
+def diff_fingerprints(live: pd.Series, new: pd.Series) -> CatalogDelta:
+    """id → fingerprint 두 개 비교 (목록은 new / live 의 행 순서)"""
+    common = new.index.isin(live.index)
+    inserted = new.index[~common]
+    same_ids = new.index[common]
+    changed = new[common].to_numpy() != live.reindex(same_ids).to_numpy()
+    deleted = live.index[~live.index.isin(new.index)]
+    return CatalogDelta(
+        inserted=inserted.tolist(),
+        updated=same_ids[changed].tolist(),
+        deleted=deleted.tolist(),
+        unchanged=int((~changed).sum()),
+    )
+
+
+class PhaseTimer:
+    """단계 이름 → 소요 시간(ms)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(self.phases.get(name, 0.0) + (time.perf_counter() - started) * 1000, 3)
+
+    @property
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 3)
+
+
+# ------------------------------------------------
+# 1. 바뀐 장소만 적용
+# ------------------------------------------------
+
+def new_terms(vectorizer, texts) -> List[str]:
+    """지금 사전에 없는 단어 (부분 갱신에서는 점수에 안 들어감)"""
+    analyzer = vectorizer.build_analyzer()
+    vocab = vectorizer.vocabulary_
+    found = set()
+    for text in texts:
+        found.update(token for token in analyzer(text) if token not in vocab)
+    return sorted(found)
+
+
+def apply_delta(
+    index: RecommenderIndex,
+    raw: pd.DataFrame,
+    row_hashes: pd.Series,
+    delta: CatalogDelta,
+    source: str,
+    timer: PhaseTimer,
+) -> Tuple[Optional[RecommenderIndex], Dict[str, object]]:
+    """
+    새 카탈로그(raw, 행 순서 그대로)를 바뀐 장소만 다시 계산해서 새 인덱스로 만듦
+    반환: (새 인덱스, 보고서 추가 항목). 새 인덱스가 None 이면 전체 빌드로 (이유는 보고서 reason)
+    """
+    changed_ids = set(delta.inserted) | set(delta.updated)
+    changed_mask = row_hashes.index.isin(list(changed_ids))
+    changed_rows = np.flatnonzero(changed_mask)
+    kept_rows = np.flatnonzero(~changed_mask)
+    # 그대로 쓰는 장소의 지금 인덱스 행 위치 (새 카탈로그 순서)
+    live_positions = index.row_hashes.index.get_indexer(row_hashes.index[kept_rows])
+    extra: Dict[str, object] = {}
+
+    # 파생 컬럼: 바뀐 장소만 (동/서 기준 경도는 지금 인덱스 값)
+    with timer.phase("derive"):
+        live_df = index.df.iloc[live_positions]
+        changed_df = None
+        if len(changed_rows):
+            prepared, _ = prepare_catalog(
+                raw.iloc[changed_rows], lng_mid=index.lng_mid, gazetteer=index.gazetteer,
+            )
+            texts = prepared["search_text"].tolist()
+            changed_df = prepared.drop(columns=["search_text"])
+            if list(changed_df.columns) != list(index.df.columns):
+                return None, {"reason": "columns_changed"}
+
+    # 검색 벡터 / 태그 점수: 바뀐 장소만 transform (사전 / idf 그대로)
+    with timer.phase("text"):
+        live_scorer = index.scorer.gather_rows()
+        matrices = [live_scorer.matrix[live_positions]]
+        tag_scores = [live_scorer.tag_scores.scores[live_positions]]
+        if changed_df is not None:
+            matrix, scores = live_scorer.transform_rows(texts)
+            matrices.append(matrix)
+            tag_scores.append(scores)
+            terms = new_terms(live_scorer.vectorizer, texts)
+            extra["new_terms"] = {"count": len(terms), "sample": terms[:REPORT_SAMPLE]}
+
+    # 새 카탈로그 행 순서로 합치기: [그대로 쓰는 행..., 바뀐 행...] → order
+    with timer.phase("assemble"):
+        order = np.empty(len(raw), dtype=np.int64)
+        order[kept_rows] = np.arange(len(kept_rows))
+        order[changed_rows] = len(kept_rows) + np.arange(len(changed_rows))
+        parts = [live_df] + ([changed_df] if changed_df is not None else [])
+        df = pd.concat(parts, ignore_index=True).iloc[order].reset_index(drop=True)
+        # 원래 category 컬럼의 범주 목록을 새 카탈로그 값으로 다시 만듦 (삭제된 값 제거)
+        df["category"] = df["category"].astype(object)
+        df = compact_catalog(df, index.gazetteer)
+        base = live_scorer.with_rows(
+            sp.vstack(matrices, format="csr")[order],
+            np.vstack(tag_scores)[order],
+        )
+
+    # 사분면 shard / 장소 조회 / 자동완성 / 근처 표는 새 행 위치로 다시 만듦
+    with timer.phase("index"):
+        scorer = ShardedScorer(
+            base,
+            subregion_shard_rows(df),
+            df["category_mapped"].cat.codes.to_numpy(),
+            workers=settings.shard_workers,
+            parallel_min_rows=settings.shard_parallel_min_rows,
+        )
+        new_index = RecommenderIndex(
+            df=df,
+            scorer=scorer,
+            lng_mid=index.lng_mid,
+            version=catalog_version(df),
+            source=source,
+            build_sec=0.0,
+            row_hashes=row_hashes,
+            deltas_since_full=index.deltas_since_full + 1,
+            previous=index,
+            gazetteer=index.gazetteer,
+        )
+    new_index.build_sec = timer.total_ms / 1000.0
+    return new_index, extra
+
+
+# ------------------------------------------------
+# 2. 갱신 (부분 / 전체 판단 + 보고서)
+# ------------------------------------------------
+
+def refresh_index(
+    index: RecommenderIndex,
+    raw: Optional[pd.DataFrame] = None,
+    path: Optional[str] = None,
+    force_full: bool = False,
+    max_delta_ratio: Optional[float] = None,
+) -> Tuple[Optional[RecommenderIndex], Dict[str, object]]:
+    """
+    지금 인덱스 + 새 카탈로그(raw 또는 path) → (새 인덱스, 보고서)
+    바뀐 것이 없으면 새 인덱스는 None (mode="unchanged")
+    force_full 이면 바뀐 것이 없어도 전체 다시 빌드 (부분 갱신이 쌓인 사전 / idf 를 새로 맞출 때)
+    """
+    timer = PhaseTimer()
+    if raw is None:
+        path = path or settings.catalog_path
+    source = str(path) if path else index.source
+    max_delta_ratio = settings.ingest_max_delta_ratio if max_delta_ratio is None else max_delta_ratio
+
+    if raw is None:
+        with timer.phase("load"):
+            raw = load_catalog(path)
+    with timer.phase("fingerprint"):
+        row_hashes = row_fingerprints(raw)
+
+    report: Dict[str, object] = {
+        "source": source,
+        "version_before": index.version,
+        "rows_before": int(len(index.df)),
+        "rows_after": int(len(raw)),
+    }
+
+    reason = None
+    delta: Optional[CatalogDelta] = None
+    if row_hashes is None:
+        reason = "ids"
+    elif index.row_hashes is None:
+        reason = "live_ids"
+    else:
+        with timer.phase("diff"):
+            delta = diff_fingerprints(index.row_hashes, row_hashes)
+        report["delta"] = delta.summary()
+        if delta.changed == 0 and not force_full:
+            report.update(mode="unchanged", version_after=index.version, phases_ms=timer.phases, total_ms=timer.total_ms)
+            return None, report
+        if force_full:
+            reason = "forced"
+        elif not index.scorer.incremental:
+            reason = f"scorer:{index.scorer.name}"
+        elif delta.changed > max_delta_ratio * max(len(index.df), 1):
+            reason = "delta_ratio"
+
+    new_index = None
+    if reason is None:
+        new_index, extra = apply_delta(index, raw, row_hashes, delta, source, timer)
+        report.update(extra)
+        reason = extra.get("reason")
+
+    if new_index is None:
+        with timer.phase("full_build"):
+            new_index = build_index_from_frame(
+                raw, source=source, row_hashes=row_hashes, gazetteer=index.gazetteer,
+            )
+        report.update(mode="full", reason=reason)
+    else:
+        report["mode"] = "delta"
+
+    report.update(version_after=new_index.version, phases_ms=timer.phases, total_ms=timer.total_ms)
+    return new_index, report
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="카탈로그 부분 갱신")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in [("diff", "바뀐 장소만 출력"), ("apply", "인덱스에 적용하고 단계별 시간 출력")]:
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("live", help="지금 서비스 중인 카탈로그")
+        cmd.add_argument("new", help="새 카탈로그")
+    apply_cmd = sub.choices["apply"]
+    apply_cmd.add_argument("--full", action="store_true", help="비교만 하고 전체 다시 빌드")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        live = row_fingerprints(load_catalog(args.live))
+        new = row_fingerprints(load_catalog(args.new))
+        if live is None or new is None:
+            raise SystemExit("id 가 비었거나 중복이라 장소별로 비교할 수 없습니다.")
+        print(json.dumps(diff_fingerprints(live, new).summary(), ensure_ascii=False, indent=2))
+        return
+
+    from recommender import build_index
+
+    _, report = refresh_index(build_index(args.live), path=args.new, force_full=args.full)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,228 @@
+# interactions.py
+# ================================================
+# 추천 장소 조회 / 선택 이벤트 기록 + 장소별 인기도 집계
+# - POST /events 는 이벤트를 메모리 대기열에 넣기만 하고 바로 응답 (요청 경로에서 디스크 I/O 없음)
+#   대기열이 차면 기다리지 않고 버림 (버린 수는 /stats)
+# - 백그라운드 writer 가 이벤트를 모아서 append-only 로그(JSON lines)에 한 번에 씀
+# - 주기적으로 로그에서 새로 추가된 부분만 읽어 장소 id 별 가중 횟수에 더함
+#   → 인덱스가 장소 행 순서의 인기도 배열(0~1)로 바꿔서 랭킹에 섞음 (recommender.set_popularity)
+# ================================================
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 이벤트 종류 → 인기도 가중치 (코스에 넣기로 한 것이 단순 조회보다 강한 신호)
+EVENT_WEIGHTS: Dict[str, float] = {
+    "view": 1.0,
+    "accept": 5.0,
+}
+
+# (시각, 종류, 장소 id, 세션 id)
+Event = Tuple[float, str, str, Optional[str]]
+
+
+# ------------------------------------------------
+# 1. 비동기 배치 기록
+# ------------------------------------------------
+
+class InteractionLog:
+    def __init__(
+        self,
+        path: str,
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval_sec: float = 1.0,
+    ):
+        """
+        queue_size        : 아직 안 쓴 이벤트를 들고 있을 최대 개수 (넘으면 버림)
+        batch_size        : 한 번에 쓰는 최대 이벤트 수
+        flush_interval_sec: 첫 이벤트가 들어온 뒤 batch 가 안 차도 쓰기까지 기다리는 최대 시간
+        """
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_sec = flush_interval_sec
+        self._queue: "queue.Queue[Event]" = queue.Queue(maxsize=max(1, queue_size))
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._counts = {"accepted": 0, "dropped": 0, "written": 0, "batches": 0, "write_errors": 0}
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self._counts[name] += n
+
+    def record(self, event_type: str, place_id: str, session_id: Optional[str] = None) -> bool:
+        """대기열에 넣기만 함 (가득 차 있으면 False, 기다리지 않음)"""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((time.time(), event_type, place_id, session_id))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("accepted")
+        return True
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="interaction-writer", daemon=True)
+                self._writer.start()
+
+    def _next_batch(self) -> List[Event]:
+        batch = [self._queue.get()]
+        flush_at = time.monotonic() + self.flush_interval_sec
+        while len(batch) < self.batch_size:
+            remaining = flush_at - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write(batch)
+            except OSError:
+                self._count("write_errors")
+            else:
+                with self._stats_lock:
+                    self._counts["written"] += len(batch)
+                    self._counts["batches"] += 1
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: List[Event]) -> None:
+        lines = []
+        for ts, event_type, place_id, session_id in batch:
+            record = {"ts": round(ts, 3), "type": event_type, "place_id": place_id}
+            if session_id:
+                record["session_id"] = session_id
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 한 번의 write 로 batch 전체를 붙임 (줄 단위로 끊기지 않게)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+    def flush(self, timeout_sec: float = 5.0) -> bool:
+        """대기 중인 이벤트를 다 쓸 때까지 기다림 (테스트 / 종료용)"""
+        deadline = time.monotonic() + timeout_sec
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        with self._stats_lock:
+            counts = dict(self._counts)
+        return {"path": str(self.path), **counts, "queued": self._queue.qsize()}
+
+
+# ------------------------------------------------
+# 2. 로그 → 장소별 인기도
+# ------------------------------------------------
+
+class PopularityFolder:
+    """
+    로그를 마지막으로 읽은 위치부터 이어서 읽고 장소 id → 가중 횟수 누적
+    (로그가 지워지거나 줄어들었으면 처음부터 다시 셈)
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, float] = {}
+        self._offset = 0
+        self.version = 0
+        self._events = 0
+        self._bad_lines = 0
+        self._folds = 0
+        self._last_fold_at: Optional[float] = None
+        self._last_fold_ms: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def fold(self) -> int:
+        """새로 추가된 이벤트 수 (있으면 version 이 올라감)"""
+        started = time.perf_counter()
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size < self._offset:
+                self._counts.clear()
+                self._offset = 0
+                self.version += 1
+
+            added = 0
+            if size > self._offset:
+                with open(self.path, "rb") as f:
+                    f.seek(self._offset)
+                    data = f.read(size - self._offset)
+                # 쓰는 중인 마지막 줄(개행 전)은 다음에 읽음
+                end = data.rfind(b"\n") + 1
+                for line in data[:end].splitlines():
+                    try:
+                        record = json.loads(line)
+                        weight = EVENT_WEIGHTS[record["type"]]
+                        place_id = str(record["place_id"])
+                    except (ValueError, KeyError, TypeError):
+                        self._bad_lines += 1
+                        continue
+                    self._counts[place_id] = self._counts.get(place_id, 0.0) + weight
+                    added += 1
+                self._offset += end
+            if added:
+                self.version += 1
+                self._events += added
+            self._folds += 1
+            self._last_fold_at = time.time()
+            self._last_fold_ms = (time.perf_counter() - started) * 1000
+            return added
+
+    def counts(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counts)
+
+    def start_background(self, interval_sec: float, on_update: Callable[[Dict[str, float], int], None]) -> threading.Thread:
+        """interval_sec 마다 fold 하고, 바뀐 것이 있으면 on_update(counts, version)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        def loop() -> None:
+            published = self.version
+            while True:
+                time.sleep(interval_sec)
+                try:
+                    self.fold()
+                    if self.version != published:
+                        published = self.version
+                        on_update(self.counts(), published)
+                except Exception:
+                    # 집계 실패는 다음 주기에 다시 (요청 처리에는 영향 없음)
+                    continue
+
+        self._thread = threading.Thread(target=loop, name="popularity-fold", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "places": len(self._counts),
+                "events": self._events,
+                "bad_lines": self._bad_lines,
+                "log_offset": self._offset,
+                "folds": self._folds,
+                "last_fold_at": self._last_fold_at,
+                "last_fold_ms": round(self._last_fold_ms, 3) if self._last_fold_ms is not None else None,
+            }
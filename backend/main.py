@@ -7,23 +7,74 @@
 # - 챗봇용 /chat 엔드포인트 + 룰 기반 코스 응답
 # ================================================
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Tuple, Dict
-
-import pandas as pd
-import numpy as np
+import hmac
 import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, List, Optional, Dict
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response
+
+from settings import settings
+from admission import AdmissionController, AdmissionRejected
+from deadline import DEADLINE_HEADER, Deadline, DeadlineExceeded, DeadlineMonitor, deadline_budget_sec
+from singleflight import SingleFlight
+from result_cache import build_result_cache, make_cache_key
+from interactions import InteractionLog, PopularityFolder
+from http_cache import (
+    JSON_MEDIA_TYPE,
+    cached_json_response,
+    etag_matches,
+    make_etag,
+    negotiate_media_type,
+    negotiated_response,
+)
+from projection import Fields, FieldsError, dump_response, parse_fields
+from regions import (
+    DEFAULT_DESTINATION,
+    DestinationLoading,
+    DestinationUnavailable,
+    RegionRegistry,
+    UnknownDestination,
+    load_destinations,
+)
+from sessions import ChatSession, SessionStore
+from memdebug import AllocationTracker, index_footprint, process_memory
+from images import FORMATS, DiskLRUCache, ImageError, ThumbnailService, snap_width
+from schemas import (
+    ChatRequest,
+    ChatResponse,
+    DayPlan,
+    InteractionEventsRequest,
+    InteractionEventsResponse,
+    ParsedQuery,
+    RecommendRequest,
+    RecommendResponse,
+    RecommendTextRequest,
+    RecommendTextResponse,
+    ReplaceItemRequest,
+    ReplaceItemResponse,
+)
+from tags import CATEGORY_LABEL
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
+# pandas / NumPy / scikit-learn 을 쓰는 추천 인덱스(recommender.py)는
+# import 시점이 아니라 서버 시작 후 백그라운드에서 불러온다.
 
 # ------------------------------------------------
 # 0. FastAPI 기본 설정
 # ------------------------------------------------
 
-app = FastAPI(title="Jeju Nolmeong-Swimeong Trip Recommender API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버는 바로 요청을 받고 (/healthz), 인덱스는 백그라운드에서 생성 (/readyz)
+    start_index_loader()
+    yield
+
+app = FastAPI(title="Jeju Nolmeong-Swimeong Trip Recommender API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,430 +89,352 @@ def root():
     return {"status": "FastAPI is running!"}
 
 # ------------------------------------------------
-# 1. CSV 로드 & 기본 전처리
+# 0-0. 추천 인덱스 로드 + liveness / readiness
 # ------------------------------------------------
+# - /healthz : 프로세스가 살아 있으면 항상 200
+# - /readyz  : 인덱스가 만들어져서 추천이 가능할 때만 200
+#              (인덱스 버전, warm-up 진행 상황 포함)
+
+INDEX = None  # recommender.RecommenderIndex (ready 전에는 None)
+INDEX_STATUS: Dict[str, object] = {
+    "state": "idle",     # idle / loading / ready / failed
+    "error": None,
+    "started_at": None,
+    "ready_at": None,
+}
+_INDEX_LOADER: Optional[threading.Thread] = None
 
-# ✅ 네 환경에 맞게만 바꿔둔 경로
-CSV_PATH = "/Users/ijimin/jeju-app/backend/data/놀멍쉬멍 데이터.csv"
-
-df = pd.read_csv(CSV_PATH)
+def _load_index():
+    INDEX_STATUS.update(state="loading", error=None, started_at=time.time())
+    try:
+        import recommender  # 무거운 import 는 여기서 처음 일어남
 
-# 예상 컬럼: id, name, category, address, tags, thumbnailUrl,
-#           descriptionShort, openingHours, phone, priceInfo, lat, lng
-for col in ["name", "category", "address", "tags", "descriptionShort", "lat", "lng"]:
-    if col not in df.columns:
-        df[col] = np.nan if col in ["lat", "lng"] else ""
+        index = recommender.build_index(settings.catalog_path)
+    except Exception as e:
+        INDEX_STATUS.update(state="failed", error=repr(e))
+        return
 
-df["tags"] = df["tags"].fillna("")
-df["descriptionShort"] = df["descriptionShort"].fillna("")
-df["address"] = df["address"].fillna("")
-df["category"] = df["category"].fillna("")
+    # 지난 이벤트 로그까지 반영한 인기도로 시작 (warm-up 전에), 이후 주기적으로 다시 집계
+    POPULARITY.fold()
+    publish_index(index)
+    INDEX_STATUS.update(state="ready", ready_at=time.time())
+    POPULARITY.start_background(settings.popularity_fold_interval_sec, publish_popularity)
 
-# 검색용 텍스트: tags + descriptionShort
-df["search_text"] = df["tags"].astype(str) + " " + df["descriptionShort"].astype(str)
+def publish_index(index) -> None:
+    """
+    새 인덱스로 한 번에 교체 (처음 로드 / 카탈로그 갱신 공통)
+    인기도를 먼저 반영하고 바꾼 뒤 백그라운드에서 warm-up
+    진행 중인 요청은 시작할 때 잡은 이전 인덱스로 끝까지 처리됨
+    """
+    global INDEX
+    index.set_popularity(POPULARITY.counts(), POPULARITY.version)
+    previous, INDEX = INDEX, index
+    if previous is not None and previous is not index:
+        previous.warmup.stop()
+    if settings.warmup_enabled:
+        index.start_warmup()
+
+def start_index_loader() -> threading.Thread:
+    global _INDEX_LOADER
+    if _INDEX_LOADER is None or (not _INDEX_LOADER.is_alive() and INDEX is None):
+        _INDEX_LOADER = threading.Thread(target=_load_index, name="index-loader", daemon=True)
+        _INDEX_LOADER.start()
+    return _INDEX_LOADER
+
+def require_index():
+    """추천 인덱스가 아직 없으면 503"""
+    if INDEX is None:
+        raise HTTPException(
+            status_code=503,
+            detail="추천 인덱스를 준비 중이에요. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": "5"},
+        )
+    return INDEX
+
+@app.get("/healthz")
+def healthz():
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readyz():
+    if INDEX is None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": INDEX_STATUS["state"], "error": INDEX_STATUS["error"]},
+            headers={"Retry-After": "5"},
+        )
+    warm = INDEX.warmup.stats()
+    return {
+        "status": "ready",
+        **INDEX.describe(),
+        "warmup": {
+            "enabled": settings.warmup_enabled,
+            "state": warm["state"],
+            "progress": warm["progress"],
+        },
+    }
 
 # ------------------------------------------------
-# 2. 행정구역 & 사분면 (제주 동/서, 서귀포 동/서)
+# 0-1. 추천 엔드포인트 동시성 제한 (admission control)
 # ------------------------------------------------
+# /recommend, /recommend_text, /chat 의 무거운 계산 앞에서만 사용
+# (룰 기반 코스 응답은 대기열을 거치지 않음)
+
+ADMISSION = AdmissionController(
+    max_concurrent=settings.max_concurrent,
+    max_queue=settings.max_queue,
+    queue_timeout_sec=settings.queue_timeout_sec,
+    shed_status_code=settings.shed_status_code,
+)
 
-def extract_region_city(address: str) -> str:
-    if not isinstance(address, str):
-        return "기타"
-    if "제주시" in address:
-        return "제주시"
-    if "서귀포시" in address:
-        return "서귀포시"
-    return "기타"
-
-df["region_city"] = df["address"].apply(extract_region_city)
-
-jeju_mask = (df["region_city"] == "제주시") & df["lng"].notna()
-seogwipo_mask = (df["region_city"] == "서귀포시") & df["lng"].notna()
-
-JEJU_LNG_MID = df.loc[jeju_mask, "lng"].median() if jeju_mask.any() else 126.6
-SEOGWIPO_LNG_MID = df.loc[seogwipo_mask, "lng"].median() if seogwipo_mask.any() else 126.6
-
-# 실제 지명 기반 사분면 매핑
-NAME_TO_SUBREGION = {
-    # 제주시 서쪽
-    "애월": "제주 서",
-    "애월읍": "제주 서",
-    "한림": "제주 서",
-    "한림읍": "제주 서",
-    "협재": "제주 서",
-    "한경": "제주 서",
-    "한경면": "제주 서",
-    "고산": "제주 서",
-    "이호": "제주 서",
-    "이호동": "제주 서",
-    "도두": "제주 서",
-    "도두동": "제주 서",
-    # 제주시 동쪽
-    "조천": "제주 동",
-    "조천읍": "제주 동",
-    "함덕": "제주 동",
-    "함덕리": "제주 동",
-    "구좌": "제주 동",
-    "구좌읍": "제주 동",
-    "김녕": "제주 동",
-    "김녕리": "제주 동",
-    "세화": "제주 동",
-    "월정": "제주 동",
-    "평대": "제주 동",
-    "우도": "제주 동",
-    # 서귀포 동쪽
-    "성산": "서귀포 동",
-    "성산읍": "서귀포 동",
-    "표선": "서귀포 동",
-    "표선면": "서귀포 동",
-    "남원": "서귀포 동",
-    "남원읍": "서귀포 동",
-    # 서귀포 서쪽
-    "중문": "서귀포 서",
-    "중문동": "서귀포 서",
-    "안덕": "서귀포 서",
-    "안덕면": "서귀포 서",
-    "대정": "서귀포 서",
-    "대정읍": "서귀포 서",
-    "모슬포": "서귀포 서",
-    "화순": "서귀포 서",
-}
-
-def classify_subregion(row) -> str:
-    addr = row.get("address", "")
-    city = row.get("region_city", "기타")
-    lng = row.get("lng", np.nan)
-
-    # 1) 주소에 지명이 있으면 우선 사용
-    if isinstance(addr, str):
-        for name, sub in NAME_TO_SUBREGION.items():
-            if name in addr:
-                return sub
-
-    # 2) lng 없으면 도시 기준으로 대충 분류
-    if pd.isna(lng):
-        if city == "제주시":
-            return "제주 동"
-        elif city == "서귀포시":
-            return "서귀포 동"
-        else:
-            return "기타"
-
-    # 3) lng 기준으로 동/서 분할
-    if city == "제주시":
-        return "제주 동" if lng >= JEJU_LNG_MID else "제주 서"
-    elif city == "서귀포시":
-        return "서귀포 동" if lng >= SEOGWIPO_LNG_MID else "서귀포 서"
-    else:
-        return "기타"
-
-df["subregion"] = df.apply(classify_subregion, axis=1)
+@app.exception_handler(AdmissionRejected)
+def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": "요청이 많아 잠시 후 다시 시도해 주세요.", "reason": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 # ------------------------------------------------
-# 3. 프론트 태그 정의 & 확장 (TAGS / STAY_TAGS / FOOD_TAGS)
+# 0-2. 요청 deadline (X-Deadline-Ms)
 # ------------------------------------------------
+# 클라이언트가 보낸 값(없으면 기본값)을 서버 최대값으로 자른 예산 안에서 응답.
+# 대기열 / 동일 요청 대기 / 랭킹 / 코스 구성이 남은 시간을 보고 더 싼 경로로 넘어가며
+# 적용한 것은 응답의 degradations 에 담김. 저장된 랭킹도 없이 시간이 다 되면 504.
 
-BASE_TAGS = [
-    {"key": "휴식", "icon": "🧘"},
-    {"key": "친구들", "icon": "👫"},
-    {"key": "혼자", "icon": "🧭"},
-    {"key": "문화", "icon": "🏛️"},
-    {"key": "자연", "icon": "🏞️"},
-    {"key": "사진", "icon": "📷"},
-    {"key": "반려동물 동반", "icon": "🐶"},
-    {"key": "가족여행", "icon": "👨‍👩‍👧‍👦"},
-    {"key": "액티비티", "icon": "🎯"},
-    {"key": "더보기", "icon": "➕"},
-]
-
-STAY_TAGS = [
-    {"key": "럭셔리", "icon": "💎"},
-    {"key": "휴식", "icon": "🛌"},
-    {"key": "가족여행", "icon": "👨‍👩‍👧‍👦"},
-    {"key": "커플", "icon": "💑"},
-    {"key": "사진", "icon": "📷"},
-    {"key": "반려동물 동반", "icon": "🐶"},
-    {"key": "자연", "icon": "🏞️"},
-    {"key": "오션뷰", "icon": "🌊"},
-    {"key": "풀빌라", "icon": "🏊"},
-    {"key": "더보기", "icon": "➕"},
-]
-
-FOOD_TAGS = [
-    {"key": "흑돼지", "icon": "🐷"},
-    {"key": "고기국수", "icon": "🍜"},
-    {"key": "해장국", "icon": "🥣"},
-    {"key": "제주향토음식", "icon": "🍲"},
-    {"key": "해산물", "icon": "🐟"},
-    {"key": "한식", "icon": "🍱"},
-    {"key": "일식", "icon": "🍣"},
-    {"key": "중식", "icon": "🥡"},
-    {"key": "양식", "icon": "🍝"},
-    {"key": "더보기", "icon": "➕"},
-]
-
-# 추가 태그(내부용) - '맛집' 같은 것
-EXTRA_TAG_KEYS = [
-    "맛집",
-]
-
-ALL_TAG_KEYS = {t["key"] for t in (BASE_TAGS + STAY_TAGS + FOOD_TAGS)} | set(EXTRA_TAG_KEYS)
-
-TAG_TO_QUERY_EXPANSION = {
-    "휴식": "휴식 힐링 조용한 한적한 여유 카페",
-    "친구들": "친구 동행 단체 모임",
-    "혼자": "혼자 솔로 혼자여행 조용한",
-    "문화": "문화 전시 공연 역사 박물관 갤러리 체험",
-    "자연": "자연 숲 바다 산 오름 전망 풍경 해변 드라이브",
-    "사진": "사진 포토 포토스팟 인생샷 뷰 전망 야경",
-    "반려동물 동반": "반려동물 반려견 애견 동물 동반",
-    "가족여행": "가족 가족여행 아이 어린이 키즈",
-    "액티비티": "액티비티 체험 레저 서핑 승마 카약",
-    "럭셔리": "럭셔리 고급 프리미엄 스파",
-    "커플": "커플 연인 로맨틱 데이트 감성",
-    "오션뷰": "오션뷰 바다뷰 바다전망 해변 해안",
-    "풀빌라": "풀빌라 수영장 프라이빗 독채",
-    "흑돼지": "흑돼지 고기 삼겹살 구이",
-    "고기국수": "고기국수 국수 국밥",
-    "해장국": "해장국 국밥",
-    "제주향토음식": "향토음식 제주음식 토속음식",
-    "해산물": "해산물 회 해물 생선 조개",
-    "한식": "한식 백반 식당",
-    "일식": "일식 초밥 스시",
-    "중식": "중식 중국집 짜장 짬뽕",
-    "양식": "양식 파스타 피자 스테이크",
-    "맛집": "맛집 음식점 식당 카페 로컬 맛집",
-}
-
-def extract_tags_from_free_text(free_text: str) -> List[str]:
-    if not free_text:
-        return []
-    tokens = re.split(r"[\s,]+", free_text.strip())
-    extra_tags = set()
-    for token in tokens:
-        if not token:
-            continue
-        for tag in ALL_TAG_KEYS:
-            if tag in token or token in tag:
-                extra_tags.add(tag)
-    return list(extra_tags)
-
-def build_query_from_tags(selected_tags: List[str], free_text: str = "") -> Tuple[str, List[str]]:
-    extra_tags = extract_tags_from_free_text(free_text)
-    merged_tags = list(set(selected_tags) | set(extra_tags))
-
-    tokens: List[str] = []
-    for tag in merged_tags:
-        t = tag.strip()
-        if not t:
-            continue
-        tokens.append(t)
-        if t in TAG_TO_QUERY_EXPANSION:
-            tokens.append(TAG_TO_QUERY_EXPANSION[t])
+DEADLINES = DeadlineMonitor()
 
-    if free_text:
-        tokens.append(free_text)
+def request_deadline(request: Request) -> Deadline:
+    budget = deadline_budget_sec(
+        request.headers.get(DEADLINE_HEADER),
+        settings.deadline_default_ms,
+        settings.deadline_max_ms,
+    )
+    return Deadline(budget, monitor=DEADLINES)
+
+@app.exception_handler(DeadlineExceeded)
+def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    DEADLINES.record_exceeded()
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "응답 시간 안에 추천을 만들지 못했어요. 조건을 줄이거나 다시 시도해 주세요.", "stage": exc.stage},
+    )
 
-    query_text = " ".join(tokens)
-    return query_text, merged_tags
+@app.get("/stats")
+def stats():
+    return {
+        "admission": ADMISSION.stats(),
+        "singleflight": SINGLE_FLIGHT.stats(),
+        "result_cache": RESULT_CACHE.stats(),
+        "deadlines": dict(
+            DEADLINES.stats(),
+            stage_costs=INDEX.stage_costs.stats() if INDEX is not None else None,
+        ),
+        "warmup": INDEX.warmup.stats() if INDEX is not None else None,
+        "shards": INDEX.scorer.stats() if INDEX is not None else None,
+        "images": THUMBNAILS.stats(),
+        "chat_sessions": CHAT_SESSIONS.stats(),
+        "interactions": dict(
+            INTERACTIONS.stats(),
+            popularity=dict(POPULARITY.stats(), weight=settings.popularity_weight),
+        ),
+        "catalog_refresh": CATALOG_REFRESH["last_report"],
+        "regions": REGIONS.stats(),
+    }
 
 # ------------------------------------------------
-# 4. category → place / food / stay 매핑
+# 0-3. 여러 여행지 (?destination=)
 # ------------------------------------------------
+# - 추천 / 장소 조회 / facet / 자동완성은 ?destination= 으로 목적지를 고름
+#   (없거나 jeju 면 지금처럼 INDEX, 다른 목적지는 JEJU_REGIONS_PATH 목록의 카탈로그 + 지명 사전)
+# - 다른 목적지 인덱스는 처음 요청될 때 만들고, 예산(JEJU_REGION_MEMORY_BUDGET_MB)을 넘으면
+#   오래 안 쓴 목적지부터 내림 (regions.py). 만드는 동안은 요청 deadline 까지만 기다리고 503
+#   만들다 실패하면 원인은 서버 로그에만 남기고 JEJU_REGION_LOAD_RETRY_SEC 동안 503 (다시 빌드하지 않음)
+# - 채팅 / 코스 교체 / 이벤트 / 카탈로그 갱신은 기본 목적지만
+
+def _build_destination(destination):
+    import recommender  # 무거운 import (기본 인덱스가 있으면 이미 import 됨)
+
+    index = recommender.build_index(destination.catalog_path, gazetteer=destination.gazetteer)
+    index.set_popularity(POPULARITY.counts(), POPULARITY.version)
+    if settings.warmup_enabled:
+        index.start_warmup()
+    return index
+
+REGIONS = RegionRegistry(
+    load_destinations(settings.regions_path) if settings.regions_path else {},
+    build=_build_destination,
+    measure=lambda index: index_footprint(index)["total_bytes"],
+    budget_bytes=settings.region_memory_budget_mb * 1024 * 1024,
+    on_evict=lambda index: index.warmup.stop(),
+    retry_after_sec=settings.region_load_retry_sec,
+)
 
-def map_category(cat: str) -> str:
-    c = str(cat).lower()
-    if c == "attraction":
-        return "place"
-    if c == "food":
-        return "food"
-    if c == "stay":
-        return "stay"
-    if any(k in c for k in ["food", "restaurant", "cafe", "식당", "카페", "맛집"]):
-        return "food"
-    if any(k in c for k in ["stay", "hotel", "숙소", "펜션", "리조트", "게스트하우스"]):
-        return "stay"
-    return "place"
-
-df["category_mapped"] = df["category"].map(map_category)
-
-# ✅ 사람 읽기용 카테고리 라벨 (이 부분이 새로 들어간 부분)
-CATEGORY_LABEL = {
-    "place": "관광",
-    "food": "식사",
-    "stay": "숙소",
-}
-
-# ------------------------------------------------
-# 5. TF-IDF 학습
-# ------------------------------------------------
+def destination_index(destination: Optional[str], wait_sec: Optional[float] = None):
+    """
+    ?destination= → 추천 인덱스 (비어 있거나 기본 목적지면 INDEX)
+    wait_sec: 아직 안 올라온 목적지를 기다릴 최대 시간 (기본: deadline_default_ms)
+    """
+    name = (destination or "").strip().lower()
+    if not name or name == DEFAULT_DESTINATION:
+        return require_index()
+    if wait_sec is None:
+        wait_sec = settings.deadline_default_ms / 1000
+    try:
+        return REGIONS.get(name, timeout=wait_sec)
+    except UnknownDestination:
+        raise HTTPException(
+            status_code=404,
+            detail=f"알 수 없는 여행지예요: {name} (가능: {', '.join([DEFAULT_DESTINATION] + REGIONS.names())})",
+        )
+    except DestinationLoading:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{name} 추천 인덱스를 준비 중이에요. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": "5"},
+        )
+    except DestinationUnavailable as e:
+        # 원인(파일 경로 / 예외)은 서버 로그에만 남김
+        raise HTTPException(
+            status_code=503,
+            detail=f"{name} 추천 인덱스를 만들지 못했어요. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
-vectorizer = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b")
-tfidf_matrix = vectorizer.fit_transform(df["search_text"])
+def canonical_destination(index) -> Optional[str]:
+    """정규화한 URL 에 넣을 목적지 (기본 목적지면 생략)"""
+    return None if index.destination == DEFAULT_DESTINATION else index.destination
 
 # ------------------------------------------------
-# 6. 헬퍼: 정렬 / 후보 선택
-# ------------------------------------------------
-
-def sort_by_subregion_then_similarity(sub_df: pd.DataFrame) -> pd.DataFrame:
-    sub_df = sub_df.copy()
-    sub_df["subregion"] = sub_df["subregion"].fillna("기타")
-    order_map = {"제주 동": 0, "제주 서": 1, "서귀포 동": 2, "서귀포 서": 3, "기타": 4}
-    sub_df["subrank"] = sub_df["subregion"].map(lambda x: order_map.get(x, 99))
-    sub_df = sub_df.sort_values(
-        by=["subrank", "similarity"],
-        ascending=[True, False]
-    ).reset_index(drop=True)
-    return sub_df.drop(columns=["subrank"])
-
-def get_best_candidate(
-    df_cat: pd.DataFrame,
-    used_indices: set,
-    preferred_subregion: Optional[str] = None,
-) -> Optional[pd.Series]:
-    if df_cat.empty:
-        return None
-    if preferred_subregion:
-        sub = df_cat[
-            (df_cat["subregion"] == preferred_subregion) &
-            (~df_cat["orig_idx"].isin(used_indices))
-        ]
-        if not sub.empty:
-            return sub.iloc[0]
-    rest = df_cat[~df_cat["orig_idx"].isin(used_indices)]
-    if rest.empty:
-        return None
-    return rest.iloc[0]
-
-# ------------------------------------------------
-# 7. 메인 추천 로직 (시간 X, Day/순서만)
+# 1. 동일 요청 합치기 (single-flight)
 # ------------------------------------------------
+# "제주 서쪽 당일치기 코스 추천해줘" 처럼 같은 요청이 동시에 여러 번 들어오면
+# 파싱된 조건을 정규화한 key 로 묶어서 한 번만 계산하고 결과를 공유한다.
+# (follower 는 admission 대기열도 거치지 않음)
+
+SINGLE_FLIGHT = SingleFlight()
+
+# 같은 조건의 최근 결과 (프로세스 안 LRU + 선택적으로 워커끼리 공유하는 Redis 프로토콜 서버)
+# key 에 카탈로그 버전 / scorer 설정이 들어가서 카탈로그가 바뀌면 이전 결과는 쓰이지 않음
+RESULT_CACHE = build_result_cache(
+    settings.result_cache_size,
+    shared_url=settings.shared_cache_url,
+    timeout_ms=settings.shared_cache_timeout_ms,
+    ttl_sec=settings.shared_cache_ttl_sec,
+)
 
-def recommend_itinerary_no_time(
+def canonical_query_key(
+    selected_tags: List[str],
+    region_filter_address: Optional[str],
+    region_filter_subregions: Optional[List[str]],
+    days: int,
+    max_places_per_day: int,
+    free_text: str,
+) -> tuple:
+    """
+    결과에 영향을 주지 않는 차이(태그 순서/중복, 공백)는 무시한 key
+    """
+    tags_key = tuple(sorted({t.strip() for t in selected_tags if t and t.strip()}))
+    addr_key = (region_filter_address or "").strip() or None
+    subs_key = tuple(sorted(set(region_filter_subregions))) if region_filter_subregions else None
+    text_key = " ".join((free_text or "").split())
+    return (tags_key, addr_key, subs_key, int(days), int(max_places_per_day), text_key)
+
+def run_coalesced(
+    key: tuple,
+    work: Callable[[], Any],
+    deadline: Optional[Deadline],
+    fallback: Optional[Callable[[], Any]] = None,
+) -> Any:
+    """
+    work() 를 admission + single-flight 로 실행 (결과와 degradations 를 follower 와 공유)
+    - 대기열이나 leader 대기 중에 deadline 이 끝나면 work() 는 돌리지 않음 (슬롯 없이 계산하면 동시성 제한이 무너지므로)
+      fallback() 이 값을 주면(결과 캐시 등 계산 없는 조회) 그걸 쓰고 bypass 로 셈, 아니면 DeadlineExceeded
+    - leader 가 자기 deadline 때문에 DeadlineExceeded 로 끝났으면 시간이 남은 follower 는 다시 시도
+    """
+    def remaining() -> Optional[float]:
+        return deadline.remaining() if deadline is not None else None
+
+    def run():
+        result = work()
+        return result, tuple(deadline.degradations) if deadline is not None else ()
+
+    def without_slot(stage: str):
+        result = fallback() if fallback is not None else None
+        if result is None:
+            raise DeadlineExceeded(stage)
+        ADMISSION.record_bypass()
+        return result, ()
+
+    def compute():
+        try:
+            with ADMISSION.slot(max_wait_sec=remaining()):
+                return run()
+        except AdmissionRejected as e:
+            if e.reason != "deadline":
+                raise
+        return without_slot("admission")
+
+    for attempt in range(2):
+        try:
+            result, degradations = SINGLE_FLIGHT.do(key, compute, timeout=remaining())
+            break
+        except TimeoutError:
+            result, degradations = without_slot("singleflight")
+            break
+        except DeadlineExceeded:
+            if attempt or deadline is None or deadline.expired():
+                raise
+    if deadline is not None:
+        deadline.merge(degradations)
+    return result
+
+def recommend_itinerary_coalesced(
     selected_tags: List[str],
     region_filter_address: Optional[str] = None,
     region_filter_subregions: Optional[List[str]] = None,
     days: int = 1,
     max_places_per_day: int = 3,
     free_text: str = "",
-) -> pd.DataFrame:
+    deadline: Optional[Deadline] = None,
+    index=None,
+) -> List[DayPlan]:
     """
-    - 태그 + freeText 기반 TF-IDF 유사도
-    - place / food / stay를 종합해서 Day별 코스 구성
-      * place 여러 개 (max_places_per_day)
-      * 첫 place 뒤에 food 1개 끼워 넣기
-      * 마지막에 stay 1개 붙이기
-    - region_filter_address: 주소 문자열 필터 (애월, 성산, 중문 등)
-    - region_filter_subregions: ["제주 서", "서귀포 서"] 등 사분면 필터
+    index.recommend_days 를 admission + single-flight 로 감싼 버전 (index 가 없으면 INDEX).
+    반환된 DayPlan 목록은 여러 요청이 공유하므로 수정하면 안 됨.
+    deadline 에 적용한 degradations 가 기록됨
     """
-
-    query_text, merged_tags = build_query_from_tags(selected_tags, free_text=free_text)
-    if not query_text.strip():
-        return pd.DataFrame()
-
-    candidate_df = df.copy()
-    candidate_df["orig_idx"] = candidate_df.index
-
-    # 1) 주소 기반 지역 필터
-    if region_filter_address and region_filter_address.strip():
-        mask_region = candidate_df["address"].str.contains(region_filter_address.strip(), na=False)
-        candidate_df = candidate_df[mask_region]
-
-    # 2) 사분면 기반 필터 (서쪽/동쪽 등)
-    if region_filter_subregions:
-        candidate_df = candidate_df[candidate_df["subregion"].isin(region_filter_subregions)]
-
-    # 만약 필터 때문에 비어버리면 전체로 fallback
-    if len(candidate_df) == 0:
-        candidate_df = df.copy()
-        candidate_df["orig_idx"] = candidate_df.index
-
-    idx_list = candidate_df["orig_idx"].tolist()
-    candidate_tfidf = tfidf_matrix[idx_list]
-    query_vec = vectorizer.transform([query_text])
-    cosine_sim = linear_kernel(query_vec, candidate_tfidf).flatten()
-    candidate_df["similarity"] = cosine_sim
-
-    place_df = sort_by_subregion_then_similarity(
-        candidate_df[candidate_df["category_mapped"] == "place"]
-    ).copy()
-    food_df = sort_by_subregion_then_similarity(
-        candidate_df[candidate_df["category_mapped"] == "food"]
-    ).copy()
-    stay_df = sort_by_subregion_then_similarity(
-        candidate_df[candidate_df["category_mapped"] == "stay"]
-    ).copy()
-
-    if place_df.empty and food_df.empty and stay_df.empty:
-        return pd.DataFrame()
-
-    total_place_needed = days * max_places_per_day
-    place_df = place_df.head(total_place_needed).reset_index(drop=True)
-
-    used_indices: set = set()
-    results = []
-
-    for day in range(1, days + 1):
-        start_idx = (day - 1) * max_places_per_day
-        end_idx = day * max_places_per_day
-        day_places = place_df.iloc[start_idx:end_idx]
-        day_places = day_places[~day_places["orig_idx"].isin(used_indices)].reset_index(drop=True)
-
-        if day_places.empty:
-            continue
-
-        dominant_sub = (
-            day_places["subregion"].value_counts().idxmax()
-            if not day_places["subregion"].empty
-            else None
+    index = index if index is not None else require_index()
+    key = (index.destination, index.version) + canonical_query_key(
+        selected_tags, region_filter_address, region_filter_subregions,
+        days, max_places_per_day, free_text,
+    )
+    cache_key = make_cache_key("jeju:recommend:", index.scorer.signature, *key)
+    cached = RESULT_CACHE.get(cache_key, index.decode_days)
+    if cached is not None:
+        ADMISSION.record_bypass()
+        return cached
+
+    def work() -> List[DayPlan]:
+        return index.recommend_days(
+            selected_tags=selected_tags,
+            region_filter_address=region_filter_address,
+            region_filter_subregions=region_filter_subregions,
+            days=days,
+            max_places_per_day=max_places_per_day,
+            free_text=free_text,
+            deadline=deadline,
         )
 
-        day_food_candidate = get_best_candidate(food_df, used_indices, preferred_subregion=dominant_sub)
-        last_place_sub = day_places.iloc[-1]["subregion"]
-        day_stay_candidate = get_best_candidate(stay_df, used_indices, preferred_subregion=last_place_sub)
-
-        day_items = []
-        for i, (_, prow) in enumerate(day_places.iterrows()):
-            day_items.append(("place", prow))
-            # 첫 번째 관광지 뒤에 맛집 1개 끼워 넣기
-            if i == 0 and day_food_candidate is not None:
-                day_items.append(("food", day_food_candidate))
-
-        if day_stay_candidate is not None:
-            day_items.append(("stay", day_stay_candidate))
-
-        order_in_day = 0
-        for cat, row in day_items:
-            if pd.isna(row.get("orig_idx", np.nan)):
-                continue
-            if row["orig_idx"] in used_indices:
-                continue
-
-            used_indices.add(row["orig_idx"])
-            order_in_day += 1
-
-            results.append({
-                "day": day,
-                "order_in_day": order_in_day,
-                "name": row.get("name", ""),
-                "category": cat,  # place / food / stay (내부 코드)
-                "address": row.get("address", ""),
-                "region_city": row.get("region_city", ""),
-                "subregion": row.get("subregion", ""),
-                "tags": row.get("tags", ""),
-                "descriptionShort": row.get("descriptionShort", ""),
-                "similarity": float(row["similarity"]),
-                "lat": row.get("lat"),
-                "lng": row.get("lng"),
-            })
-
-    if not results:
-        return pd.DataFrame()
-
-    return pd.DataFrame(results)
+    # 기다리다 시간이 다 됐으면 그 사이 다른 요청이 넣어 둔 결과만 확인
+    result = run_coalesced(key, work, deadline, fallback=lambda: RESULT_CACHE.get(cache_key, index.decode_days))
+    # 시간이 모자라 더 싼 경로로 만든 결과는 다른 요청에 재사용하지 않음
+    if deadline is None or not deadline.degradations:
+        RESULT_CACHE.put(cache_key, result, index.encode_days)
+    return result
 
 # ------------------------------------------------
-# 8. 자연어/키워드 파서 (고도화 버전 - /recommend_text용)
+# 2. 자연어/키워드 파서 (고도화 버전 - /recommend_text용)
 # ------------------------------------------------
 
 # 한글 숫자 간단 매핑
@@ -617,10 +590,11 @@ def parse_tags_from_text(text: str) -> List[str]:
 
     return tags
 
-def parse_user_query_advanced(query: str):
+def parse_user_query_advanced(query: str, gazetteer=None):
     """
     자연어/짧은 키워드 → days, tags, region(Address/Subregion), freeText
     ( /recommend_text 에서 사용 )
+    gazetteer: 제주 외 목적지의 지명 사전 (지역은 parse_region 대신 그 사전으로 파싱)
     """
     original = query
     text = query.strip()
@@ -629,7 +603,7 @@ def parse_user_query_advanced(query: str):
     low = text.lower()
 
     days = parse_days(low)
-    addr_kw, subregions = parse_region(text)
+    addr_kw, subregions = parse_region(text) if gazetteer is None else gazetteer.parse_region(text)
     tags = parse_tags_from_text(text)
 
     # freeText는 TF-IDF용으로 문장 전체를 그대로 사용
@@ -645,7 +619,7 @@ def parse_user_query_advanced(query: str):
     }
 
 # ------------------------------------------------
-# 8-1. 챗봇용 간단 파서 (네가 쓰던 parse_chat_message 그대로)
+# 2-1. 챗봇용 간단 파서 (네가 쓰던 parse_chat_message 그대로)
 # ------------------------------------------------
 
 KEYWORD_TO_TAG = {
@@ -807,8 +781,45 @@ def parse_chat_message(message: str):
         "start_time_str": start_time_str,
     }
 
+# 세션이 있을 때만 보는 후속 요청 ("숙소만 바꿔줘", "2일차 맛집 다른 데로", "하루 더")
+FOLLOW_UP_CATEGORY_WORDS = {
+    "stay": ["숙소", "호텔", "펜션", "게스트하우스", "리조트"],
+    "food": ["맛집", "식당", "밥집", "음식", "식사"],
+    "place": ["관광지", "명소", "여행지", "볼거리", "관광"],
+}
+FOLLOW_UP_CHANGE_WORDS = ["바꿔", "바꾸", "변경", "교체", "다른"]
+FOLLOW_UP_CATEGORY_LABEL = {"stay": "숙소", "food": "맛집", "place": "관광지"}
+
+def parse_chat_follow_up(message: str) -> Optional[dict]:
+    """
+    이전 코스를 고치는 후속 요청이면
+      {"action": "extend", "days": +n/-n}
+      {"action": "replace", "category": "stay", "days": [2] 또는 None}
+    아니면 None (새 코스 요청으로 처리)
+    """
+    msg = (message or "").strip()
+
+    # 1) 일정 늘리기 / 줄이기
+    m = re.search(r"(하루|\d+\s*일)\s*(더|늘려|추가)", msg)
+    if m:
+        n = 1 if m.group(1) == "하루" else int(re.sub(r"\D", "", m.group(1)))
+        return {"action": "extend", "days": n}
+    m = re.search(r"(하루|\d+\s*일)\s*(줄여|빼)", msg)
+    if m:
+        n = 1 if m.group(1) == "하루" else int(re.sub(r"\D", "", m.group(1)))
+        return {"action": "extend", "days": -n}
+
+    # 2) 특정 카테고리만 교체
+    if not any(w in msg for w in FOLLOW_UP_CHANGE_WORDS):
+        return None
+    for category, words in FOLLOW_UP_CATEGORY_WORDS.items():
+        if any(w in msg for w in words):
+            days = [int(d) for d in re.findall(r"(\d+)\s*일\s*(?:차|째)", msg)] or None
+            return {"action": "replace", "category": category, "days": days}
+    return None
+
 # ------------------------------------------------
-# 8-2. 코스 전용 룰 기반 응답 (동/서/남/북/2박3일)
+# 2-2. 코스 전용 룰 기반 응답 (동/서/남/북/2박3일)
 # ------------------------------------------------
 
 CourseDayRB = Dict[str, object]  # {"day": int, "title": str, "items": List[dict]]
@@ -1039,124 +1050,224 @@ def rule_based_course_answer(user_message: str) -> Optional[str]:
     return None
 
 # ------------------------------------------------
-# 9. Pydantic 모델 (Request / Response)
-# ------------------------------------------------
-
-class RecommendRequest(BaseModel):
-    tags: List[str] = []
-    region: Optional[str] = None           # 주소 필터 (ex. 제주시, 서귀포시, 애월, 성산...)
-    days: int = 1
-    max_places_per_day: int = 3
-    freeText: Optional[str] = ""
-    subregions: Optional[List[str]] = None # ["제주 서", "서귀포 서"] 등
-
-class ItineraryItem(BaseModel):
-    day: int
-    order_in_day: int
-    name: str
-    category: str          # "관광" / "식사" / "숙소"  ← 사람 읽는 라벨
-    address: str
-    region_city: str
-    subregion: str
-    tags: str
-    descriptionShort: str
-    similarity: float
-    lat: Optional[float]
-    lng: Optional[float]
-
-class DayPlan(BaseModel):
-    day: int
-    items: List[ItineraryItem]
-
-class RecommendResponse(BaseModel):
-    days: List[DayPlan]
-
-# 자연어/키워드용
-class RecommendTextRequest(BaseModel):
-    query: str
-    max_places_per_day: int = 3
-
-class ParsedQuery(BaseModel):
-    original: str
-    days: int
-    tags: List[str]
-    region_address: Optional[str]
-    region_subregions: Optional[List[str]]
-    freeText: str
-
-class RecommendTextResponse(BaseModel):
-    parsed: ParsedQuery
-    days: List[DayPlan]
-    message: str           # ✅ 챗봇에 그대로 쓸 한국어 문장
-
-# 챗봇용
-class ChatRequest(BaseModel):
-    message: str
-
-class ChatResponse(BaseModel):
-    reply: str
-    itinerary: RecommendResponse
-
-# ------------------------------------------------
-# 10. DataFrame -> Response 변환
-# ------------------------------------------------
-
-def itinerary_df_to_days(itinerary_df: pd.DataFrame) -> List[DayPlan]:
-    if itinerary_df.empty:
-        return []
-
-    days_result: List[DayPlan] = []
-
-    for day in sorted(itinerary_df["day"].unique()):
-        day_df = itinerary_df[itinerary_df["day"] == day].copy()
-        day_df = day_df.sort_values("order_in_day")
-
-        items: List[ItineraryItem] = []
-        for _, row in day_df.iterrows():
-            raw_cat = str(row["category"])
-            label = CATEGORY_LABEL.get(raw_cat, "기타")  # place → 관광 식으로 변환
-
-            items.append(
-                ItineraryItem(
-                    day=int(row["day"]),
-                    order_in_day=int(row["order_in_day"]),
-                    name=str(row["name"]),
-                    category=label,
-                    address=str(row["address"]),
-                    region_city=str(row["region_city"]),
-                    subregion=str(row["subregion"]),
-                    tags=str(row["tags"]),
-                    descriptionShort=str(row["descriptionShort"]),
-                    similarity=float(row["similarity"]),
-                    lat=float(row["lat"]) if not pd.isna(row["lat"]) else None,
-                    lng=float(row["lng"]) if not pd.isna(row["lng"]) else None,
-                )
-            )
-        days_result.append(DayPlan(day=int(day), items=items))
-
-    return days_result
-
-def itinerary_df_to_recommend_response(itinerary_df: pd.DataFrame) -> RecommendResponse:
-    return RecommendResponse(days=itinerary_df_to_days(itinerary_df))
-
-# ------------------------------------------------
-# 11. /recommend (구조화된 요청용)
+# 3. /recommend (구조화된 요청용)
 # ------------------------------------------------
+# 추천 응답 공통 (POST/GET /recommend, /recommend_text)
+# - ?fields=id,name,lat,lng (또는 fields=pin) 이면 코스 항목은 그 필드만 (projection.py)
+# - Accept: application/msgpack 이면 MessagePack 으로 (http_cache.py, msgpack 설치 시)
+
+def item_fields(values: List[str]) -> Fields:
+    try:
+        return parse_fields(values)
+    except FieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def shaped_response(request: Request, model, fields: Fields):
+    """필드 선택도 없고 JSON 이면 모델 그대로 (기존 응답), 아니면 골라낸 dict 를 요청한 형식으로"""
+    if fields is None and negotiate_media_type(request.headers.get("accept")) == JSON_MEDIA_TYPE:
+        return model
+    return negotiated_response(request, dump_response(model, fields))
 
 @app.post("/recommend", response_model=RecommendResponse)
-def recommend_endpoint(req: RecommendRequest):
-    itinerary_df = recommend_itinerary_no_time(
+def recommend_endpoint(
+    req: RecommendRequest,
+    request: Request,
+    fields: List[str] = Query(default=[]),
+    destination: Optional[str] = None,
+    deadline: Deadline = Depends(request_deadline),
+):
+    selected = item_fields(fields)
+    index = destination_index(destination, deadline.remaining())
+    days_plans = recommend_itinerary_coalesced(
         selected_tags=req.tags,
         region_filter_address=req.region,
         region_filter_subregions=req.subregions,
         days=req.days,
         max_places_per_day=req.max_places_per_day,
         free_text=req.freeText or "",
+        deadline=deadline,
+        index=index,
+    )
+    return shaped_response(request, RecommendResponse(days=days_plans, degradations=deadline.degradations), selected)
+
+# ------------------------------------------------
+# 3-1. /recommend/replace (코스 한 칸만 교체)
+# ------------------------------------------------
+# 현재 코스 + 바꿀 위치(day, order_in_day)를 받아서
+# 같은 사분면·카테고리에서 아직 안 쓴 다음 후보로 그 칸만 바꾼다.
+# 랭킹은 /chat 세션 → warm-up 표 → 최근 랭킹 LRU 순으로 재사용하고,
+# 처음 보는 조건일 때만 한 번 계산한다 (이후 교체는 후보 몇 개만 훑음).
+
+LABEL_TO_CATEGORY = {label: cat for cat, label in CATEGORY_LABEL.items()}
+
+def compact_ranking_for(req: ReplaceItemRequest):
+    index = require_index()
+    session = CHAT_SESSIONS.get(req.session_id) if req.session_id else None
+    # 카탈로그 갱신 전에 만든 세션의 랭킹은 행 위치가 달라서 쓰지 않음
+    if session is not None and session.index_version == index.version:
+        ADMISSION.record_bypass()
+        return session.compact
+
+    kwargs = dict(
+        selected_tags=req.tags,
+        region_filter_address=req.region,
+        region_filter_subregions=req.subregions,
+        free_text=req.freeText or "",
     )
-    return itinerary_df_to_recommend_response(itinerary_df)
+    compact = index.compact_ranking(**kwargs, compute=False)
+    if compact is not None:
+        ADMISSION.record_bypass()
+        return compact
+
+    key = ("compact_ranking", index.version) + canonical_query_key(days=0, max_places_per_day=0, **kwargs)
+
+    def compute():
+        with ADMISSION.slot():
+            return index.compact_ranking(**kwargs)
+
+    return SINGLE_FLIGHT.do(key, compute)
+
+@app.post("/recommend/replace", response_model=ReplaceItemResponse)
+def replace_item_endpoint(req: ReplaceItemRequest):
+    index = require_index()
+    target = next(
+        (
+            item
+            for day_plan in req.itinerary if day_plan.day == req.day
+            for item in day_plan.items if item.order_in_day == req.order_in_day
+        ),
+        None,
+    )
+    if target is None:
+        raise HTTPException(status_code=404, detail="해당 위치의 코스 항목이 없어요.")
+
+    category = LABEL_TO_CATEGORY.get(target.category, target.category)
+    if category not in CATEGORY_LABEL:
+        raise HTTPException(status_code=400, detail="교체할 수 없는 항목이에요.")
+    if req.category and LABEL_TO_CATEGORY.get(req.category, req.category) != category:
+        raise HTTPException(status_code=400, detail="해당 위치의 항목 카테고리가 요청과 달라요.")
+
+    compact = compact_ranking_for(req)
+    item = None
+    if compact is not None:
+        item = index.replacement_item(compact, req.itinerary, target, category, req.exclude_ids)
+
+    days = [
+        DayPlan(
+            day=day_plan.day,
+            items=[
+                item if item is not None and it is target else it
+                for it in day_plan.items
+            ],
+        )
+        for day_plan in req.itinerary
+    ]
+    return ReplaceItemResponse(days=days, replaced=target, item=item)
 
 # ------------------------------------------------
-# 12. /recommend_text (자연어/키워드 전용)
+# 3-2. GET /recommend, GET /recommend_text (CDN / 브라우저 캐시용)
+# ------------------------------------------------
+# 결과는 요청 조건 + 카탈로그 버전(+ scorer 설정)으로만 정해지므로 GET 으로도 받는다.
+# - 쿼리스트링을 정규화(태그/사분면 정렬·중복 제거, 공백 정리)해서 ETag 를 만들고
+#   정규화한 URL 을 Content-Location 으로 알려줌 (엣지 캐시 key 를 맞추는 용도)
+# - If-None-Match 가 맞으면 추천 계산 / admission 없이 바로 304
+
+def split_query_values(values: List[str]) -> List[str]:
+    """?tags=a&tags=b 와 ?tags=a,b 둘 다 허용"""
+    return [v.strip() for raw in values for v in raw.split(",") if v.strip()]
+
+def recommend_etag(index, kind: str, key: tuple) -> str:
+    return make_etag(index.destination, index.version, index.scorer.signature, kind, key)
+
+def canonical_url(path: str, params: List[tuple]) -> str:
+    query = urlencode([(k, v) for k, v in params if v not in (None, "")])
+    return f"{path}?{query}" if query else path
+
+def not_degraded(payload: dict) -> bool:
+    """deadline 때문에 줄인 결과는 캐시에 남기지 않음 (ETag 없이 no-store)"""
+    return not payload.get("degradations")
+
+@app.get("/recommend", response_model=RecommendResponse)
+def recommend_get_endpoint(
+    request: Request,
+    tags: List[str] = Query(default=[]),
+    region: Optional[str] = None,
+    subregions: List[str] = Query(default=[]),
+    days: int = 1,
+    max_places_per_day: int = 3,
+    freeText: str = "",
+    fields: List[str] = Query(default=[]),
+    destination: Optional[str] = None,
+    deadline: Deadline = Depends(request_deadline),
+):
+    index = destination_index(destination, deadline.remaining())
+    selected = item_fields(fields)
+    key = canonical_query_key(
+        split_query_values(tags), region, split_query_values(subregions),
+        days, max_places_per_day, freeText,
+    )
+    tags_key, addr_key, subs_key, days_key, mpd_key, text_key = key
+
+    location = canonical_url(
+        "/recommend",
+        [("tags", t) for t in tags_key]
+        + [("region", addr_key)]
+        + [("subregions", sub) for sub in subs_key or ()]
+        + [("days", days_key), ("max_places_per_day", mpd_key), ("freeText", text_key)]
+        + [("fields", ",".join(selected or ())), ("destination", canonical_destination(index))],
+    )
+
+    def build():
+        days_plans = recommend_itinerary_coalesced(
+            selected_tags=list(tags_key),
+            region_filter_address=addr_key,
+            region_filter_subregions=list(subs_key) if subs_key else None,
+            days=days_key,
+            max_places_per_day=mpd_key,
+            free_text=text_key,
+            deadline=deadline,
+            index=index,
+        )
+        return dump_response(RecommendResponse(days=days_plans, degradations=deadline.degradations), selected)
+
+    return cached_json_response(
+        request,
+        recommend_etag(index, "recommend", key if selected is None else key + (selected,)),
+        build,
+        max_age=settings.recommend_max_age,
+        extra_headers={"Content-Location": location},
+        cacheable=not_degraded,
+    )
+
+@app.get("/recommend_text", response_model=RecommendTextResponse)
+def recommend_text_get_endpoint(
+    request: Request,
+    query: str = Query(..., min_length=1),
+    max_places_per_day: int = 3,
+    fields: List[str] = Query(default=[]),
+    destination: Optional[str] = None,
+    deadline: Deadline = Depends(request_deadline),
+):
+    index = destination_index(destination, deadline.remaining())
+    selected = item_fields(fields)
+    text = " ".join(query.split())
+    key = (text, int(max_places_per_day))
+    location = canonical_url(
+        "/recommend_text",
+        [("query", text), ("max_places_per_day", key[1]), ("fields", ",".join(selected or ()))]
+        + [("destination", canonical_destination(index))],
+    )
+    return cached_json_response(
+        request,
+        recommend_etag(index, "recommend_text", key if selected is None else key + (selected,)),
+        lambda: dump_response(build_recommend_text_response(text, key[1], deadline, index), selected),
+        max_age=settings.recommend_max_age,
+        extra_headers={"Content-Location": location},
+        cacheable=not_degraded,
+    )
+
+# ------------------------------------------------
+# 4. /recommend_text (자연어/키워드 전용)
 # ------------------------------------------------
 
 def format_itinerary_message(parsed: ParsedQuery, days: List[DayPlan]) -> str:
@@ -1195,20 +1306,40 @@ def format_itinerary_message(parsed: ParsedQuery, days: List[DayPlan]) -> str:
     return header + "\n" + subheader + "\n" + "\n".join(body_lines) + "\n" + footer
 
 @app.post("/recommend_text", response_model=RecommendTextResponse)
-def recommend_text_endpoint(req: RecommendTextRequest):
-    parsed_raw = parse_user_query_advanced(req.query)
+def recommend_text_endpoint(
+    req: RecommendTextRequest,
+    request: Request,
+    fields: List[str] = Query(default=[]),
+    destination: Optional[str] = None,
+    deadline: Deadline = Depends(request_deadline),
+):
+    selected = item_fields(fields)
+    index = destination_index(destination, deadline.remaining())
+    return shaped_response(
+        request, build_recommend_text_response(req.query, req.max_places_per_day, deadline, index), selected,
+    )
 
-    itinerary_df = recommend_itinerary_no_time(
+def build_recommend_text_response(
+    query: str,
+    max_places_per_day: int,
+    deadline: Optional[Deadline] = None,
+    index=None,
+) -> RecommendTextResponse:
+    """index: 다른 목적지 인덱스면 지역 파싱도 그 목적지의 지명 사전으로"""
+    gazetteer = index.gazetteer if index is not None and index.destination != DEFAULT_DESTINATION else None
+    parsed_raw = parse_user_query_advanced(query, gazetteer)
+
+    days_plans = recommend_itinerary_coalesced(
         selected_tags=parsed_raw["tags"],
         region_filter_address=parsed_raw["region_address"],
         region_filter_subregions=parsed_raw["region_subregions"],
         days=parsed_raw["days"],
-        max_places_per_day=req.max_places_per_day,
+        max_places_per_day=max_places_per_day,
         free_text=parsed_raw["freeText"],
+        deadline=deadline,
+        index=index,
     )
 
-    days_plans = itinerary_df_to_days(itinerary_df)
-
     parsed_model = ParsedQuery(
         original=parsed_raw["original"],
         days=parsed_raw["days"],
@@ -1224,10 +1355,11 @@ def recommend_text_endpoint(req: RecommendTextRequest):
         parsed=parsed_model,
         days=days_plans,
         message=message,
+        degradations=deadline.degradations if deadline is not None else [],
     )
 
 # ------------------------------------------------
-# 13. summarize_itinerary_for_chat + /chat 엔드포인트
+# 5. summarize_itinerary_for_chat + /chat 엔드포인트
 # ------------------------------------------------
 
 def summarize_itinerary_for_chat(resp: RecommendResponse, ctx: dict, original_message: str) -> str:
@@ -1277,42 +1409,475 @@ def summarize_itinerary_for_chat(resp: RecommendResponse, ctx: dict, original_me
 
     return "\n".join(desc_parts)
 
+# ------------------------------------------------
+# 5-1. /chat 대화 세션
+# ------------------------------------------------
+# session_id 를 보낸 대화는 파싱 결과 + 카테고리별 랭킹 + 코스를 보관해두고,
+# 후속 요청은 랭킹을 다시 계산하지 않고 저장된 후보로 바로 처리한다.
+
+CHAT_SESSIONS = SessionStore(
+    max_sessions=settings.chat_session_max,
+    max_bytes=settings.chat_session_max_mb * 2**20,
+    ttl_sec=settings.chat_session_ttl_sec,
+)
+
+def start_chat_session(
+    session_id: str,
+    ctx: dict,
+    message: str,
+    deadline: Optional[Deadline] = None,
+) -> List[DayPlan]:
+    """새 코스를 계산하고 세션에 저장 (계산은 admission + single-flight 경유)"""
+    index = require_index()
+    kwargs = dict(
+        selected_tags=ctx["tags"],
+        region_filter_address=ctx["region_filter"],
+        region_filter_subregions=None,
+        days=ctx["days"],
+        max_places_per_day=ctx["max_places_per_day"],
+        free_text=message,
+    )
+    key = ("chat_session", index.version) + canonical_query_key(**kwargs)
+    compact, depth, records = run_coalesced(key, lambda: index.plan_session(**kwargs, deadline=deadline), deadline)
+    if compact is None:
+        return []
+    # records 는 follower 와 공유하므로 세션에는 복사본을 저장
+    session_records = [dict(r) for r in records]
+    CHAT_SESSIONS.put(ChatSession(session_id, dict(ctx), message, compact, depth, session_records, index.version))
+    return index.records_to_days(session_records)
+
+def live_chat_session(session_id: Optional[str], deadline: Optional[Deadline] = None) -> Optional[ChatSession]:
+    """
+    저장된 세션 (없으면 None)
+    세션을 만든 뒤 카탈로그가 갱신됐으면 보관한 행 위치가 새 인덱스와 맞지 않으므로
+    같은 조건으로 새 인덱스에서 코스를 다시 계산해서 바꿔 둠
+    """
+    session = CHAT_SESSIONS.get(session_id) if session_id else None
+    if session is None or session.index_version == require_index().version:
+        return session
+    start_chat_session(session.session_id, session.ctx, session.message, deadline)
+    return CHAT_SESSIONS.get(session_id)
+
+def answer_chat_follow_up(session: ChatSession, follow_up: dict, deadline: Optional[Deadline] = None) -> ChatResponse:
+    index = require_index()
+    with session.lock:
+        if follow_up["action"] == "extend":
+            days = max(1, min(session.ctx["days"] + follow_up["days"], 5))
+            records = index.extend_session_plan(
+                session.compact, session.depth, session.records, session.excluded,
+                days, session.ctx["max_places_per_day"],
+            )
+            session.ctx = dict(session.ctx, days=days)
+            if records is None:
+                # 보관한 후보로는 부족 → 늘린 일정으로 새로 계산
+                days_plans = start_chat_session(session.session_id, session.ctx, session.message, deadline)
+                resp = RecommendResponse(days=days_plans, degradations=deadline.degradations if deadline else [])
+                reply = f"{days}일 일정으로 다시 짜 봤어요.\n" + summarize_itinerary_for_chat(resp, session.ctx, "")
+                return ChatResponse(reply=reply, itinerary=resp, session_id=session.session_id)
+            session.records = records
+            head = f"{days}일 일정으로 바꿨어요. 기존 날짜 코스는 그대로 두었어요."
+        else:
+            category = follow_up["category"]
+            label = FOLLOW_UP_CATEGORY_LABEL[category]
+            changes = index.replace_in_plan(
+                session.compact, session.records, category, follow_up["days"], session.excluded,
+            )
+            if changes:
+                head = "\n".join(
+                    f"{new['day']}일차 {label}: {old['name']} → {new['name']}" for old, new in changes
+                )
+            else:
+                head = f"지금 조건에서 더 추천할 만한 {label} 후보가 없어요."
+
+        session.turns += 1
+        CHAT_SESSIONS.touch(session)
+        resp = RecommendResponse(days=index.records_to_days(session.records))
+
+    ADMISSION.record_bypass()
+    reply = head + "\n" + summarize_itinerary_for_chat(resp, session.ctx, "")
+    return ChatResponse(reply=reply, itinerary=resp, session_id=session.session_id)
+
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
+def chat(req: ChatRequest, deadline: Deadline = Depends(request_deadline)):
     """
+    0) session_id 가 있고 후속 요청("숙소만 바꿔줘", "하루 더")이면 저장된 랭킹으로 처리
     1) 룰 기반 코스(동/서/남/북, 2박3일) 먼저 체크
     2) 아니면 parse_chat_message로 파싱 후 recommend_itinerary_no_time 사용
+       (admission + single-flight 를 거치는 recommend_itinerary_coalesced)
     """
+    # 0) 세션 후속 요청
+    session = live_chat_session(req.session_id, deadline)
+    if session is not None:
+        follow_up = parse_chat_follow_up(req.message)
+        if follow_up is not None:
+            return answer_chat_follow_up(session, follow_up, deadline)
+
     # 1) 동/서/남/북/2박3일 코스 룰 기반 응답
     rb_answer = rule_based_course_answer(req.message)
     if rb_answer:
+        ADMISSION.record_bypass()
         empty_resp = RecommendResponse(days=[])
-        return ChatResponse(reply=rb_answer, itinerary=empty_resp)
+        return ChatResponse(reply=rb_answer, itinerary=empty_resp, session_id=req.session_id)
 
     # 2) 일반 코스 추천 로직 (네가 쓰던 parse_chat_message + 새 recommend_itinerary_no_time)
     ctx = parse_chat_message(req.message)
 
-    itinerary_df = recommend_itinerary_no_time(
-        selected_tags=ctx["tags"],
-        region_filter_address=ctx["region_filter"],   # 정규식 패턴이지만 str.contains 기본이 regex라 동작
-        region_filter_subregions=None,
-        days=ctx["days"],
-        max_places_per_day=ctx["max_places_per_day"],
-        free_text=req.message,
-    )
+    if req.session_id:
+        days_plans = start_chat_session(req.session_id, ctx, req.message, deadline)
+    else:
+        days_plans = recommend_itinerary_coalesced(
+            selected_tags=ctx["tags"],
+            region_filter_address=ctx["region_filter"],   # 정규식 패턴이지만 str.contains 기본이 regex라 동작
+            region_filter_subregions=None,
+            days=ctx["days"],
+            max_places_per_day=ctx["max_places_per_day"],
+            free_text=req.message,
+            deadline=deadline,
+        )
 
-    resp = itinerary_df_to_recommend_response(itinerary_df)
+    resp = RecommendResponse(days=days_plans, degradations=deadline.degradations)
     reply_text = summarize_itinerary_for_chat(resp, ctx, req.message)
 
     return ChatResponse(
         reply=reply_text,
         itinerary=resp,
+        session_id=req.session_id,
     )
 
+# ------------------------------------------------
+# 6. 장소 조회 API (GET /places, GET /places/{id})
+# ------------------------------------------------
+# - 프론트가 jeju_spots.json 전체를 받아 브라우저에서 거르던 것을 서버에서 처리
+# - category / tag / subregion 필터 + cursor 페이지네이션
+# - strong ETag (인덱스 버전 + 정규화한 조건) → 안 바뀐 페이지는 304
+# - Accept-Encoding 에 따라 br / gzip 압축
+
+@app.get("/places")
+def list_places(
+    request: Request,
+    category: List[str] = Query(default=[]),
+    tag: List[str] = Query(default=[]),
+    subregion: List[str] = Query(default=[]),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),  # places.MAX_PAGE_SIZE
+    destination: Optional[str] = None,
+):
+    index = destination_index(destination)
+    from places import CursorError, decode_cursor  # 인덱스가 이미 import 한 모듈
+
+    categories = sorted({c.strip() for c in category if c.strip()})
+    tags = sorted({t.strip() for t in tag if t.strip()})
+    subregions = sorted({s.strip() for s in subregion if s.strip()})
+
+    # 커서는 304 여부와 상관없이 먼저 검사 (만료된 커서로 304 를 주지 않도록)
+    if cursor:
+        try:
+            decode_cursor(cursor, index.version)
+        except CursorError as e:
+            raise HTTPException(status_code=410 if e.expired else 400, detail=str(e))
+
+    etag = make_etag(index.destination, index.version, "places", categories, tags, subregions, cursor, limit)
+    return cached_json_response(
+        request,
+        etag,
+        lambda: index.places.page(
+            categories=categories,
+            tags=tags,
+            subregions=subregions,
+            cursor=cursor,
+            limit=limit,
+        ),
+        max_age=settings.places_max_age,
+    )
+
+@app.get("/places/{place_id}")
+def get_place(place_id: str, request: Request, destination: Optional[str] = None):
+    index = destination_index(destination)
+    place = index.places.get(place_id)
+    if place is None:
+        raise HTTPException(status_code=404, detail="해당 장소를 찾을 수 없어요.")
+    etag = make_etag(index.destination, index.version, "place", place_id)
+    return cached_json_response(request, etag, lambda: place, max_age=settings.places_max_age)
+
+# ------------------------------------------------
+# 6-1. facet 개수 (GET /facets)
+# ------------------------------------------------
+# "서귀포 서에서 반려동물 동반 가능한 곳이 몇 개?" 같은 필터별 장소 수
+# - 미리 만든 bitset 의 AND / OR + popcount 로 계산 (facets.py)
+# - category / subregion 값별 수는 자기 필터를 뺀 기준 (다중 선택 UI 용)
+
+@app.get("/facets")
+def facet_counts(
+    request: Request,
+    category: List[str] = Query(default=[]),
+    tag: List[str] = Query(default=[]),
+    subregion: List[str] = Query(default=[]),
+    facet: List[str] = Query(default=[]),
+    destination: Optional[str] = None,
+):
+    index = destination_index(destination)
+    from facets import FACET_FIELDS  # 인덱스가 이미 import 한 모듈
+
+    categories = sorted({c.strip() for c in category if c.strip()})
+    tags = sorted({t.strip() for t in tag if t.strip()})
+    subregions = sorted({s.strip() for s in subregion if s.strip()})
+    facets = sorted({f.strip() for f in facet if f.strip()}) or list(FACET_FIELDS)
+    unknown = [f for f in facets if f not in FACET_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"알 수 없는 facet: {', '.join(unknown)} (가능: {', '.join(FACET_FIELDS)})",
+        )
+
+    etag = make_etag(index.destination, index.version, "facets", categories, tags, subregions, facets)
+    return cached_json_response(
+        request,
+        etag,
+        lambda: {
+            **index.places.facets.counts(categories, tags, subregions, facets),
+            "index_version": index.version,
+        },
+        max_age=settings.places_max_age,
+    )
+
+# ------------------------------------------------
+# 6-2. 검색창 자동완성 (GET /autocomplete)
+# ------------------------------------------------
+# 장소 이름 / 태그 / 지역 이름 prefix 검색 (autocomplete.py)
+# - 한글은 자모 단위로 비교해서 입력 중인 음절("성ㅅ")도 맞음
+# - 순위는 인덱스 만들 때 정한 정적 인기도 순
+# - 키 입력마다 오는 요청이라 ETag + 짧은 max-age 로 캐시
+
+@app.get("/autocomplete")
+def autocomplete_suggestions(
+    request: Request,
+    q: str = Query(default="", max_length=50),
+    limit: int = Query(default=8, ge=1, le=20),  # autocomplete.MAX_LIMIT
+    kind: List[str] = Query(default=[]),
+    destination: Optional[str] = None,
+):
+    index = destination_index(destination)
+    from autocomplete import KINDS  # 인덱스가 이미 import 한 모듈
+
+    kinds = sorted({k.strip() for k in kind if k.strip()})
+    unknown = [k for k in kinds if k not in KINDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"알 수 없는 kind: {', '.join(unknown)} (가능: {', '.join(KINDS)})",
+        )
+
+    query = q.strip()
+    etag = make_etag(index.destination, index.version, "autocomplete", query, limit, kinds)
+    return cached_json_response(
+        request,
+        etag,
+        lambda: {
+            "query": query,
+            "items": [s.to_dict() for s in index.autocomplete.suggest(query, limit, kinds or None)],
+            "index_version": index.version,
+        },
+        max_age=settings.places_max_age,
+    )
+
+# ------------------------------------------------
+# 6-3. 추천 장소 조회 / 선택 이벤트 (POST /events)
+# ------------------------------------------------
+# - 프론트가 코스 카드 상세 보기(view) / 코스에 넣기(accept)를 보내면 대기열에만 넣고 바로 202
+#   (대기열이 가득 차면 기다리지 않고 버림 → dropped)
+# - 백그라운드 writer 가 모아서 append-only 로그에 쓰고,
+#   popularity_fold_interval_sec 마다 로그를 장소별 인기도로 다시 집계해서 인덱스에 반영
+#   (JEJU_POPULARITY_WEIGHT > 0 일 때만 랭킹에 섞음)
+
+INTERACTIONS = InteractionLog(
+    settings.interaction_log_path,
+    queue_size=settings.interaction_queue_size,
+    batch_size=settings.interaction_batch_size,
+    flush_interval_sec=settings.interaction_flush_interval_sec,
+)
+POPULARITY = PopularityFolder(settings.interaction_log_path)
+
+def publish_popularity(counts: Dict[str, float], version: int) -> None:
+    if INDEX is not None:
+        INDEX.set_popularity(counts, version)
+    for index in REGIONS.indexes():
+        index.set_popularity(counts, version)
+
+@app.post("/events", response_model=InteractionEventsResponse, status_code=202)
+def record_events(req: InteractionEventsRequest):
+    accepted = sum(INTERACTIONS.record(e.type, e.place_id, e.session_id) for e in req.events)
+    return {"accepted": accepted, "dropped": len(req.events) - accepted}
+
+# ------------------------------------------------
+# 7. 썸네일 이미지 (GET /images/{name})
+# ------------------------------------------------
+# - public/spotimage 원본을 w 폭으로 줄이고 WebP / JPEG 으로 재인코딩
+#   (fmt 를 안 주면 Accept 헤더에 image/webp 가 있을 때 WebP)
+# - 변형은 디스크 LRU 캐시에 저장, 같은 변형 동시 요청은 한 번만 인코딩
+# - 오래 캐시해도 되도록 Cache-Control max-age + ETag (원본이 바뀌면 ETag 도 바뀜)
+
+THUMBNAILS = ThumbnailService(
+    settings.image_dir,
+    DiskLRUCache(settings.image_cache_dir, settings.image_cache_max_mb * 2**20),
+    quality=settings.image_quality,
+)
+
+@app.get("/images/{name:path}")
+def image_variant(
+    name: str,
+    request: Request,
+    w: int = Query(default=320, ge=1, le=4096),
+    fmt: Optional[str] = Query(default=None, pattern="^(webp|jpeg)$"),
+):
+    try:
+        source = THUMBNAILS.resolve_source(name)
+    except ImageError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    headers = {"Cache-Control": f"public, max-age={settings.image_max_age}"}
+    if not THUMBNAILS.available:
+        # Pillow 가 없으면 원본 그대로
+        return FileResponse(source, headers=headers)
+
+    if fmt is None:
+        fmt = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+        headers["Vary"] = "Accept"
+    width = snap_width(w)
+    variant = THUMBNAILS.variant_name(source, width, fmt)
+    headers["ETag"] = '"' + variant.rsplit(".", 1)[0] + '"'
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        body = THUMBNAILS.get_variant(source, variant, width, fmt)
+    except ImageError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    media_type = FORMATS[fmt][1]
+    if isinstance(body, bytes):
+        return Response(content=body, media_type=media_type, headers=headers)
+    return FileResponse(body, media_type=media_type, headers=headers)
+
+# ------------------------------------------------
+# 8. 디버그: 메모리 점검 (JEJU_DEBUG_ENDPOINTS=1 일 때만)
+# ------------------------------------------------
+# - GET  /debug/memory              : 프로세스 RSS + 구조별 크기 (카탈로그/행렬/vocabulary/캐시)
+# - POST /debug/tracemalloc/start   : 할당 추적 시작 (?frames=25)
+# - POST /debug/tracemalloc/snapshot: 스냅샷 저장 (?label=before)
+# - GET  /debug/tracemalloc/diff    : 두 스냅샷 차이 (?base=1&target=2) → 서브시스템별 증가량
+# - POST /debug/tracemalloc/stop    : 추적 종료 + 스냅샷 삭제
+# 꺼져 있으면 404 (엔드포인트가 없는 것처럼)
+
+ALLOCATIONS = AllocationTracker()
+
+def require_debug():
+    if not settings.debug_endpoints:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+debug = APIRouter(
+    prefix="/debug",
+    dependencies=[Depends(require_debug)],
+    include_in_schema=settings.debug_endpoints,
+)
+
+@debug.get("/memory")
+def debug_memory():
+    return {
+        "process": process_memory(),
+        "index": index_footprint(INDEX) if INDEX is not None else None,
+        "chat_sessions": CHAT_SESSIONS.stats(),
+        "image_disk_cache": THUMBNAILS.cache.stats(),
+        "singleflight": SINGLE_FLIGHT.stats(),
+        "tracemalloc": ALLOCATIONS.status(),
+    }
+
+@debug.post("/tracemalloc/start")
+def debug_tracemalloc_start(frames: int = Query(default=25, ge=1, le=100)):
+    return ALLOCATIONS.start(frames)
+
+@debug.post("/tracemalloc/snapshot")
+def debug_tracemalloc_snapshot(label: str = ""):
+    try:
+        return ALLOCATIONS.snapshot(label)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@debug.get("/tracemalloc/diff")
+def debug_tracemalloc_diff(base: int, target: int, limit: int = Query(default=20, ge=1, le=200)):
+    try:
+        return ALLOCATIONS.diff(base, target, limit=limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"스냅샷 {e.args[0]} 이 없습니다.")
+
+@debug.post("/tracemalloc/stop")
+def debug_tracemalloc_stop():
+    return ALLOCATIONS.stop()
+
+app.include_router(debug)
+
+# ------------------------------------------------
+# 9. 관리자: 카탈로그 부분 갱신 (JEJU_ADMIN_TOKEN 이 있을 때만)
+# ------------------------------------------------
+# - POST /admin/catalog/refresh (X-Admin-Token 헤더)
+#   카탈로그 파일(path, 없으면 JEJU_CATALOG_PATH)을 다시 읽어 장소별 fingerprint 를 비교하고
+#   바뀐 장소만 다시 계산한 새 인덱스로 한 번에 교체 (ingest.py)
+#   → 추가 / 수정 / 삭제 수, 예시 id, 단계별 소요 시간(ms) 보고서를 돌려주고 /stats 에도 남김
+# - 바뀐 장소가 많거나 BM25 이면 전체 다시 빌드 (full=true 로 강제 가능)
+# - 한 번에 하나만 (진행 중이면 409). 토큰이 비어 있으면 404, 틀리면 403
+
+CATALOG_REFRESH: Dict[str, Any] = {
+    "lock": threading.Lock(),
+    "last_report": None,
+}
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 맞지 않아요.")
+
+admin = APIRouter(
+    prefix="/admin",
+    dependencies=[Depends(require_admin)],
+    include_in_schema=bool(settings.admin_token),
+)
+
+@admin.post("/catalog/refresh")
+def admin_catalog_refresh(path: Optional[str] = None, full: bool = False):
+    index = require_index()
+    lock = CATALOG_REFRESH["lock"]
+    if not lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="카탈로그 갱신이 이미 진행 중이에요.")
+    try:
+        import ingest  # recommender 와 같이 무거운 모듈 (인덱스가 있으면 이미 import 됨)
+
+        try:
+            new_index, report = ingest.refresh_index(index, path=path, force_full=full)
+        except (OSError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"카탈로그를 읽지 못했어요: {e}")
+        if new_index is not None:
+            started = time.perf_counter()
+            publish_index(new_index)
+            report["phases_ms"]["publish"] = round((time.perf_counter() - started) * 1000, 3)
+        report["finished_at"] = time.time()
+        CATALOG_REFRESH["last_report"] = report
+        return report
+    finally:
+        lock.release()
+
+app.include_router(admin)
+
 # ------------------------------------------------
 # 실행 방법 (터미널)
 # ------------------------------------------------
 # uvicorn main:app --reload --port 8000
 # http://127.0.0.1:8000/docs
 #  - POST /recommend_text : "제주 서쪽 당일치기 코스 추천해줘"
+#  - GET /recommend?tags=자연&days=2&fields=pin : 지도 핀용 필드만 (Accept: application/msgpack 이면 MessagePack)
 #  - POST /chat : 챗봇처럼 대화 ("커플 2박3일 서귀포 동쪽 코스 추천해줘")
+#  - GET /places?category=food&tag=가족여행&limit=20 : 장소 목록 (next_cursor 로 다음 페이지)
+#  - GET /autocomplete?q=성ㅅ : 검색창 자동완성 (장소 / 태그 / 지역)
+#  - POST /events : 코스 카드 조회 / 선택 이벤트 ({"events": [{"type": "accept", "place_id": "..."}]})
+#  - POST /admin/catalog/refresh : 카탈로그 파일이 바뀐 뒤 바뀐 장소만 다시 계산 (X-Admin-Token, JEJU_ADMIN_TOKEN)
+#  - GET /images/성산일출봉.jpg?w=320 : 목록 카드용 썸네일
+#  - GET /recommend?tags=바다&destination=busan : 다른 여행지 (JEJU_REGIONS_PATH 목록, 처음 요청 때 로드)
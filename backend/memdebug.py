@@ -0,0 +1,232 @@
+# memdebug.py
+# ================================================
+# 메모리 사용량 점검 (JEJU_DEBUG_ENDPOINTS=1 일 때만 /debug/* 로 노출)
+# - 오래 사는 구조(카탈로그 DataFrame, 검색 점수 행렬, vocabulary, 캐시들)의 크기
+# - tracemalloc 스냅샷을 찍고 두 스냅샷의 차이를 서브시스템(백엔드 모듈 /
+#   라이브러리) 단위로 묶어서 보여줌 → RSS 가 늘 때 어디서 늘었는지 확인
+# ================================================
+
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """현재 / 최대 RSS (바이트)"""
+    result: Dict[str, Optional[int]] = {"rss_bytes": None, "peak_rss_bytes": None}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    result["rss_bytes"] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    result["peak_rss_bytes"] = int(line.split()[1]) * 1024
+    except OSError:
+        import resource
+
+        # macOS 는 바이트, Linux 는 KiB
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    return result
+
+
+def dict_nbytes(d: dict) -> int:
+    """dict + 키/값(문자열·숫자) 대략적인 크기"""
+    total = sys.getsizeof(d)
+    for key, value in d.items():
+        total += sys.getsizeof(key) + sys.getsizeof(value)
+    return total
+
+
+def sparse_nbytes(matrix) -> int:
+    return int(matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes)
+
+
+def scorer_footprint(scorer) -> Dict[str, object]:
+    """검색 점수 계산기 크기 (사분면 shard 별 행렬 + 공유 vocabulary)"""
+    vocabulary_bytes = dict_nbytes(scorer.vectorizer.vocabulary_)
+    return {
+        "name": scorer.name,
+        "bytes": scorer.nbytes + vocabulary_bytes,
+        "vocabulary_bytes": vocabulary_bytes,
+        "terms": len(scorer.vectorizer.vocabulary_),
+        "shards": {
+            name: {"rows": int(len(shard.rows)), "bytes": shard.nbytes}
+            for name, shard in scorer.shards.items()
+        },
+    }
+
+
+def index_footprint(index) -> Dict[str, object]:
+    """RecommenderIndex 가 들고 있는 구조별 크기 (바이트)"""
+    df = index.df
+    columns = {col: int(n) for col, n in df.memory_usage(deep=True, index=False).items()}
+    scorer = index.scorer
+    places = index.places
+
+    with index._rankings_lock:
+        rankings = list(index._rankings.values())
+    ranking_bytes = sum(idx.nbytes + sim.nbytes for compact in rankings for idx, sim in compact.values())
+
+    structures = {
+        "catalog_frame": {
+            "bytes": int(df.memory_usage(deep=True).sum()),
+            "rows": int(len(df)),
+            "columns": columns,
+        },
+        "scorer": scorer_footprint(scorer),
+        "places_lookup": {
+            "bytes": places.nbytes() + dict_nbytes(places.positions_by_id),
+            "tags": len(places.facets.values["tag"]),
+        },
+        "subregion_codes": {"bytes": int(index.subregion_codes.nbytes)},
+        "autocomplete": {
+            "bytes": index.autocomplete.nbytes,
+            "keys": len(index.autocomplete.keys),
+        },
+        "nearby_table": {
+            "bytes": index.nearby.nbytes if index.nearby is not None else 0,
+            "k": index.nearby.k if index.nearby is not None else 0,
+        },
+        "warmup_table": {
+            "bytes": index.warmup.nbytes(),
+            "entries": index.warmup.stats()["entries"],
+        },
+        "ranking_cache": {"bytes": int(ranking_bytes), "entries": len(rankings)},
+    }
+    structures["total_bytes"] = sum(
+        v["bytes"] for v in structures.values() if isinstance(v, dict)
+    )
+    return structures
+
+
+# ------------------------------------------------
+# tracemalloc 스냅샷 / 차이
+# ------------------------------------------------
+
+def subsystem_of(traceback: tracemalloc.Traceback) -> str:
+    """
+    할당 위치 → 서브시스템 이름
+    - 호출 스택에서 가장 안쪽의 백엔드 파일 → 그 모듈 이름 (recommender, sessions ...)
+    - 백엔드 파일이 없으면 가장 안쪽 프레임의 라이브러리 이름 (pandas, numpy ...)
+    """
+    backend_prefix = str(BACKEND_DIR)
+    frames = list(traceback)  # 오래된 프레임 → 최근 프레임 순
+    for frame in reversed(frames):
+        if frame.filename.startswith(backend_prefix):
+            return Path(frame.filename).stem
+    filename = frames[-1].filename if frames else "<unknown>"
+    parts = Path(filename).parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            i = parts.index(marker)
+            if i + 1 < len(parts):
+                return parts[i + 1].split(".")[0]
+    if "lib" in parts and filename.endswith(".py"):
+        return "stdlib:" + Path(filename).stem
+    return filename
+
+
+class AllocationTracker:
+    """
+    tracemalloc 스냅샷 보관 + 차이 계산
+    - start(frames): 추적 시작 (frames 가 클수록 정확하지만 느림)
+    - snapshot(label): 스냅샷 저장 → id
+    - diff(base_id, target_id): 서브시스템별 / 코드 위치별 증가량
+    """
+
+    def __init__(self, max_snapshots: int = 8):
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        self._snapshots: Dict[int, Dict[str, object]] = {}
+        self._next_id = 1
+
+    def start(self, frames: int = 25) -> Dict[str, object]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> Dict[str, object]:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def snapshot(self, label: str = "") -> Dict[str, object]:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc 이 꺼져 있습니다. 먼저 start 하세요.")
+        snap = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        with self._lock:
+            snap_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snap_id] = {"snapshot": snap, "label": label, "taken_at": time.time()}
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.pop(min(self._snapshots))
+        traced, peak = tracemalloc.get_traced_memory()
+        return {"id": snap_id, "label": label, "traced_bytes": traced, "peak_traced_bytes": peak}
+
+    def _get(self, snap_id: int):
+        with self._lock:
+            entry = self._snapshots.get(snap_id)
+        if entry is None:
+            raise KeyError(snap_id)
+        return entry["snapshot"]
+
+    def diff(self, base_id: int, target_id: int, limit: int = 20) -> Dict[str, object]:
+        base, target = self._get(base_id), self._get(target_id)
+
+        # 서브시스템별: traceback 단위 차이를 모아서 합침
+        by_subsystem: Dict[str, Dict[str, int]] = {}
+        for stat in target.compare_to(base, "traceback"):
+            name = subsystem_of(stat.traceback)
+            acc = by_subsystem.setdefault(name, {"size_diff": 0, "count_diff": 0, "size": 0})
+            acc["size_diff"] += stat.size_diff
+            acc["count_diff"] += stat.count_diff
+            acc["size"] += stat.size
+        subsystems = sorted(
+            ({"subsystem": k, **v} for k, v in by_subsystem.items()),
+            key=lambda r: r["size_diff"],
+            reverse=True,
+        )
+
+        top_lines: List[Dict[str, object]] = []
+        for stat in target.compare_to(base, "lineno")[:limit]:
+            frame = stat.traceback[-1]
+            top_lines.append({
+                "location": f"{frame.filename}:{frame.lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+            })
+
+        return {
+            "base": base_id,
+            "target": target_id,
+            "total_size_diff": sum(r["size_diff"] for r in subsystems),
+            "subsystems": subsystems[:limit],
+            "top_lines": top_lines,
+        }
+
+    def status(self) -> Dict[str, object]:
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [
+                {"id": k, "label": v["label"], "taken_at": v["taken_at"]}
+                for k, v in sorted(self._snapshots.items())
+            ]
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": traced,
+            "peak_traced_bytes": peak,
+            "snapshots": snapshots,
+        }
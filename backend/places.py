@@ -0,0 +1,177 @@
+# places.py
+# ================================================
+# 장소 카탈로그 조회 (GET /places, GET /places/{id})
+# - 프론트(Home/List/Detail)가 jeju_spots.json 전체를 받는 대신
+#   서버에서 필터 + 커서 페이지네이션한 결과만 받도록
+# - 인덱스를 만들 때 id → 행 위치, 태그/카테고리/사분면별 bitset(facets.py)을
+#   한 번 만들어 두고 요청마다 bitset AND / OR 로 필터
+# - 커서는 (인덱스 버전, 마지막 행 위치) 를 base64 로 감싼 값
+#   (카탈로그가 바뀌면 이전 커서는 만료)
+# ================================================
+
+import base64
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from facets import FacetIndex
+
+# 응답에 내려주는 필드 (프론트 Spot 타입 + 사분면 정보)
+PLACE_FIELDS: List[str] = [
+    "id",
+    "name",
+    "category",
+    "address",
+    "tags",
+    "thumbnailUrl",
+    "descriptionShort",
+    "openingHours",
+    "phone",
+    "priceInfo",
+    "lat",
+    "lng",
+    "region_city",
+    "subregion",
+]
+
+MAX_PAGE_SIZE = 100
+
+
+class CursorError(ValueError):
+    """잘못된 커서 (expired=True 면 카탈로그 버전이 바뀐 것)"""
+
+    def __init__(self, message: str, expired: bool = False):
+        super().__init__(message)
+        self.expired = expired
+
+
+def split_tags(raw) -> List[str]:
+    if not isinstance(raw, str):
+        return []
+    return [t.strip() for t in raw.split(",") if t.strip()]
+
+
+def encode_cursor(version: str, position: int) -> str:
+    raw = f"{version}:{position}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, version: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_version, _, pos = base64.urlsafe_b64decode(padded).decode("ascii").partition(":")
+        position = int(pos)
+    except (ValueError, UnicodeDecodeError):
+        raise CursorError("잘못된 cursor 값입니다.")
+    if cursor_version != version:
+        raise CursorError("카탈로그가 갱신되어 cursor 가 만료되었습니다. 처음부터 다시 조회해 주세요.", expired=True)
+    return position
+
+
+def _json_value(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class PlaceCatalog:
+    def __init__(self, df: pd.DataFrame, version: str):
+        self.df = df
+        self.version = version
+        self.fields = [c for c in PLACE_FIELDS if c in df.columns]
+
+        # id → 행 위치 (중복 id 는 처음 것)
+        self.positions_by_id: Dict[str, int] = {}
+        for pos, place_id in enumerate(df["id"].tolist()):
+            if isinstance(place_id, str) and place_id not in self.positions_by_id:
+                self.positions_by_id[place_id] = pos
+
+        # 이름 → 행 위치 (id 없는 예전 코스용, 처음 쓸 때 만듦)
+        self._positions_by_name: Optional[Dict[str, int]] = None
+
+        # 태그 → 그 태그가 달린 행 위치
+        buckets: Dict[str, List[int]] = {}
+        for pos, raw in enumerate(df["tags"].tolist()):
+            for tag in set(split_tags(raw)):
+                buckets.setdefault(tag, []).append(pos)
+
+        # facet 값별 bitset (category 계열 / subregion 은 category dtype 순서 그대로)
+        rows_by_value: Dict[str, Dict[str, np.ndarray]] = {
+            "tag": {tag: np.asarray(rows, dtype=np.int32) for tag, rows in buckets.items()},
+        }
+        for column in ("category", "category_mapped", "subregion"):
+            col = df[column]
+            codes = col.cat.codes.to_numpy()
+            rows_by_value[column] = {
+                str(value): np.flatnonzero(codes == code) for code, value in enumerate(col.cat.categories)
+            }
+        self.facets = FacetIndex(rows_by_value, len(df))
+
+    def filter_positions(
+        self,
+        categories: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        subregions: Optional[List[str]] = None,
+    ) -> np.ndarray:
+        """
+        조건에 맞는 행 위치 (오름차순)
+        - categories: 원본(attraction/food/stay) 또는 place/food/stay 중 하나라도 (OR)
+        - tags: 모두 포함 (AND)
+        - subregions: 하나라도 (OR)
+        """
+        return self.facets.positions(self.facets.filter_words(categories, tags, subregions))
+
+    def records(self, positions) -> List[Dict[str, object]]:
+        page = self.df.iloc[positions][self.fields]
+        columns = {c: page[c].tolist() for c in self.fields}
+        items = []
+        for i in range(len(page)):
+            item = {c: _json_value(columns[c][i]) for c in self.fields}
+            item["tags"] = split_tags(item.get("tags"))
+            items.append(item)
+        return items
+
+    def page(
+        self,
+        categories: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        subregions: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, object]:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        positions = self.filter_positions(categories, tags, subregions)
+
+        start = 0
+        if cursor:
+            start = int(np.searchsorted(positions, decode_cursor(cursor, self.version), side="right"))
+        selected = positions[start:start + limit]
+        has_more = start + limit < len(positions)
+
+        return {
+            "items": self.records(selected),
+            "total": int(len(positions)),
+            "next_cursor": encode_cursor(self.version, int(selected[-1])) if has_more else None,
+            "index_version": self.version,
+        }
+
+    def position_by_name(self, name: str) -> Optional[int]:
+        if self._positions_by_name is None:
+            names: Dict[str, int] = {}
+            for pos, value in enumerate(self.df["name"].tolist()):
+                if isinstance(value, str) and value not in names:
+                    names[value] = pos
+            self._positions_by_name = names
+        return self._positions_by_name.get(name)
+
+    def get(self, place_id: str) -> Optional[Dict[str, object]]:
+        pos = self.positions_by_id.get(place_id)
+        if pos is None:
+            return None
+        return self.records([pos])[0]
+
+    def nbytes(self) -> int:
+        return self.facets.nbytes
@@ -0,0 +1,65 @@
+# projection.py
+# ================================================
+# 추천 응답의 코스 항목 필드 선택 (?fields=id,name,lat,lng)
+# - 지도 핀만 그리는 화면은 id / 이름 / 카테고리 / 좌표만 있으면 되는데
+#   항목마다 tags / descriptionShort / address / 지역 필드까지 실으면
+#   며칠짜리 코스나 대량 생성(bulk.py)에서 응답 크기와 직렬화 시간이 커짐
+# - fields 가 있으면 코스 항목(ItineraryItem)은 그 필드만, 나머지 응답 구조
+#   (days[].day, degradations, parsed, message)는 그대로
+# - 묶음 이름: pin = id, name, category, lat, lng
+# ================================================
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from schemas import DayPlan, ItineraryItem
+
+# 코스 항목 필드 (선택한 필드도 이 순서로 정렬 → ETag / 캐시 key 가 순서와 무관)
+ITEM_FIELDS: Tuple[str, ...] = tuple(ItineraryItem.model_fields)
+
+FIELD_PRESETS: Dict[str, Tuple[str, ...]] = {
+    "pin": ("id", "name", "category", "lat", "lng"),
+}
+
+Fields = Optional[Tuple[str, ...]]
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def parse_fields(values: Iterable[str]) -> Fields:
+    """?fields=a,b&fields=c → ITEM_FIELDS 순서 튜플 (비어 있으면 None = 전체 필드)"""
+    names = {v.strip() for raw in values for v in raw.split(",") if v.strip()}
+    if not names:
+        return None
+    selected = set()
+    for name in names:
+        selected.update(FIELD_PRESETS.get(name, (name,)))
+    unknown = sorted(selected - set(ITEM_FIELDS))
+    if unknown:
+        raise FieldsError(
+            f"알 수 없는 필드예요: {', '.join(unknown)} "
+            f"(가능: {', '.join(ITEM_FIELDS)}, {', '.join(FIELD_PRESETS)})"
+        )
+    return tuple(f for f in ITEM_FIELDS if f in selected)
+
+
+def _day_include(fields: Tuple[str, ...]) -> Dict[str, object]:
+    return {"day": True, "items": {"__all__": set(fields)}}
+
+
+def dump_day(day: DayPlan, fields: Fields) -> Dict[str, object]:
+    if fields is None:
+        return day.model_dump()
+    return day.model_dump(include=_day_include(fields))
+
+
+def dump_response(model: BaseModel, fields: Fields) -> Dict[str, object]:
+    """days 가 있는 응답 모델 → dict (fields 가 있으면 코스 항목은 그 필드만)"""
+    if fields is None:
+        return model.model_dump()
+    include: Dict[str, object] = {name: True for name in type(model).model_fields}
+    include["days"] = {"__all__": _day_include(fields)}
+    return model.model_dump(include=include)
@@ -0,0 +1,1203 @@
+# recommender.py
+# ================================================
+# 추천 인덱스 (pandas / NumPy / scikit-learn 사용)
+# - 카탈로그 로드 & 전처리, 검색 점수 계산기(TF-IDF / BM25, 사분면 shard), warm-up 표를
+#   RecommenderIndex 하나로 묶어서 관리
+# - main.py 는 서버 시작 후 백그라운드에서 이 모듈을 처음 import 하고
+#   build_index() 로 인덱스를 만든 뒤에야 ready 상태가 됨
+# ================================================
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from autocomplete import AutocompleteIndex, Suggestion
+from catalog_io import CATALOG_COLUMNS, load_catalog, row_fingerprints
+from deadline import (
+    CACHED_RANKING,
+    FEWER_DAYS,
+    PRECOMPUTED_RANKING,
+    SKIPPED_SUBREGION_MATCHING,
+    TAG_ONLY_RANKING,
+    Deadline,
+    DeadlineExceeded,
+    StageCosts,
+)
+from gazetteer import JEJU, OTHER, Gazetteer
+from nearby import NearbyTable
+from places import PlaceCatalog
+from result_cache import decode_items, encode_items
+from schemas import DayPlan, ItineraryItem
+from scorers import build_scorer
+from settings import settings
+from shards import ShardedScorer
+from tags import (
+    ALL_TAG_KEYS,
+    BASE_TAGS,
+    CATEGORY_LABEL,
+    FOOD_TAGS,
+    STAY_TAGS,
+    TAG_TO_QUERY_EXPANSION,
+    build_query_from_tags,
+)
+from warmup import CompactRanking, WarmupTable, tag_combinations
+
+# ------------------------------------------------
+# 1. 행정구역 & 사분면 (여행지별 지명 사전, gazetteer.py)
+# ------------------------------------------------
+# 제주: 제주 동/서, 서귀포 동/서 (JEJU) — 다른 여행지는 regions.py 가 JSON 사전으로 만듦
+
+def classify_subregion(row, lng_mid: Dict[str, float], gazetteer: Gazetteer = JEJU) -> str:
+    return gazetteer.classify(
+        row.get("address", ""), row.get("region_city", OTHER), row.get("lng", np.nan), lng_mid,
+    )
+
+# ------------------------------------------------
+# 2. category → place / food / stay 매핑
+# ------------------------------------------------
+
+def map_category(cat: str) -> str:
+    c = str(cat).lower()
+    if c == "attraction":
+        return "place"
+    if c == "food":
+        return "food"
+    if c == "stay":
+        return "stay"
+    if any(k in c for k in ["food", "restaurant", "cafe", "식당", "카페", "맛집"]):
+        return "food"
+    if any(k in c for k in ["stay", "hotel", "숙소", "펜션", "리조트", "게스트하우스"]):
+        return "stay"
+    return "place"
+
+# ------------------------------------------------
+# 3. 메모리 절약용 카탈로그 레이아웃
+# ------------------------------------------------
+# - enum 같은 컬럼(category, region_city, subregion, category_mapped) → category dtype
+# - 나머지 문자열 컬럼 → pyarrow 기반 string (pyarrow 없으면 sys.intern 한 object)
+
+# 시 / 사분면 값 순서는 지명 사전(gazetteer.city_values / subregion_order)
+CATEGORY_MAPPED_VALUES = ["place", "food", "stay"]
+LABEL_TO_CATEGORY = {label: cat for cat, label in CATEGORY_LABEL.items()}
+
+try:
+    import pyarrow  # noqa: F401
+    COMPACT_STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    COMPACT_STRING_DTYPE = None
+
+def compact_catalog(frame: pd.DataFrame, gazetteer: Gazetteer = JEJU) -> pd.DataFrame:
+    frame = frame.copy()
+    frame["region_city"] = pd.Categorical(frame["region_city"], categories=gazetteer.city_values)
+    frame["subregion"] = pd.Categorical(frame["subregion"], categories=gazetteer.subregion_order)
+    frame["category_mapped"] = pd.Categorical(frame["category_mapped"], categories=CATEGORY_MAPPED_VALUES)
+    frame["category"] = frame["category"].astype("category")
+
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            continue
+        if frame[col].dtype == object or pd.api.types.is_string_dtype(frame[col].dtype):
+            if COMPACT_STRING_DTYPE is not None:
+                frame[col] = frame[col].astype(COMPACT_STRING_DTYPE)
+            else:
+                frame[col] = frame[col].map(lambda v: sys.intern(v) if isinstance(v, str) else v)
+    return frame
+
+# ------------------------------------------------
+# 4. 카탈로그 전처리
+# ------------------------------------------------
+
+def prepare_catalog(
+    raw: pd.DataFrame,
+    lng_mid: Optional[Dict[str, float]] = None,
+    gazetteer: Gazetteer = JEJU,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    원본 카탈로그 → 추천용 컬럼(region_city, subregion, category_mapped, search_text) 추가
+    (시 / 사분면은 gazetteer 기준, 동/서 기준 경도는 시마다 좌표 있는 장소의 중앙값)
+    lng_mid 를 주면 동/서 분할 기준 경도를 다시 계산하지 않고 그대로 씀
+    (카탈로그 부분 갱신: 바뀐 장소만 분류해도 나머지 장소의 사분면이 그대로여야 함)
+    반환: (DataFrame, 동/서 분할 기준 경도)
+    """
+    df = raw.copy()
+
+    # 예상 컬럼: id, name, category, address, tags, thumbnailUrl,
+    #           descriptionShort, openingHours, phone, priceInfo, lat, lng
+    for col in ["name", "category", "address", "tags", "descriptionShort", "lat", "lng"]:
+        if col not in df.columns:
+            df[col] = np.nan if col in ["lat", "lng"] else ""
+
+    df["name"] = df["name"].fillna("")
+    df["tags"] = df["tags"].fillna("")
+    df["descriptionShort"] = df["descriptionShort"].fillna("")
+    df["address"] = df["address"].fillna("")
+    df["category"] = df["category"].fillna("")
+
+    # 검색용 텍스트: tags + descriptionShort
+    df["search_text"] = df["tags"].astype(str) + " " + df["descriptionShort"].astype(str)
+
+    df["region_city"] = df["address"].apply(gazetteer.region_city)
+
+    if lng_mid is None:
+        lng_mid = gazetteer.default_lng_mids()
+        for city in gazetteer.cities:
+            mask = (df["region_city"] == city.name) & df["lng"].notna()
+            if mask.any():
+                lng_mid[city.key] = float(df.loc[mask, "lng"].median())
+
+    df["subregion"] = df.apply(classify_subregion, axis=1, args=(lng_mid, gazetteer))
+    df["category_mapped"] = df["category"].map(map_category)
+    return df, lng_mid
+
+def catalog_version(df: pd.DataFrame) -> str:
+    """카탈로그 내용 기반 버전 (파일 형식이 달라도 내용이 같으면 같은 값)"""
+    cols = [c for c in CATALOG_COLUMNS if c in df.columns]
+    digest = int(pd.util.hash_pandas_object(df[cols].astype(str), index=False).sum()) & (2**64 - 1)
+    return f"{digest:016x}"[:12]
+
+# ------------------------------------------------
+# 5. 헬퍼: 정렬 / 후보 선택
+# ------------------------------------------------
+
+def sort_by_subregion_then_similarity(sub_df: pd.DataFrame, subregion_order: List[str]) -> pd.DataFrame:
+    sub_df = sub_df.copy()
+    sub_df["subregion"] = sub_df["subregion"].fillna(OTHER)
+    order_map = {name: rank for rank, name in enumerate(subregion_order)}
+    sub_df["subrank"] = sub_df["subregion"].map(lambda x: order_map.get(x, 99)).astype(np.int64)
+    sub_df = sub_df.sort_values(
+        by=["subrank", "similarity"],
+        ascending=[True, False]
+    ).reset_index(drop=True)
+    return sub_df.drop(columns=["subrank"])
+
+def get_best_candidate(
+    df_cat: pd.DataFrame,
+    used_indices: set,
+    preferred_subregion: Optional[str] = None,
+) -> Optional[pd.Series]:
+    if df_cat.empty:
+        return None
+    if preferred_subregion:
+        sub = df_cat[
+            (df_cat["subregion"] == preferred_subregion) &
+            (~df_cat["orig_idx"].isin(used_indices))
+        ]
+        if not sub.empty:
+            return sub.iloc[0]
+    rest = df_cat[~df_cat["orig_idx"].isin(used_indices)]
+    if rest.empty:
+        return None
+    return rest.iloc[0]
+
+def get_nearby_candidate(
+    df_cat: pd.DataFrame,
+    used_indices: set,
+    nearby: NearbyTable,
+    anchor_idx: int,
+    category: str,
+    max_meters: float,
+) -> Optional[pd.Series]:
+    """
+    anchor 장소에서 가까운 category k 곳(max_meters 이내) 중 랭킹 후보에 있는 곳
+    → 유사도 높은 순 (같으면 가까운 순). 겹치는 후보가 없으면 None
+    df_cat 은 사분면별 상위 몇 개로 잘라서 넘길 것 (course_pool) — 경로마다 보관 개수가 달라도 같은 결과
+    """
+    positions, meters = nearby.neighbours(anchor_idx, category)
+    within = meters <= max_meters
+    positions, meters = positions[within], meters[within]
+    if df_cat.empty or not len(positions):
+        return None
+    distance_by_idx = dict(zip(positions.tolist(), meters.tolist()))
+    cand = df_cat[df_cat["orig_idx"].isin(distance_by_idx) & ~df_cat["orig_idx"].isin(used_indices)]
+    if cand.empty:
+        return None
+    distances = cand["orig_idx"].map(distance_by_idx).to_numpy()
+    best = np.lexsort((distances, -cand["similarity"].to_numpy()))[0]
+    return cand.iloc[best]
+
+def course_pool(df_cat: pd.DataFrame, per_subregion: int) -> pd.DataFrame:
+    """사분면별 상위 per_subregion 개 (사분면 순서 유지)"""
+    if df_cat.empty:
+        return df_cat
+    return df_cat.groupby("subregion", sort=False, observed=True).head(per_subregion)
+
+def itinerary_record(day: int, order_in_day: int, cat: str, row) -> Dict[str, object]:
+    """코스 한 칸 (assemble_itinerary 결과 DataFrame 의 한 행)"""
+    return {
+        "day": day,
+        "order_in_day": order_in_day,
+        "name": row.get("name", ""),
+        "category": cat,  # place / food / stay (내부 코드)
+        "address": row.get("address", ""),
+        "region_city": row.get("region_city", ""),
+        "subregion": row.get("subregion", ""),
+        "tags": row.get("tags", ""),
+        "descriptionShort": row.get("descriptionShort", ""),
+        "similarity": float(row["similarity"]),
+        "lat": row.get("lat"),
+        "lng": row.get("lng"),
+        "orig_idx": int(row["orig_idx"]),
+        "id": row.get("id"),
+    }
+
+def assemble_itinerary(
+    ranked: Dict[str, pd.DataFrame],
+    days: int = 1,
+    max_places_per_day: int = 3,
+    deadline: Optional[Deadline] = None,
+    costs: Optional[StageCosts] = None,
+    nearby: Optional[NearbyTable] = None,
+) -> pd.DataFrame:
+    """
+    카테고리별 정렬된 후보로 Day별 코스 구성
+      * place 여러 개 (max_places_per_day)
+      * 첫 place 뒤에 food 1개 끼워 넣기
+      * 마지막에 stay 1개 붙이기
+    nearby 가 있으면 맛집은 첫 place, 숙소는 마지막 place 근처(nearby_max_km 이내) 후보 중에서 먼저 고르고
+      (근처에 랭킹 후보가 없으면 같은 사분면 → 유사도 순)
+      근처 후보는 사분면별 상위 days * (max_places_per_day + 2) 개 안에서만 찾음
+      → warm-up 표 / 최근 랭킹 / 채팅 세션처럼 보관 개수가 다른 랭킹이어도 같은 맛집·숙소
+    deadline 이 주어지면 둘째 날부터 하루 구성할 시간이 남았는지 보고
+      모자라면 맛집/숙소를 같은 사분면에서 고르는 단계를 생략하고, 그래도 모자라면 거기서 멈춤
+    costs: 하루 구성 시간을 기록할 추정기
+    """
+    place_df = ranked["place"]
+    food_df = ranked["food"]
+    stay_df = ranked["stay"]
+
+    if place_df.empty and food_df.empty and stay_df.empty:
+        return pd.DataFrame()
+
+    total_place_needed = days * max_places_per_day
+    place_df = place_df.head(total_place_needed).reset_index(drop=True)
+    if nearby is not None:
+        per_subregion = days * (max_places_per_day + 2)
+        food_near = course_pool(food_df, per_subregion)
+        stay_near = course_pool(stay_df, per_subregion)
+
+    used_indices: set = set()
+    results = []
+    match_subregion = True
+
+    for day in range(1, days + 1):
+        if deadline is not None and costs is not None and results:
+            if match_subregion and not deadline.allows(costs.estimate("assemble_day")):
+                match_subregion = False
+                deadline.degrade(SKIPPED_SUBREGION_MATCHING)
+            if not match_subregion and not deadline.allows(costs.estimate("assemble_day_fast")):
+                deadline.degrade(FEWER_DAYS)
+                break
+        day_started = time.perf_counter()
+
+        start_idx = (day - 1) * max_places_per_day
+        end_idx = day * max_places_per_day
+        day_places = place_df.iloc[start_idx:end_idx]
+        day_places = day_places[~day_places["orig_idx"].isin(used_indices)].reset_index(drop=True)
+
+        if day_places.empty:
+            continue
+
+        if match_subregion:
+            dominant_sub = (
+                day_places["subregion"].astype(object).value_counts().idxmax()
+                if not day_places["subregion"].empty
+                else None
+            )
+            last_place_sub = day_places.iloc[-1]["subregion"]
+        else:
+            dominant_sub = last_place_sub = None
+
+        day_food_candidate = day_stay_candidate = None
+        if match_subregion and nearby is not None:
+            day_food_candidate = get_nearby_candidate(
+                food_near, used_indices, nearby, int(day_places.iloc[0]["orig_idx"]), "food",
+                settings.nearby_max_km * 1000,
+            )
+            day_stay_candidate = get_nearby_candidate(
+                stay_near, used_indices, nearby, int(day_places.iloc[-1]["orig_idx"]), "stay",
+                settings.nearby_max_km * 1000,
+            )
+        if day_food_candidate is None:
+            day_food_candidate = get_best_candidate(food_df, used_indices, preferred_subregion=dominant_sub)
+        if day_stay_candidate is None:
+            day_stay_candidate = get_best_candidate(stay_df, used_indices, preferred_subregion=last_place_sub)
+
+        day_items = []
+        for i, (_, prow) in enumerate(day_places.iterrows()):
+            day_items.append(("place", prow))
+            # 첫 번째 관광지 뒤에 맛집 1개 끼워 넣기
+            if i == 0 and day_food_candidate is not None:
+                day_items.append(("food", day_food_candidate))
+
+        if day_stay_candidate is not None:
+            day_items.append(("stay", day_stay_candidate))
+
+        order_in_day = 0
+        for cat, row in day_items:
+            if pd.isna(row.get("orig_idx", np.nan)):
+                continue
+            if row["orig_idx"] in used_indices:
+                continue
+
+            used_indices.add(row["orig_idx"])
+            order_in_day += 1
+            results.append(itinerary_record(day, order_in_day, cat, row))
+
+        if costs is not None:
+            costs.observe("assemble_day" if match_subregion else "assemble_day_fast", time.perf_counter() - day_started)
+
+    if not results:
+        return pd.DataFrame()
+
+    return pd.DataFrame(results)
+
+# ------------------------------------------------
+# 6. 태그 조합 warm-up 표
+# ------------------------------------------------
+# 단일 태그 + 태그 쌍 × (전체 / 사분면마다 / 동·서(제주는 남·북까지) 방향) 범위를
+# (gazetteer.warmup_scopes)
+# 서버가 ready 된 뒤 백그라운드에서 미리 계산해둔다.
+# 정렬이 "사분면 → 유사도" 순이라 사분면별로 상위 warmup_top_k 개씩만 남겨도
+# days * (max_places_per_day + 2) <= warmup_top_k 인 요청은 결과가 똑같다.
+
+def warmup_key(selected_tags: List[str], region_filter_subregions: Optional[List[str]]) -> tuple:
+    tags_key = tuple(sorted({t.strip() for t in selected_tags if t and t.strip()}))
+    subs_key = tuple(sorted(set(region_filter_subregions))) if region_filter_subregions else None
+    return (tags_key, subs_key)
+
+def is_warmup_eligible(
+    region_filter_address: Optional[str],
+    days: int,
+    max_places_per_day: int,
+    free_text: str,
+) -> bool:
+    if (free_text or "").strip():
+        return False
+    if region_filter_address and region_filter_address.strip():
+        return False
+    return days * (max_places_per_day + 2) <= settings.warmup_top_k
+
+# 단계별 소요 시간 초기 추정값(초) — 실제 요청 시간으로 계속 갱신
+STAGE_COST_DEFAULTS = {
+    "rank_tags": 0.02,
+    "rank_text": 0.05,
+    "assemble_day": 0.02,
+    "assemble_day_fast": 0.01,
+}
+
+def ranked_to_compact(ranked: Dict[str, pd.DataFrame], top_k: int) -> CompactRanking:
+    compact: CompactRanking = {}
+    for cat, cat_df in ranked.items():
+        # 사분면 그룹 순서는 유지한 채 그룹마다 상위 top_k 개만
+        head = cat_df.groupby("subregion", sort=False, observed=True).head(top_k)
+        compact[cat] = (
+            head["orig_idx"].to_numpy(dtype=np.int32),
+            head["similarity"].to_numpy(dtype=np.float32),
+        )
+    return compact
+
+# ------------------------------------------------
+# 7. 추천 인덱스
+# ------------------------------------------------
+
+class RecommenderIndex:
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        scorer: ShardedScorer,
+        lng_mid: Dict[str, float],
+        version: str,
+        source: str,
+        build_sec: float,
+        row_hashes: Optional[pd.Series] = None,
+        deltas_since_full: int = 0,
+        previous: Optional["RecommenderIndex"] = None,
+        gazetteer: Gazetteer = JEJU,
+    ):
+        """
+        previous : 카탈로그 부분 갱신 전 인덱스 (이름이 같은 자동완성 항목의 키를 다시 쓰고 참조는 안 남김)
+        gazetteer: 여행지 지명 사전 (시 / 사분면 / 지명, 기본 제주)
+        """
+        self.df = df
+        self.gazetteer = gazetteer
+        # 여행지 이름 (결과 캐시 / single-flight / ETag key 에 들어감)
+        self.destination = gazetteer.name
+        self.scorer = scorer
+        self.lng_mid = lng_mid
+        self.version = version
+        self.source = source
+        self.build_sec = build_sec
+        self.built_at = time.time()
+        # 장소 id → 내용 fingerprint (행 순서, id 가 없거나 중복이면 None → 부분 갱신 불가)
+        self.row_hashes = row_hashes
+        # 마지막 전체 빌드 이후 부분 갱신 횟수 (사전 / idf / 동서 기준 경도는 전체 빌드 기준)
+        self.deltas_since_full = deltas_since_full
+        self.warmup = WarmupTable()
+        self.places = PlaceCatalog(df, version)
+        # 검색창 자동완성 (장소 이름 / 태그 / 지역 이름)
+        self.autocomplete = build_autocomplete(
+            df, self.places, previous.autocomplete if previous is not None else None, gazetteer,
+        )
+        # 장소별 가까운 맛집 / 숙소 (nearby_k=0 이면 끔 → 사분면만 맞춤)
+        self.nearby: Optional[NearbyTable] = (
+            NearbyTable(
+                df["lat"].to_numpy(dtype=np.float64, na_value=np.nan),
+                df["lng"].to_numpy(dtype=np.float64, na_value=np.nan),
+                df["category_mapped"].astype(str).to_numpy(),
+                k=settings.nearby_k,
+            )
+            if settings.nearby_k > 0 else None
+        )
+        # 교체 요청용 최근 compact 랭킹 (조건 → 랭킹, LRU)
+        self._rankings: "OrderedDict[tuple, CompactRanking]" = OrderedDict()
+        self._rankings_lock = threading.Lock()
+        # 행 위치 → 사분면 코드 (gazetteer.subregion_order 순서)
+        self.subregion_codes = df["subregion"].cat.codes.to_numpy()
+        # 요청 deadline 판단용 단계별 소요 시간 추정
+        self.stage_costs = StageCosts(STAGE_COST_DEFAULTS)
+        # 행 순서 인기도 (0~1, interactions.py 집계 → set_popularity)
+        self.popularity = np.zeros(len(df), dtype=np.float32)
+        self.popularity_version = 0
+
+    def rank_candidates(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str] = None,
+        region_filter_subregions: Optional[List[str]] = None,
+        free_text: str = "",
+        top_k: Optional[int] = None,
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        - 태그 + freeText 기반 유사도 계산 (scorer: TF-IDF 코사인 또는 BM25)
+          (freeText 가 없고 scorer 에 태그 점수 표가 있으면 그걸로 계산)
+        - 지역 필터 적용 후 place / food / stay 별로 (사분면 → 유사도) 순 정렬
+          사분면 필터가 고른 shard 만 계산하고, top_k 가 주어지면 사분면별 상위 top_k 개만
+        - 쿼리가 비어 있으면 None
+        """
+        ranking = self.rank_compact(
+            selected_tags, region_filter_address, region_filter_subregions, free_text, top_k,
+        )
+        return None if ranking is None else self.compact_to_ranked(ranking)
+
+    def rank_compact(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str] = None,
+        region_filter_subregions: Optional[List[str]] = None,
+        free_text: str = "",
+        top_k: Optional[int] = None,
+    ) -> Optional[CompactRanking]:
+        """rank_candidates 와 같은 순위를 (행 위치, 유사도) 배열로 (DataFrame 으로 바꾸기 전)"""
+        query_text, merged_tags = build_query_from_tags(selected_tags, free_text=free_text)
+        if not query_text.strip():
+            return None
+
+        # 1) 주소 기반 지역 필터 (전체 행 기준 마스크)
+        row_mask = None
+        if region_filter_address and region_filter_address.strip():
+            row_mask = self.df["address"].str.contains(region_filter_address.strip(), na=False).to_numpy(dtype=bool)
+
+        # 2) 사분면 기반 필터 (서쪽/동쪽 등) → 해당 shard 만
+        shards = self.scorer.select(region_filter_subregions)
+
+        # 만약 필터 때문에 비어버리면 전체로 fallback
+        if not any(len(s.rows) for s in shards) or (
+            row_mask is not None and not any(row_mask[s.rows].any() for s in shards)
+        ):
+            shards, row_mask = self.scorer.select(None), None
+
+        # 태그만 있는 요청이면 미리 계산한 태그 점수 표로 바로 계산
+        tags = merged_tags if not (free_text or "").strip() else None
+        return self.scorer.rank(query_text, tags, shards, row_mask=row_mask, top_k=top_k)
+
+    def rank_candidates_unsharded(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str] = None,
+        region_filter_subregions: Optional[List[str]] = None,
+        free_text: str = "",
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """shard 도입 전 방식 (전체 DataFrame 을 한 번에 정렬) — 벤치마크 / 결과 비교용"""
+        df = self.df
+        query_text, merged_tags = build_query_from_tags(selected_tags, free_text=free_text)
+        if not query_text.strip():
+            return None
+
+        candidate_df = df.copy()
+        candidate_df["orig_idx"] = candidate_df.index
+
+        # 1) 주소 기반 지역 필터
+        if region_filter_address and region_filter_address.strip():
+            mask_region = candidate_df["address"].str.contains(region_filter_address.strip(), na=False)
+            candidate_df = candidate_df[mask_region]
+
+        # 2) 사분면 기반 필터 (서쪽/동쪽 등)
+        if region_filter_subregions:
+            candidate_df = candidate_df[candidate_df["subregion"].isin(region_filter_subregions)]
+
+        # 만약 필터 때문에 비어버리면 전체로 fallback
+        if len(candidate_df) == 0:
+            candidate_df = df.copy()
+            candidate_df["orig_idx"] = candidate_df.index
+
+        idx_list = candidate_df["orig_idx"].tolist()
+
+        # 태그만 있는 요청이면 미리 계산한 태그 점수 표로 바로 계산
+        tag_sims = None
+        if not (free_text or "").strip():
+            tag_sims = self.scorer.score_tags(merged_tags)
+
+        if tag_sims is not None:
+            similarity = tag_sims[idx_list].astype(np.float64)
+        else:
+            similarity = self.scorer.score(query_text, idx_list)
+        candidate_df["similarity"] = similarity
+
+        return {
+            cat: sort_by_subregion_then_similarity(
+                candidate_df[candidate_df["category_mapped"] == cat], self.gazetteer.subregion_order,
+            ).copy()
+            for cat in ("place", "food", "stay")
+        }
+
+    def _ranked_for(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str],
+        region_filter_subregions: Optional[List[str]],
+        days: int,
+        max_places_per_day: int,
+        free_text: str,
+        top_k: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[Optional[Dict[str, pd.DataFrame]], Optional[Tuple[CompactRanking, int]], int]:
+        """
+        (정렬된 후보, 저장된 compact 랭킹을 썼으면 (랭킹, 사분면별 보관 개수), 코스 일수)
+        top_k: 사분면별로 남길 후보 수 (기본: 코스 구성에 필요한 days * (max_places_per_day + 2))
+        deadline: 새로 계산할 시간이 모자라면
+          저장된 랭킹(같은 조건 LRU → 태그·사분면만 맞는 warm-up 표) → freeText 를 뺀 태그 계산 순으로 대체
+          저장된 랭킹의 보관 개수로 모자라는 날짜는 줄임
+          이미 마감이 지났는데 저장된 랭킹도 없으면 DeadlineExceeded
+        """
+        if is_warmup_eligible(region_filter_address, days, max_places_per_day, free_text):
+            entry = self.warmup.lookup(warmup_key(selected_tags, region_filter_subregions))
+            if entry is not None:
+                return self.compact_to_ranked(entry), (entry, settings.warmup_top_k), days
+
+        has_text = bool((free_text or "").strip())
+        stage = "rank_text" if has_text else "rank_tags"
+        if deadline is not None and not deadline.allows(self.stage_costs.estimate(stage)):
+            saved = self._saved_ranking(
+                selected_tags, region_filter_address, region_filter_subregions, free_text, deadline,
+            )
+            if saved is not None:
+                compact, depth = saved
+                fit = max(1, depth // (max_places_per_day + 2))
+                if days > fit:
+                    days = fit
+                    deadline.degrade(FEWER_DAYS)
+                return self.compact_to_ranked(compact), saved, days
+            if deadline.expired():
+                raise DeadlineExceeded("rank")
+            if has_text and selected_tags:
+                deadline.degrade(TAG_ONLY_RANKING)
+                free_text, stage = "", "rank_tags"
+
+        # 세션 / 교체용 보관 개수 이상으로 계산해서 최근 랭킹 LRU 에도 넣어 둠
+        # (사분면별 상위 k 개는 k 가 코스에 필요한 수 이상이면 코스 결과가 같음 —
+        #  근처 맛집/숙소도 assemble_itinerary 가 필요한 수까지만 보므로 k 와 무관)
+        depth = max(top_k or days * (max_places_per_day + 2), settings.chat_session_top_k)
+        with self.stage_costs.measure(stage):
+            compact = self.rank_compact(
+                selected_tags, region_filter_address, region_filter_subregions, free_text, depth,
+            )
+        if compact is None:
+            return None, None, days
+        if depth == settings.chat_session_top_k:
+            self._remember_ranking(
+                self._ranking_key(selected_tags, region_filter_address, region_filter_subregions, free_text),
+                compact,
+            )
+        return self.compact_to_ranked(compact), None, days
+
+    def _saved_ranking(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str],
+        region_filter_subregions: Optional[List[str]],
+        free_text: str,
+        deadline: Deadline,
+    ) -> Optional[Tuple[CompactRanking, int]]:
+        """계산 없이 쓸 수 있는 랭킹 (같은 조건으로 최근 계산한 것 → 태그·사분면이 같은 warm-up 표)"""
+        key = self._ranking_key(selected_tags, region_filter_address, region_filter_subregions, free_text)
+        with self._rankings_lock:
+            compact = self._rankings.get(key)
+        if compact is not None:
+            deadline.degrade(CACHED_RANKING)
+            return compact, settings.chat_session_top_k
+
+        entry = self.warmup.lookup(warmup_key(selected_tags, region_filter_subregions))
+        if entry is None:
+            return None
+        if (free_text or "").strip() or (region_filter_address or "").strip():
+            deadline.degrade(PRECOMPUTED_RANKING)
+        return entry, settings.warmup_top_k
+
+    def recommend_itinerary_no_time(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str] = None,
+        region_filter_subregions: Optional[List[str]] = None,
+        days: int = 1,
+        max_places_per_day: int = 3,
+        free_text: str = "",
+        deadline: Optional[Deadline] = None,
+    ) -> pd.DataFrame:
+        """
+        - 태그 + freeText 기반 유사도 (TF-IDF 또는 BM25, JEJU_SCORER)
+        - place / food / stay를 종합해서 Day별 코스 구성
+        - region_filter_address: 주소 문자열 필터 (애월, 성산, 중문 등)
+        - region_filter_subregions: ["제주 서", "서귀포 서"] 등 사분면 필터
+        - freeText 없는 태그 전용 요청은 warm-up 표가 있으면 그걸 그대로 사용
+        - deadline: 시간이 모자라면 더 싼 경로로 (적용한 것은 deadline.degradations 에 기록)
+        """
+        ranked, _, days = self._ranked_for(
+            selected_tags, region_filter_address, region_filter_subregions,
+            days, max_places_per_day, free_text, deadline=deadline,
+        )
+        if ranked is None:
+            return pd.DataFrame()
+
+        return assemble_itinerary(
+            ranked, days=days, max_places_per_day=max_places_per_day,
+            deadline=deadline, costs=self.stage_costs, nearby=self.nearby,
+        )
+
+    def recommend_days(self, **kwargs) -> List[DayPlan]:
+        return itinerary_df_to_days(self.recommend_itinerary_no_time(**kwargs))
+
+    # --- 채팅 세션 (후속 요청을 저장해둔 랭킹으로 처리) ---
+
+    def plan_session(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str] = None,
+        region_filter_subregions: Optional[List[str]] = None,
+        days: int = 1,
+        max_places_per_day: int = 3,
+        free_text: str = "",
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[Optional[CompactRanking], int, List[Dict[str, object]]]:
+        """
+        recommend_itinerary_no_time 과 같은 코스 + 세션에 저장할 compact 랭킹
+        반환: (compact 랭킹, 사분면별 보관 개수, 코스 행 목록)
+        """
+        depth = max(settings.chat_session_top_k, days * (max_places_per_day + 2))
+        ranked, saved, days = self._ranked_for(
+            selected_tags, region_filter_address, region_filter_subregions,
+            days, max_places_per_day, free_text, top_k=depth, deadline=deadline,
+        )
+        if ranked is None:
+            return None, 0, []
+
+        if saved is not None:
+            compact, depth = saved
+        else:
+            compact = ranked_to_compact(ranked, depth)
+
+        itinerary = assemble_itinerary(
+            ranked, days=days, max_places_per_day=max_places_per_day,
+            deadline=deadline, costs=self.stage_costs, nearby=self.nearby,
+        )
+        return compact, depth, itinerary.to_dict("records")
+
+    def extend_session_plan(
+        self,
+        compact: CompactRanking,
+        depth: int,
+        records: List[Dict[str, object]],
+        excluded: set,
+        days: int,
+        max_places_per_day: int,
+    ) -> Optional[List[Dict[str, object]]]:
+        """
+        저장된 랭킹으로 코스를 days 일로 늘리거나 줄임
+        - 기존 날짜의 항목(교체한 것 포함)은 그대로 두고 새 날짜만 구성
+        - 새 날짜에서 기존/제외 후보와 겹치는 항목은 같은 사분면의 다음 후보로
+        보관한 후보가 모자라면 None
+        """
+        current_days = max((int(r["day"]) for r in records), default=0)
+        kept = [dict(r) for r in records if r["day"] <= days]
+        if days <= current_days:
+            return kept
+        if days * (max_places_per_day + 2) > depth:
+            return None
+
+        full = assemble_itinerary(
+            self.compact_to_ranked(compact), days=days, max_places_per_day=max_places_per_day,
+            nearby=self.nearby,
+        )
+        used = {int(r["orig_idx"]) for r in kept} | excluded
+        added = []
+        for rec in full.to_dict("records"):
+            if rec["day"] <= current_days:
+                continue
+            if int(rec["orig_idx"]) in used:
+                picked = self.next_candidate(compact, rec["category"], rec["subregion"], used)
+                if picked is None:
+                    continue
+                rec = self._record_for(rec["day"], rec["order_in_day"], rec["category"], *picked)
+            used.add(int(rec["orig_idx"]))
+            added.append(rec)
+
+        # 빠진 항목이 있으면 날짜별 순서 다시 매기기
+        for day in range(current_days + 1, days + 1):
+            for order, rec in enumerate((r for r in added if r["day"] == day), start=1):
+                rec["order_in_day"] = order
+        return kept + added
+
+    def _record_for(self, day: int, order_in_day: int, category: str, orig_idx: int, similarity: float) -> Dict[str, object]:
+        row = self.df.loc[orig_idx].to_dict()
+        row.update(orig_idx=orig_idx, similarity=similarity)
+        return itinerary_record(day, order_in_day, category, row)
+
+    # --- 코스 한 칸 교체 ---
+
+    def compact_ranking(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str] = None,
+        region_filter_subregions: Optional[List[str]] = None,
+        free_text: str = "",
+        compute: bool = True,
+    ) -> Optional[CompactRanking]:
+        """
+        조건별 compact 랭킹 (warm-up 표 → 최근 랭킹 LRU → 새로 계산 순)
+        compute=False 면 저장된 것만 보고 없으면 None
+        """
+        if is_warmup_eligible(region_filter_address, 1, 1, free_text):
+            entry = self.warmup.lookup(warmup_key(selected_tags, region_filter_subregions))
+            if entry is not None:
+                return entry
+
+        key = self._ranking_key(selected_tags, region_filter_address, region_filter_subregions, free_text)
+        with self._rankings_lock:
+            compact = self._rankings.get(key)
+            if compact is not None:
+                self._rankings.move_to_end(key)
+                return compact
+        if not compute:
+            return None
+
+        ranked = self.rank_candidates(
+            selected_tags,
+            region_filter_address=region_filter_address,
+            region_filter_subregions=region_filter_subregions,
+            free_text=free_text,
+            top_k=settings.chat_session_top_k,
+        )
+        if ranked is None:
+            return None
+        compact = ranked_to_compact(ranked, settings.chat_session_top_k)
+        self._remember_ranking(key, compact)
+        return compact
+
+    def _remember_ranking(self, key: tuple, compact: CompactRanking) -> None:
+        with self._rankings_lock:
+            self._rankings[key] = compact
+            self._rankings.move_to_end(key)
+            while len(self._rankings) > settings.ranking_cache_size:
+                self._rankings.popitem(last=False)
+
+    def _ranking_key(
+        self,
+        selected_tags: List[str],
+        region_filter_address: Optional[str],
+        region_filter_subregions: Optional[List[str]],
+        free_text: str,
+    ) -> tuple:
+        return warmup_key(selected_tags, region_filter_subregions) + (
+            (region_filter_address or "").strip(),
+            " ".join((free_text or "").split()),
+        )
+
+    def find_place(self, place_id: Optional[str], name: str) -> Optional[int]:
+        """코스 항목 → 행 위치 (id 가 없던 예전 응답은 이름으로)"""
+        if place_id:
+            pos = self.places.positions_by_id.get(place_id)
+            if pos is not None:
+                return pos
+        return self.places.position_by_name(name)
+
+    def replacement_item(
+        self,
+        compact: CompactRanking,
+        itinerary: List[DayPlan],
+        target: ItineraryItem,
+        category: str,
+        exclude_ids: List[str],
+    ) -> Optional[ItineraryItem]:
+        """
+        target 자리에 넣을 같은 사분면·카테고리의 다음 후보
+        (코스에 이미 있는 장소와 exclude_ids 는 제외)
+        """
+        used = set()
+        for day_plan in itinerary:
+            for item in day_plan.items:
+                pos = self.find_place(item.id, item.name)
+                if pos is not None:
+                    used.add(pos)
+        for place_id in exclude_ids:
+            pos = self.places.positions_by_id.get(place_id)
+            if pos is not None:
+                used.add(pos)
+
+        picked = self.next_candidate(compact, category, target.subregion, used, fallback=False)
+        if picked is None:
+            return None
+        rec = self._record_for(target.day, target.order_in_day, category, *picked)
+        return record_to_item(rec)
+
+    def records_to_days(self, records: List[Dict[str, object]]) -> List[DayPlan]:
+        return itinerary_df_to_days(pd.DataFrame(records))
+
+    # --- 결과 캐시 직렬화 (result_cache.py 공유 서버용) ---
+
+    def encode_days(self, days: List[DayPlan]) -> Optional[bytes]:
+        """
+        코스 → (day, order, category 코드, 행 위치, 유사도) 목록 bytes
+        행 위치를 id 로 확실히 찾을 수 없거나 값이 형식 범위를 벗어나면 None (공유하지 않음)
+        """
+        items = []
+        for day_plan in days:
+            for item in day_plan.items:
+                pos = self.places.positions_by_id.get(item.id) if item.id else None
+                category = LABEL_TO_CATEGORY.get(item.category)
+                if pos is None or category is None:
+                    return None
+                items.append((item.day, item.order_in_day, CATEGORY_MAPPED_VALUES.index(category), pos, item.similarity))
+        return encode_items(items)
+
+    def decode_days(self, blob: bytes) -> Optional[List[DayPlan]]:
+        """encode_days 의 반대. 형식이 다르거나 범위를 벗어난 값이면 None"""
+        items = decode_items(blob)
+        if items is None:
+            return None
+        # 항목이 적어서 DataFrame 을 거치지 않고 바로 ItineraryItem 으로 (records_to_days 와 같은 순서)
+        items = sorted(items, key=lambda it: (it[0], it[1]))
+        if any(code >= len(CATEGORY_MAPPED_VALUES) or pos >= len(self.df) for _, _, code, pos, _ in items):
+            return None
+        rows = self.df.loc[[pos for _, _, _, pos, _ in items]].to_dict("records")
+        by_day: Dict[int, List[ItineraryItem]] = {}
+        for (day, order_in_day, code, pos, similarity), row in zip(items, rows):
+            row.update(orig_idx=pos, similarity=similarity)
+            rec = itinerary_record(day, order_in_day, CATEGORY_MAPPED_VALUES[code], row)
+            by_day.setdefault(day, []).append(record_to_item(rec))
+        return [DayPlan(day=day, items=day_items) for day, day_items in by_day.items()]
+
+    def next_candidate(
+        self,
+        compact: CompactRanking,
+        category: str,
+        subregion: Optional[str],
+        used: set,
+        fallback: bool = True,
+    ) -> Optional[Tuple[int, float]]:
+        """
+        category 후보 중 used 에 없는 다음 후보 (같은 사분면 우선)
+        후보는 사분면 → 유사도 순이라 사분면 구간을 searchsorted 로 바로 찾고
+        그 구간만 앞에서부터 훑음 (fallback=False 면 다른 사분면은 보지 않음)
+        """
+        idx, sim = compact[category]
+        order = self.gazetteer.subregion_order
+        if subregion in order:
+            code = order.index(subregion)
+            subranks = self.subregion_codes[idx]
+            lo, hi = np.searchsorted(subranks, [code, code + 1])
+            for j in range(lo, hi):
+                if int(idx[j]) not in used:
+                    return int(idx[j]), float(sim[j])
+        if not fallback:
+            return None
+        for j in range(len(idx)):
+            if int(idx[j]) not in used:
+                return int(idx[j]), float(sim[j])
+        return None
+
+    def replace_in_plan(
+        self,
+        compact: CompactRanking,
+        records: List[Dict[str, object]],
+        category: str,
+        days: Optional[List[int]],
+        excluded: set,
+    ) -> List[Tuple[Dict[str, object], Dict[str, object]]]:
+        """
+        records 에서 category 항목을 같은 사분면의 다음 후보로 교체 (records 를 직접 수정)
+        - days 가 주어지면 그 날짜만
+        - excluded: 이미 보여줬던 후보 (교체된 항목도 여기에 추가)
+        반환: [(이전 행, 새 행), ...]
+        """
+        used = {int(r["orig_idx"]) for r in records} | excluded
+        changes = []
+        for i, rec in enumerate(records):
+            if rec["category"] != category or (days and rec["day"] not in days):
+                continue
+            picked = self.next_candidate(compact, category, rec["subregion"], used)
+            if picked is None:
+                continue
+            new_rec = self._record_for(rec["day"], rec["order_in_day"], category, *picked)
+            used.add(new_rec["orig_idx"])
+            excluded.add(int(rec["orig_idx"]))
+            records[i] = new_rec
+            changes.append((rec, new_rec))
+        return changes
+
+    # --- warm-up ---
+
+    def compact_to_ranked(self, compact: CompactRanking) -> Dict[str, pd.DataFrame]:
+        ranked: Dict[str, pd.DataFrame] = {}
+        for cat, (idx, sim) in compact.items():
+            cat_df = self.df.loc[idx].copy()
+            cat_df["orig_idx"] = cat_df.index
+            cat_df["similarity"] = sim.astype(np.float64)
+            ranked[cat] = cat_df.reset_index(drop=True)
+        return ranked
+
+    def compute_warmup_entry(self, key: tuple) -> Optional[CompactRanking]:
+        tags_key, subs_key = key
+        ranked = self.rank_candidates(
+            list(tags_key),
+            region_filter_subregions=list(subs_key) if subs_key else None,
+            top_k=settings.warmup_top_k,
+        )
+        if ranked is None:
+            return None
+        return ranked_to_compact(ranked, settings.warmup_top_k)
+
+    def start_warmup(self):
+        tag_keys = {t["key"] for t in (BASE_TAGS + STAY_TAGS + FOOD_TAGS)} - {"더보기"}
+        keys = [
+            warmup_key(list(combo), subs)
+            for combo in tag_combinations(tag_keys, max_size=2)
+            for subs in self.gazetteer.warmup_scopes.values()
+        ]
+        return self.warmup.start_background(keys, self.compute_warmup_entry)
+
+    # --- 인기도 (interactions.py 집계) ---
+
+    def set_popularity(self, counts: Dict[str, float], version: int) -> None:
+        """
+        장소 id → 가중 횟수를 행 순서 인기도(log 스케일, 최댓값 1)로 바꿔 보관
+        popularity_weight > 0 이면 shard 에 (인기도 × 가중치)를 넘기고
+        이전 점수로 만든 랭킹(최근 랭킹 LRU, warm-up 표)은 비움
+        """
+        popularity = np.zeros(len(self.df), dtype=np.float32)
+        for place_id, count in counts.items():
+            pos = self.places.positions_by_id.get(place_id)
+            if pos is not None and count > 0:
+                popularity[pos] = np.log1p(count)
+        peak = float(popularity.max()) if len(popularity) else 0.0
+        if peak > 0:
+            popularity /= peak
+        self.popularity = popularity
+        self.popularity_version = version
+
+        weight = settings.popularity_weight
+        if weight <= 0:
+            return
+        self.scorer.set_boost(popularity.astype(np.float64) * weight, tag=f"pop{version}")
+        with self._rankings_lock:
+            self._rankings.clear()
+        if self.warmup.state in ("running", "done"):
+            self.warmup.invalidate()
+            if self.warmup.state == "done":
+                self.start_warmup()
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "index_version": self.version,
+            "catalog": self.source,
+            "places": int(len(self.df)),
+            "vocabulary": int(self.scorer.vocabulary_size),
+            "scorer": self.scorer.describe(),
+            "build_sec": round(self.build_sec, 3),
+            "built_at": self.built_at,
+            "deltas_since_full": self.deltas_since_full,
+        }
+
+def subregion_shard_rows(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """사분면 이름 → 행 위치 (subregion 카테고리 순서, 사분면이 비어 있는 행은 정렬처럼 '기타' 로)"""
+    codes = df["subregion"].cat.codes.to_numpy()
+    order = list(df["subregion"].cat.categories)
+    other = order.index(OTHER)
+    return {
+        name: np.flatnonzero((codes == code) | ((codes == -1) & (code == other)))
+        for code, name in enumerate(order)
+    }
+
+def tag_query_texts() -> Dict[str, str]:
+    """태그 → 태그 전용 쿼리에 들어가는 문구"""
+    return {
+        tag: " ".join([tag] + ([TAG_TO_QUERY_EXPANSION[tag]] if tag in TAG_TO_QUERY_EXPANSION else []))
+        for tag in sorted(ALL_TAG_KEYS)
+    }
+
+# 자동완성 정적 인기도: 지역 > 태그 > 장소 순으로 구간을 나누고 구간 안에서
+# 지역·태그는 해당 장소 수(log), 장소는 정보가 채워진 정도(태그 수 + 사진/설명 등)
+AUTOCOMPLETE_KIND_BASE = {"area": 2.0, "tag": 1.0, "place": 0.0}
+PLACE_DETAIL_FIELDS = ("thumbnailUrl", "descriptionShort", "openingHours", "phone", "priceInfo")
+
+def build_autocomplete(
+    df: pd.DataFrame,
+    places: PlaceCatalog,
+    previous: Optional[AutocompleteIndex] = None,
+    gazetteer: Gazetteer = JEJU,
+) -> AutocompleteIndex:
+    n_rows = max(len(df), 1)
+    facets = places.facets.values
+
+    def share(count: int) -> float:
+        """장소 수 → [0, 1) 사이 가중치"""
+        return float(np.log1p(count) / np.log1p(n_rows + 1))
+
+    suggestions: List[Suggestion] = []
+
+    # 1) 지역: 사분면 / 시 / 지명(사분면 장소 수를 같이 씀)
+    subregion_counts = {name: b.count for name, b in facets["subregion"].items()}
+    city_counts = df["region_city"].value_counts().to_dict()
+    areas = [(name, name, subregion_counts.get(name, 0)) for name in gazetteer.subregion_order if name != OTHER]
+    areas += [(name, None, int(city_counts.get(name, 0))) for name in gazetteer.city_values if name != OTHER]
+    areas += [(name, sub, subregion_counts.get(sub, 0)) for name, sub in gazetteer.places.items()]
+    for name, sub, count in areas:
+        suggestions.append(Suggestion(
+            name, "area", AUTOCOMPLETE_KIND_BASE["area"] + share(count), {"subregion": sub},
+        ))
+
+    # 2) 태그 키 (카탈로그에 달린 장소 수)
+    for tag in sorted(ALL_TAG_KEYS - {"더보기"}):
+        bitset = facets["tag"].get(tag)
+        count = bitset.count if bitset is not None else 0
+        suggestions.append(Suggestion(tag, "tag", AUTOCOMPLETE_KIND_BASE["tag"] + share(count)))
+
+    # 3) 장소 이름
+    filled = np.zeros(len(df), dtype=np.float64)
+    for col in PLACE_DETAIL_FIELDS:
+        if col in df.columns:
+            filled += df[col].fillna("").astype(str).str.strip().ne("").to_numpy()
+    n_tags = df["tags"].fillna("").astype(str).str.count(",").to_numpy() + df["tags"].notna().to_numpy()
+    detail = (filled + np.minimum(n_tags, 10)) / (len(PLACE_DETAIL_FIELDS) + 10 + 1)
+
+    for name, place_id, cat, sub, score in zip(
+        df["name"].tolist(),
+        df["id"].tolist(),
+        df["category_mapped"].astype(str).tolist(),
+        df["subregion"].astype(str).tolist(),
+        detail.tolist(),
+    ):
+        if not isinstance(name, str) or not name.strip():
+            continue
+        suggestions.append(Suggestion(
+            name.strip(),
+            "place",
+            AUTOCOMPLETE_KIND_BASE["place"] + score,
+            {"id": place_id if isinstance(place_id, str) else None, "category": cat, "subregion": sub},
+        ))
+
+    return AutocompleteIndex(suggestions, previous=previous)
+
+def build_index(catalog_path: Optional[str] = None, gazetteer: Gazetteer = JEJU) -> RecommenderIndex:
+    """카탈로그 파일을 읽어서 추천 인덱스 생성 (gazetteer: 여행지 지명 사전, 기본 제주)"""
+    started = time.perf_counter()
+    path = catalog_path or settings.catalog_path
+    return build_index_from_frame(load_catalog(path), source=str(path), started=started, gazetteer=gazetteer)
+
+def build_index_from_frame(
+    raw: pd.DataFrame,
+    source: str = "",
+    started: Optional[float] = None,
+    row_hashes: Optional[pd.Series] = None,
+    gazetteer: Gazetteer = JEJU,
+) -> RecommenderIndex:
+    started = started if started is not None else time.perf_counter()
+    if row_hashes is None:
+        row_hashes = row_fingerprints(raw)
+    df, lng_mid = prepare_catalog(raw, gazetteer=gazetteer)
+
+    # 검색 점수 계산기 (JEJU_SCORER)
+    # 태그 전용(freeText 없는) 요청용 쿼리 문구는 build_query_from_tags 와 같은 "태그 + 확장 문구"
+    base_scorer = build_scorer(
+        settings.scorer,
+        df["search_text"],
+        tag_query_texts(),
+        k1=settings.bm25_k1,
+        b=settings.bm25_b,
+    )
+
+    # search_text 는 인덱싱에만 쓰이므로 버리고, 나머지는 compact 레이아웃으로
+    df = compact_catalog(df.drop(columns=["search_text"]), gazetteer)
+
+    # 사분면별 shard 로 나누고 전체 행렬은 버림 (사전 / idf 는 전체 기준 그대로 공유)
+    scorer = ShardedScorer(
+        base_scorer,
+        subregion_shard_rows(df),
+        df["category_mapped"].cat.codes.to_numpy(),
+        workers=settings.shard_workers,
+        parallel_min_rows=settings.shard_parallel_min_rows,
+    )
+    del base_scorer
+
+    return RecommenderIndex(
+        df=df,
+        scorer=scorer,
+        lng_mid=lng_mid,
+        version=catalog_version(df),
+        source=source,
+        build_sec=time.perf_counter() - started,
+        row_hashes=row_hashes,
+        gazetteer=gazetteer,
+    )
+
+# ------------------------------------------------
+# 8. DataFrame -> Response 변환
+# ------------------------------------------------
+
+def record_to_item(row) -> ItineraryItem:
+    raw_cat = str(row["category"])
+    label = CATEGORY_LABEL.get(raw_cat, "기타")  # place → 관광 식으로 변환
+    place_id = row.get("id")
+
+    return ItineraryItem(
+        day=int(row["day"]),
+        order_in_day=int(row["order_in_day"]),
+        id=str(place_id) if isinstance(place_id, str) else None,
+        name=str(row["name"]),
+        category=label,
+        address=str(row["address"]),
+        region_city=str(row["region_city"]),
+        subregion=str(row["subregion"]),
+        tags=str(row["tags"]),
+        descriptionShort=str(row["descriptionShort"]),
+        similarity=float(row["similarity"]),
+        lat=float(row["lat"]) if not pd.isna(row["lat"]) else None,
+        lng=float(row["lng"]) if not pd.isna(row["lng"]) else None,
+    )
+
+def itinerary_df_to_days(itinerary_df: pd.DataFrame) -> List[DayPlan]:
+    if itinerary_df.empty:
+        return []
+
+    days_result: List[DayPlan] = []
+
+    for day in sorted(itinerary_df["day"].unique()):
+        day_df = itinerary_df[itinerary_df["day"] == day].copy()
+        day_df = day_df.sort_values("order_in_day")
+
+        items: List[ItineraryItem] = [record_to_item(row) for _, row in day_df.iterrows()]
+        days_result.append(DayPlan(day=int(day), items=items))
+
+    return days_result
@@ -0,0 +1,276 @@
+# regions.py
+# ================================================
+# 여행지(destination) 레지스트리
+# - 기본 목적지(jeju)는 서버 시작 때 만드는 main.INDEX 그대로
+#   (카탈로그 갱신 / 채팅 / 코스 교체 / 이벤트는 기본 목적지만)
+# - 다른 목적지는 목록(JEJU_REGIONS_PATH JSON)에 카탈로그 + 지명 사전만 적어 두고
+#   처음 요청될 때 백그라운드 스레드에서 인덱스를 만듦 (같은 목적지는 한 번만)
+#   요청은 timeout(요청 deadline 남은 시간)까지만 기다리고, 그래도 안 끝났으면 DestinationLoading
+#   로드가 실패하면 서버 로그에 남기고 retry_after_sec 동안은 다시 만들지 않음 (DestinationUnavailable)
+# - 올라와 있는 목적지 인덱스 크기 합이 예산(region_memory_budget_mb)을 넘으면
+#   가장 오래 안 쓴 목적지부터 내림 (방금 올린 목적지는 혼자 예산보다 커도 남김)
+#   크기는 목적지를 새로 올릴 때마다 다시 잼 (warm-up 표 / 최근 랭킹이 커지므로)
+# - 목적지별 로드 횟수 / 로드 시간(cold-load) / 내린 횟수 / 적중 수를 /stats 의 "regions" 로
+#
+# 목록 형식 (경로는 목록 파일 기준 상대 경로 가능, gazetteer 는 JSON 파일 경로 또는 사전 그대로)
+#   {
+#     "busan": {"catalog": "data/busan.csv", "gazetteer": "data/busan_gazetteer.json"}
+#   }
+# ================================================
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from gazetteer import JEJU, Gazetteer
+
+DEFAULT_DESTINATION = JEJU.name
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Destination:
+    name: str
+    catalog_path: str
+    gazetteer: Gazetteer
+
+
+class UnknownDestination(KeyError):
+    pass
+
+
+class DestinationLoading(Exception):
+    """목적지 인덱스를 아직 만드는 중 (요청이 기다릴 수 있는 시간 안에 안 끝남)"""
+
+
+class DestinationUnavailable(Exception):
+    """목적지 인덱스를 만들지 못함 (원인은 서버 로그에만, retry_after 초 뒤에 다시 시도)"""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(name)
+        self.name = name
+        self.retry_after = retry_after
+
+
+def load_destinations(path) -> Dict[str, Destination]:
+    """목적지 목록 JSON → 이름(소문자) → Destination (지명 사전도 여기서 읽어서 형식 오류는 시작할 때 드러남)"""
+    base = Path(path).parent
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("목적지 목록은 {이름: {catalog, gazetteer}} 형태여야 해요")
+
+    def resolve(p: str) -> str:
+        return str(Path(p) if Path(p).is_absolute() else base / p)
+
+    destinations: Dict[str, Destination] = {}
+    for raw_name, spec in data.items():
+        name = raw_name.strip().lower()
+        if name == DEFAULT_DESTINATION:
+            raise ValueError(f"{name} 은 기본 목적지라 목록에 넣을 수 없어요 (JEJU_CATALOG_PATH 사용)")
+        if not isinstance(spec, dict) or "catalog" not in spec or "gazetteer" not in spec:
+            raise ValueError(f"{name}: catalog 와 gazetteer 가 필요해요")
+        gazetteer = spec["gazetteer"]
+        if isinstance(gazetteer, str):
+            gazetteer = Gazetteer.load(resolve(gazetteer), name=name)
+        else:
+            gazetteer = Gazetteer.from_dict(gazetteer, name=name)
+        destinations[name] = Destination(name, resolve(spec["catalog"]), gazetteer)
+    return destinations
+
+
+class _Loading:
+    __slots__ = ("done", "index", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.index: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Resident:
+    __slots__ = ("index", "bytes", "load_ms", "loaded_at", "hits")
+
+    def __init__(self, index: Any, nbytes: int, load_ms: float):
+        self.index = index
+        self.bytes = nbytes
+        self.load_ms = load_ms
+        self.loaded_at = time.time()
+        self.hits = 0
+
+
+class RegionRegistry:
+    def __init__(
+        self,
+        destinations: Dict[str, Destination],
+        build: Callable[[Destination], Any],
+        measure: Callable[[Any], int],
+        budget_bytes: int,
+        on_evict: Optional[Callable[[Any], None]] = None,
+        retry_after_sec: float = 30.0,
+    ):
+        """
+        build          : 목적지 → 인덱스 (백그라운드 스레드에서 호출)
+        measure        : 인덱스 → 메모리 크기(바이트)
+        on_evict       : 내린 인덱스 정리 (warm-up 중지 등)
+        retry_after_sec: 로드가 실패한 목적지를 다시 만들기까지 기다릴 시간
+                         (잘못된 카탈로그 경로 / 깨진 파일이 요청마다 전체 빌드를 일으키지 않도록)
+        """
+        self.destinations = destinations
+        self._build = build
+        self._measure = measure
+        self.budget_bytes = budget_bytes
+        self._on_evict = on_evict
+        self.retry_after_sec = max(0.0, retry_after_sec)
+        self._lock = threading.Lock()
+        self._resident: "OrderedDict[str, _Resident]" = OrderedDict()
+        self._loading: Dict[str, _Loading] = {}
+        # 목적지 → 마지막 로드 실패 시각 (monotonic)
+        self._failed_at: Dict[str, float] = {}
+
+        # 통계 (목적지별)
+        self._loads: Dict[str, int] = {}
+        self._load_errors: Dict[str, int] = {}
+        self._evictions: Dict[str, int] = {}
+        self._last_load_ms: Dict[str, float] = {}
+        self._max_load_ms: Dict[str, float] = {}
+
+    def names(self) -> List[str]:
+        return sorted(self.destinations)
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        목적지 인덱스 (없으면 로드 시작 → timeout 까지 기다림, None 이면 끝까지)
+        UnknownDestination / DestinationLoading / DestinationUnavailable
+        """
+        destination = self.destinations.get(name)
+        if destination is None:
+            raise UnknownDestination(name)
+        with self._lock:
+            entry = self._resident.get(name)
+            if entry is not None:
+                self._resident.move_to_end(name)
+                entry.hits += 1
+                return entry.index
+            loading = self._loading.get(name)
+            if loading is None:
+                retry_in = self._retry_in(name)
+                if retry_in > 0:
+                    raise DestinationUnavailable(name, max(1, int(retry_in + 0.999)))
+                loading = _Loading()
+                self._loading[name] = loading
+                threading.Thread(
+                    target=self._load, args=(destination, loading), name=f"region-loader-{name}", daemon=True,
+                ).start()
+
+        if not loading.done.wait(None if timeout is None else max(0.0, timeout)):
+            raise DestinationLoading(name)
+        if loading.error is not None:
+            raise DestinationUnavailable(name, max(1, int(self.retry_after_sec + 0.999)))
+        return loading.index
+
+    def _retry_in(self, name: str) -> float:
+        """(잠금 안에서) 실패한 목적지를 다시 만들 수 있을 때까지 남은 초 (0 이면 지금 가능)"""
+        failed_at = self._failed_at.get(name)
+        if failed_at is None:
+            return 0.0
+        return max(0.0, failed_at + self.retry_after_sec - time.monotonic())
+
+    def _load(self, destination: Destination, loading: _Loading) -> None:
+        name = destination.name
+        started = time.perf_counter()
+        try:
+            index = self._build(destination)
+            nbytes = self._measure(index)
+        except Exception as e:
+            logger.exception("destination %s: index build failed (catalog=%s)", name, destination.catalog_path)
+            with self._lock:
+                self._loading.pop(name, None)
+                self._load_errors[name] = self._load_errors.get(name, 0) + 1
+                self._failed_at[name] = time.monotonic()
+            loading.error = e
+            loading.done.set()
+            return
+        load_ms = (time.perf_counter() - started) * 1000
+
+        # 이미 올라와 있는 목적지 크기 다시 재기 (잠금 밖에서)
+        with self._lock:
+            others = list(self._resident.items())
+        sizes = {other: self._measure(entry.index) for other, entry in others}
+
+        with self._lock:
+            for other, nbytes_now in sizes.items():
+                if other in self._resident:
+                    self._resident[other].bytes = nbytes_now
+            self._resident[name] = _Resident(index, nbytes, load_ms)
+            self._loading.pop(name, None)
+            self._failed_at.pop(name, None)
+            self._loads[name] = self._loads.get(name, 0) + 1
+            self._last_load_ms[name] = load_ms
+            self._max_load_ms[name] = max(self._max_load_ms.get(name, 0.0), load_ms)
+            evicted = self._evict_over_budget(keep=name)
+        loading.index = index
+        loading.done.set()
+
+        if self._on_evict is not None:
+            for old in evicted:
+                self._on_evict(old)
+
+    def _evict_over_budget(self, keep: str) -> List[Any]:
+        """(잠금 안에서) 예산을 넘는 동안 가장 오래 안 쓴 목적지부터 내림"""
+        evicted = []
+        total = sum(e.bytes for e in self._resident.values())
+        for name in list(self._resident):
+            if total <= self.budget_bytes:
+                break
+            if name == keep:
+                continue
+            entry = self._resident.pop(name)
+            total -= entry.bytes
+            self._evictions[name] = self._evictions.get(name, 0) + 1
+            evicted.append(entry.index)
+        return evicted
+
+    def indexes(self) -> List[Any]:
+        """지금 올라와 있는 목적지 인덱스 (인기도 반영 등)"""
+        with self._lock:
+            return [e.index for e in self._resident.values()]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            resident = {
+                name: {
+                    "bytes": e.bytes,
+                    "load_ms": round(e.load_ms, 1),
+                    "loaded_at": e.loaded_at,
+                    "hits": e.hits,
+                    "index_version": getattr(e.index, "version", None),
+                }
+                for name, e in self._resident.items()
+            }
+            return {
+                "default": DEFAULT_DESTINATION,
+                "available": [DEFAULT_DESTINATION] + self.names(),
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": sum(e.bytes for e in self._resident.values()),
+                # 오래 안 쓴 순 (먼저 내려갈 목적지가 앞)
+                "resident": resident,
+                "loading": sorted(self._loading),
+                "destinations": {
+                    name: {
+                        "loads": self._loads.get(name, 0),
+                        "load_errors": self._load_errors.get(name, 0),
+                        "evictions": self._evictions.get(name, 0),
+                        "last_load_ms": round(self._last_load_ms[name], 1) if name in self._last_load_ms else None,
+                        "max_load_ms": round(self._max_load_ms[name], 1) if name in self._max_load_ms else None,
+                        "retry_in_sec": round(self._retry_in(name), 1),
+                    }
+                    for name in self.names()
+                },
+            }
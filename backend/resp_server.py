@@ -0,0 +1,217 @@
+# resp_server.py
+# ================================================
+# 공유 결과 캐시를 로컬에서 시험할 때 쓰는 작은 Redis 프로토콜(RESP) 서버
+# - 메모리에만 저장, result_cache.py 가 쓰는 명령 + 점검용 몇 개만 지원
+#     PING / ECHO / GET / SET [EX|PX] / DEL / EXISTS / DBSIZE / FLUSHDB / FLUSHALL / SELECT / AUTH / QUIT
+# - --delay-ms 로 응답을 늦춰서 timeout / circuit breaker 동작을 확인할 수 있음
+#
+# 사용 예)
+#   python resp_server.py --port 6390
+#   JEJU_SHARED_CACHE_URL=redis://127.0.0.1:6390/0 uvicorn main:app --port 8000
+# ================================================
+
+import argparse
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class RespStore:
+    """db 번호 → key → (값, 만료 시각 monotonic 또는 None)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dbs: Dict[int, Dict[bytes, Tuple[bytes, Optional[float]]]] = {}
+
+    def _db(self, db: int) -> Dict[bytes, Tuple[bytes, Optional[float]]]:
+        return self._dbs.setdefault(db, {})
+
+    def get(self, db: int, key: bytes) -> Optional[bytes]:
+        with self._lock:
+            entry = self._db(db).get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._db(db)[key]
+                return None
+            return value
+
+    def set(self, db: int, key: bytes, value: bytes, ttl_sec: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl_sec if ttl_sec is not None else None
+        with self._lock:
+            self._db(db)[key] = (value, expires_at)
+
+    def delete(self, db: int, keys: List[bytes]) -> int:
+        with self._lock:
+            data = self._db(db)
+            return sum(1 for k in keys if data.pop(k, None) is not None)
+
+    def size(self, db: int) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for _, exp in self._db(db).values() if exp is None or exp > now)
+
+    def flush(self, db: Optional[int] = None) -> None:
+        with self._lock:
+            if db is None:
+                self._dbs.clear()
+            else:
+                self._dbs.pop(db, None)
+
+
+# ------------------------------------------------
+# RESP 읽기 / 쓰기
+# ------------------------------------------------
+
+def _simple(text: str) -> bytes:
+    return b"+" + text.encode() + b"\r\n"
+
+
+def _error(text: str) -> bytes:
+    return b"-ERR " + text.encode() + b"\r\n"
+
+
+def _integer(n: int) -> bytes:
+    return b":%d\r\n" % n
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def read_command(reader) -> Optional[List[bytes]]:
+    """multibulk 명령 하나 (연결이 끊겼으면 None). 한 줄짜리 inline 명령도 받음"""
+    line = reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        header = reader.readline()
+        if not header.startswith(b"$"):
+            raise ValueError("bulk string 이 아닙니다.")
+        n = int(header[1:-2])
+        data = reader.read(n + 2)
+        if len(data) != n + 2:
+            return None
+        args.append(data[:-2])
+    return args
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    server: "RespServer"
+
+    def handle(self) -> None:
+        db = 0
+        while True:
+            try:
+                args = read_command(self.rfile)
+            except (OSError, ValueError):
+                return
+            if args is None:
+                return
+            if not args:
+                continue
+            if self.server.delay_sec:
+                time.sleep(self.server.delay_sec)
+            name = args[0].upper()
+            if name == b"QUIT":
+                self.wfile.write(_simple("OK"))
+                return
+            if name == b"SELECT":
+                try:
+                    db = int(args[1])
+                except (IndexError, ValueError):
+                    self.wfile.write(_error("invalid DB index"))
+                    continue
+                self.wfile.write(_simple("OK"))
+                continue
+            try:
+                reply = self.execute(db, name, args[1:])
+            except (IndexError, ValueError):
+                reply = _error(f"wrong arguments for '{name.decode(errors='replace').lower()}' command")
+            try:
+                self.wfile.write(reply)
+            except OSError:
+                return
+
+    def execute(self, db: int, name: bytes, args: List[bytes]) -> bytes:
+        store = self.server.store
+        if name == b"PING":
+            return _bulk(args[0]) if args else _simple("PONG")
+        if name == b"ECHO":
+            return _bulk(args[0])
+        if name == b"AUTH":
+            return _simple("OK")
+        if name == b"GET":
+            return _bulk(store.get(db, args[0]))
+        if name == b"SET":
+            ttl_sec: Optional[float] = None
+            options = [a.upper() for a in args[2:]]
+            if b"EX" in options:
+                ttl_sec = float(args[2 + options.index(b"EX") + 1])
+            elif b"PX" in options:
+                ttl_sec = float(args[2 + options.index(b"PX") + 1]) / 1000.0
+            store.set(db, args[0], args[1], ttl_sec)
+            return _simple("OK")
+        if name == b"DEL":
+            return _integer(store.delete(db, args))
+        if name == b"EXISTS":
+            return _integer(sum(1 for k in args if store.get(db, k) is not None))
+        if name == b"DBSIZE":
+            return _integer(store.size(db))
+        if name == b"FLUSHDB":
+            store.flush(db)
+            return _simple("OK")
+        if name == b"FLUSHALL":
+            store.flush()
+            return _simple("OK")
+        return _error(f"unknown command '{name.decode(errors='replace')}'")
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, delay_ms: float = 0.0):
+        super().__init__((host, port), RespHandler)
+        self.store = RespStore()
+        self.delay_sec = delay_ms / 1000.0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+
+def start_background(host: str = "127.0.0.1", port: int = 0, delay_ms: float = 0.0) -> RespServer:
+    """스레드로 띄운 서버 (port=0 이면 빈 포트). 끝나면 shutdown() + server_close()"""
+    server = RespServer(host, port, delay_ms)
+    threading.Thread(target=server.serve_forever, name="resp-server", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="공유 결과 캐시 시험용 RESP 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="명령마다 응답을 늦출 시간")
+    args = parser.parse_args()
+
+    server = RespServer(args.host, args.port, args.delay_ms)
+    print(f"RESP 서버 시작: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
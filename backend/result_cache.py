@@ -0,0 +1,445 @@
+# result_cache.py
+# ================================================
+# 추천 결과 캐시 (워커 / 서버 사이 공유)
+# - 1단계: 프로세스 안 LRU (디코딩한 결과 객체를 그대로 보관)
+# - 2단계(선택): Redis 프로토콜(RESP) 서버 — JEJU_SHARED_CACHE_URL=redis://host:6379/0
+#     redis 패키지 없이 소켓으로 GET / SET 만 씀 (resp_server.py 로 로컬에서 대신 띄울 수 있음)
+#     읽기는 짧은 timeout(기본 20ms), 연속으로 실패하면 circuit breaker 가 열려서
+#     한동안은 묻지 않고 바로 로컬 계산 → 공유 서버가 느리거나 죽어도 요청이 기다리지 않음
+#     쓰기는 백그라운드 스레드 (대기열이 차면 버림)
+# - 값은 코스 항목마다 (day, order, category, 행 위치, 유사도) 15바이트로 packing
+#   key 에 카탈로그 버전 + scorer 설정이 들어가므로 카탈로그가 바뀌면 이전 값은 안 맞음
+# ================================================
+
+import hashlib
+import json
+import queue
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# 연속 실패가 이 횟수가 되면 breaker 를 열고 BREAKER_RESET_SEC 동안 공유 서버를 건너뜀
+BREAKER_FAILURES = 3
+BREAKER_RESET_SEC = 10.0
+
+# ------------------------------------------------
+# 1. 값 직렬화 (코스 항목 → 바이트)
+# ------------------------------------------------
+
+FORMAT_VERSION = 1
+# day(u8) / order_in_day(u8) / category 코드(u8) / 행 위치(u32) / 유사도(f64)
+ITEM_STRUCT = struct.Struct("<BBBId")
+_HEADER = struct.Struct("<BH")
+
+CacheItem = Tuple[int, int, int, int, float]
+
+
+def encode_items(items: List[CacheItem]) -> Optional[bytes]:
+    """
+    형식 범위를 벗어나는 값(256일 이상 / 하루 256칸 이상 / 항목 65536개 이상 등)이 있으면 None
+    (공유 서버에 넣지 않음 — 로컬 LRU 에는 그대로 남음)
+    """
+    try:
+        return _HEADER.pack(FORMAT_VERSION, len(items)) + b"".join(ITEM_STRUCT.pack(*item) for item in items)
+    except struct.error:
+        return None
+
+
+def decode_items(blob: bytes) -> Optional[List[CacheItem]]:
+    """형식이 다르거나 잘린 값이면 None (→ 캐시 miss 로 처리)"""
+    if len(blob) < _HEADER.size:
+        return None
+    version, n = _HEADER.unpack_from(blob)
+    if version != FORMAT_VERSION or len(blob) != _HEADER.size + n * ITEM_STRUCT.size:
+        return None
+    return [ITEM_STRUCT.unpack_from(blob, _HEADER.size + i * ITEM_STRUCT.size) for i in range(n)]
+
+
+def make_cache_key(prefix: str, *parts: Any) -> str:
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return prefix + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ------------------------------------------------
+# 2. 프로세스 안 LRU
+# ------------------------------------------------
+
+class LocalLRU:
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> bool:
+        """새로 넣었으면 True (이미 있던 key 면 False)"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return False
+            self._data[key] = value
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+# ------------------------------------------------
+# 3. 공유 서버 (RESP 클라이언트 + circuit breaker)
+# ------------------------------------------------
+
+class CircuitBreaker:
+    """
+    closed   : 평소 (연속 실패 수만 셈)
+    open     : 실패가 쌓여서 reset_after_sec 동안 호출하지 않음
+    half_open: 시간이 지나 한 번만 시험 호출 (성공하면 closed, 실패하면 다시 open)
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURES, reset_after_sec: float = BREAKER_RESET_SEC):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_after_sec = reset_after_sec
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._opens = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_after_sec:
+                self._state = "half_open"
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self._opens += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures, "opens": self._opens}
+
+
+class RespError(Exception):
+    """서버가 돌려준 -ERR 응답"""
+
+
+class RespClient:
+    """
+    Redis 프로토콜(RESP2) 최소 클라이언트
+    redis://[:password@]host:port/db 형식 URL, 연결은 몇 개만 재사용
+    """
+
+    def __init__(self, url: str, timeout_sec: float, pool_size: int = 4):
+        parts = urlsplit(url)
+        if parts.scheme not in ("redis", "resp"):
+            raise ValueError(f"지원하지 않는 공유 캐시 URL: {url!r} (redis://host:port/db)")
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.password = parts.password
+        self.timeout_sec = timeout_sec
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[socket.socket, Any]] = []
+
+    def _connect(self) -> Tuple[socket.socket, Any]:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout_sec)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile("rb"))
+        try:
+            if self.password:
+                self._roundtrip(conn, ("AUTH", self.password))
+            if self.db:
+                self._roundtrip(conn, ("SELECT", str(self.db)))
+        except BaseException:
+            self._close(conn)
+            raise
+        return conn
+
+    @staticmethod
+    def _close(conn) -> None:
+        sock, reader = conn
+        try:
+            reader.close()
+        finally:
+            sock.close()
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    def _read(self, reader) -> Any:
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("공유 캐시 연결이 끊겼습니다.")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body
+        if kind == b"-":
+            raise RespError(body.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            n = int(body)
+            if n < 0:
+                return None
+            data = reader.read(n + 2)
+            if len(data) != n + 2:
+                raise ConnectionError("공유 캐시 응답이 잘렸습니다.")
+            return data[:-2]
+        if kind == b"*":
+            n = int(body)
+            return None if n < 0 else [self._read(reader) for _ in range(n)]
+        raise ConnectionError(f"알 수 없는 RESP 응답: {line[:20]!r}")
+
+    def _roundtrip(self, conn, args) -> Any:
+        sock, reader = conn
+        sock.sendall(self._encode(args))
+        return self._read(reader)
+
+    def command(self, *args) -> Any:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            reply = self._roundtrip(conn, args)
+        except RespError:
+            self._release(conn)
+            raise
+        except BaseException:
+            # timeout 등으로 응답을 다 못 읽은 연결은 재사용하지 않음
+            self._close(conn)
+            raise
+        self._release(conn)
+        return reply
+
+    def _release(self, conn) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        self._close(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+
+class SharedTier:
+    def __init__(
+        self,
+        client: RespClient,
+        ttl_sec: int,
+        breaker: Optional[CircuitBreaker] = None,
+        queue_size: int = 256,
+    ):
+        self.client = client
+        self.ttl_ms = max(1, ttl_sec) * 1000
+        self.breaker = breaker or CircuitBreaker()
+        self._queue: "queue.Queue[Tuple[str, bytes]]" = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._counts = {
+            "hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "skipped_open": 0,
+            "writes": 0,
+            "write_errors": 0,
+            "writes_dropped": 0,
+        }
+        self._get_total_ms = 0.0
+        self._get_max_ms = 0.0
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self._counts[name] += n
+
+    def get(self, key: str) -> Optional[bytes]:
+        """miss / timeout / 연결 실패 / breaker open 은 모두 None"""
+        if not self.breaker.allow():
+            self._count("skipped_open")
+            return None
+        started = time.perf_counter()
+        try:
+            value = self.client.command("GET", key)
+        except (OSError, RespError, ValueError):
+            self.breaker.record_failure()
+            self._count("errors")
+            value = None
+        else:
+            self.breaker.record_success()
+            self._count("hits" if value is not None else "misses")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._get_total_ms += elapsed_ms
+            self._get_max_ms = max(self._get_max_ms, elapsed_ms)
+        return value
+
+    def set_async(self, key: str, value: bytes) -> None:
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((key, value))
+        except queue.Full:
+            self._count("writes_dropped")
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="shared-cache-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            key, value = self._queue.get()
+            try:
+                if not self.breaker.allow():
+                    self._count("writes_dropped")
+                    continue
+                try:
+                    self.client.command("SET", key, value, "PX", self.ttl_ms)
+                except (OSError, RespError, ValueError):
+                    self.breaker.record_failure()
+                    self._count("write_errors")
+                else:
+                    self.breaker.record_success()
+                    self._count("writes")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout_sec: float = 5.0) -> bool:
+        """대기 중인 쓰기가 끝날 때까지 기다림 (벤치마크 / 종료용)"""
+        deadline = time.monotonic() + timeout_sec
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        with self._stats_lock:
+            counts = dict(self._counts)
+            gets = counts["hits"] + counts["misses"] + counts["errors"]
+            timing = {
+                "avg_get_ms": round(self._get_total_ms / gets, 3) if gets else None,
+                "max_get_ms": round(self._get_max_ms, 3),
+            }
+        return {
+            "server": f"{self.client.host}:{self.client.port}/{self.client.db}",
+            "timeout_ms": round(self.client.timeout_sec * 1000, 1),
+            **counts,
+            **timing,
+            "write_queue": self._queue.qsize(),
+            "breaker": self.breaker.stats(),
+        }
+
+
+# ------------------------------------------------
+# 4. 2단계 캐시
+# ------------------------------------------------
+
+class ResultCache:
+    def __init__(self, local: LocalLRU, shared: Optional[SharedTier] = None):
+        self.local = local
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._local_hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._encode_errors = 0
+
+    def get(self, key: str, decode: Callable[[bytes], Optional[Any]]) -> Optional[Any]:
+        """로컬 → 공유 서버 순. 공유 서버 값은 decode 해서 로컬에도 넣어 둠"""
+        value = self.local.get(key)
+        if value is not None:
+            with self._lock:
+                self._local_hits += 1
+            return value
+        if self.shared is not None:
+            blob = self.shared.get(key)
+            value = decode(blob) if blob is not None else None
+            if value is not None:
+                self.local.put(key, value)
+                with self._lock:
+                    self._shared_hits += 1
+                return value
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, value: Any, encode: Callable[[Any], Optional[bytes]]) -> None:
+        """
+        로컬에 넣고, 처음 넣은 값이면 공유 서버에도 (백그라운드)
+        encode 가 실패해도 공유 서버 쓰기만 건너뜀 (공유 서버는 응답에 영향을 주지 않음)
+        """
+        if not self.local.put(key, value) or self.shared is None:
+            return
+        try:
+            blob = encode(value)
+        except Exception:
+            with self._lock:
+                self._encode_errors += 1
+            return
+        if blob is not None:
+            self.shared.set_async(key, blob)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            counts = {
+                "local_hits": self._local_hits,
+                "shared_hits": self._shared_hits,
+                "misses": self._misses,
+                "encode_errors": self._encode_errors,
+            }
+        return {
+            "local_entries": len(self.local),
+            "local_max_entries": self.local.max_entries,
+            **counts,
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
+
+
+def build_result_cache(
+    local_size: int,
+    shared_url: str = "",
+    timeout_ms: int = 20,
+    ttl_sec: int = 3600,
+) -> ResultCache:
+    shared = None
+    if shared_url:
+        shared = SharedTier(RespClient(shared_url, timeout_sec=timeout_ms / 1000.0), ttl_sec=ttl_sec)
+    return ResultCache(LocalLRU(local_size), shared)
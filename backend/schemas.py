@@ -0,0 +1,99 @@
+# schemas.py
+# ================================================
+# Pydantic 모델 (Request / Response)
+# - main.py(엔드포인트)와 recommender.py(DataFrame → 응답 변환)가 같이 사용
+# ================================================
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RecommendRequest(BaseModel):
+    tags: List[str] = []
+    region: Optional[str] = None           # 주소 필터 (ex. 제주시, 서귀포시, 애월, 성산...)
+    days: int = 1
+    max_places_per_day: int = 3
+    freeText: Optional[str] = ""
+    subregions: Optional[List[str]] = None # ["제주 서", "서귀포 서"] 등
+
+class ItineraryItem(BaseModel):
+    day: int
+    order_in_day: int
+    id: Optional[str] = None  # 장소 id (교체 요청 등에 다시 보낼 때 사용)
+    name: str
+    category: str          # "관광" / "식사" / "숙소"  ← 사람 읽는 라벨
+    address: str
+    region_city: str
+    subregion: str
+    tags: str
+    descriptionShort: str
+    similarity: float
+    lat: Optional[float]
+    lng: Optional[float]
+
+class DayPlan(BaseModel):
+    day: int
+    items: List[ItineraryItem]
+
+class RecommendResponse(BaseModel):
+    days: List[DayPlan]
+    # 요청 deadline 때문에 적용한 대체 경로 (deadline.py, 없으면 빈 목록)
+    degradations: List[str] = []
+
+# 코스 한 칸 교체용 (원래 추천 조건 + 현재 코스 + 바꿀 위치)
+class ReplaceItemRequest(RecommendRequest):
+    itinerary: List[DayPlan]
+    day: int
+    order_in_day: int
+    category: Optional[str] = None         # place/food/stay 또는 관광/식사/숙소 (위치 확인용)
+    exclude_ids: List[str] = []            # 이미 거절한 장소 id
+    session_id: Optional[str] = None       # /chat 세션이 있으면 그 랭킹 사용
+
+class ReplaceItemResponse(BaseModel):
+    days: List[DayPlan]
+    replaced: ItineraryItem
+    item: Optional[ItineraryItem]          # 더 이상 후보가 없으면 None
+
+# 자연어/키워드용
+class RecommendTextRequest(BaseModel):
+    query: str
+    max_places_per_day: int = 3
+
+class ParsedQuery(BaseModel):
+    original: str
+    days: int
+    tags: List[str]
+    region_address: Optional[str]
+    region_subregions: Optional[List[str]]
+    freeText: str
+
+class RecommendTextResponse(BaseModel):
+    parsed: ParsedQuery
+    days: List[DayPlan]
+    message: str           # ✅ 챗봇에 그대로 쓸 한국어 문장
+    degradations: List[str] = []
+
+# 챗봇용
+class ChatRequest(BaseModel):
+    message: str
+    # 주면 대화 세션 유지 ("숙소만 바꿔줘", "하루 더" 같은 후속 요청 가능)
+    session_id: Optional[str] = Field(default=None, max_length=128)
+
+class ChatResponse(BaseModel):
+    reply: str
+    itinerary: RecommendResponse
+    session_id: Optional[str] = None
+
+# 추천 장소 조회 / 선택 이벤트 (POST /events)
+class InteractionEvent(BaseModel):
+    type: Literal["view", "accept"]        # view: 상세 보기, accept: 코스에 넣기로 함
+    place_id: str = Field(max_length=128)
+    session_id: Optional[str] = Field(default=None, max_length=128)
+
+class InteractionEventsRequest(BaseModel):
+    events: List[InteractionEvent] = Field(max_length=100)
+
+class InteractionEventsResponse(BaseModel):
+    accepted: int
+    dropped: int                           # 대기열이 가득 차서 버린 수
@@ -0,0 +1,232 @@
+# scorers.py
+# ================================================
+# 검색 점수 계산기 (장소 search_text ↔ 쿼리 문구)
+# - Scorer: rank_candidates 가 쓰는 공통 인터페이스
+#     score(query_text, rows)  → rows 위치 장소들의 점수 (float64, rows=None 이면 전체)
+#     score_tags(tags)         → 태그 전용 쿼리 빠른 경로 (없으면 None)
+#     subset(rows)             → rows 위치 장소만 담은 scorer (사분면 shard 용, 사전/idf 공유)
+#     incremental              → 사전/idf 를 그대로 두고 장소 행만 바꿀 수 있는지 (카탈로그 부분 갱신)
+# - TfidfScorer: 기존 TF-IDF 코사인 (linear_kernel) + 태그 점수 행렬 (기본값)
+# - BM25Scorer : 짧은 문서(태그 + 한 줄 설명)에 맞게 문서 길이를 보정하는 BM25
+#     장소 × 단어 impact 를 인덱스 만들 때 미리 계산해서 단어별 스케일로
+#     uint8 양자화 → 요청 시에는 쿼리 단어 열만 골라 더하면 됨
+# - JEJU_SCORER=tfidf | bm25 로 배포마다 선택
+# ================================================
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.metrics.pairwise import linear_kernel
+
+from tag_matrix import TagScoreMatrix
+
+# search_text 토큰 규칙 (한 글자 단어도 유지)
+TOKEN_PATTERN = r"(?u)\b\w+\b"
+
+SCORERS = ("tfidf", "bm25")
+
+
+def sparse_nbytes(matrix) -> int:
+    return int(matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes)
+
+
+class Scorer:
+    name = ""
+    # 장소 행만 다시 계산해서 바꿀 수 있는지 (transform_rows / with_rows / stack)
+    incremental = False
+
+    def score(self, query_text: str, rows: Optional[List[int]] = None) -> np.ndarray:
+        """rows 위치 장소들의 점수 (rows 순서, float64)"""
+        raise NotImplementedError
+
+    def subset(self, rows) -> "Scorer":
+        raise NotImplementedError
+
+    def score_tags(self, tags: Iterable[str]) -> Optional[np.ndarray]:
+        """태그 전용 쿼리의 전체 장소 점수 (미리 계산한 표가 없으면 None → score 사용)"""
+        return None
+
+    @property
+    def vocabulary_size(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def nbytes(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def signature(self) -> str:
+        """점수에 영향을 주는 설정 (ETag / 캐시 key 에 같이 넣음)"""
+        return self.name
+
+    def describe(self) -> Dict[str, object]:
+        return {"name": self.name, "vocabulary": self.vocabulary_size, "bytes": self.nbytes}
+
+
+# ------------------------------------------------
+# 1. TF-IDF 코사인
+# ------------------------------------------------
+
+class TfidfScorer(Scorer):
+    name = "tfidf"
+    # 문서 벡터는 행마다 독립 (l2 정규화) → 사전/idf 가 같으면 바뀐 장소만 transform 하면 됨
+    incremental = True
+
+    def __init__(self, texts, tag_texts: Dict[str, str]):
+        """
+        texts     : 장소별 search_text
+        tag_texts : 태그 → 쿼리에 들어가는 문구 (태그 전용 요청용 점수 행렬)
+        """
+        # float32 로 학습 (유사도 순위는 float64 와 동일, 행렬 크기는 절반)
+        self.vectorizer = TfidfVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.float32)
+        self.matrix = self.vectorizer.fit_transform(texts)
+        self.tag_scores = TagScoreMatrix(self.vectorizer, self.matrix, tag_texts)
+
+    def score(self, query_text: str, rows: Optional[List[int]] = None) -> np.ndarray:
+        query_vec = self.vectorizer.transform([query_text])
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        return linear_kernel(query_vec, matrix).flatten()
+
+    def subset(self, rows) -> "TfidfScorer":
+        return self.with_rows(self.matrix[rows], self.tag_scores.scores[rows])
+
+    def transform_rows(self, texts) -> Tuple[sp.csr_matrix, np.ndarray]:
+        """지금 사전/idf 로 만든 장소 벡터 + 태그 점수 행 (사전에 없는 단어는 빠짐)"""
+        matrix = self.vectorizer.transform(texts)
+        return matrix, self.tag_scores.score_rows(matrix)
+
+    def with_rows(self, matrix, tag_scores: np.ndarray) -> "TfidfScorer":
+        """사전/idf / 태그 쿼리 벡터는 공유하고 장소 행만 바꾼 scorer"""
+        other = TfidfScorer.__new__(TfidfScorer)
+        other.vectorizer = self.vectorizer
+        other.matrix = sp.csr_matrix(matrix)
+        other.tag_scores = self.tag_scores.with_scores(tag_scores)
+        return other
+
+    @staticmethod
+    def stack(parts: List["TfidfScorer"]) -> "TfidfScorer":
+        """같은 사전으로 만든 scorer 들의 행을 순서대로 이어 붙임"""
+        return parts[0].with_rows(
+            sp.vstack([p.matrix for p in parts], format="csr"),
+            np.vstack([p.tag_scores.scores for p in parts]),
+        )
+
+    def score_tags(self, tags: Iterable[str]) -> Optional[np.ndarray]:
+        return self.tag_scores.score(tags)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.vectorizer.vocabulary_)
+
+    @property
+    def nbytes(self) -> int:
+        return sparse_nbytes(self.matrix) + int(self.vectorizer.idf_.nbytes) + self.tag_scores.nbytes
+
+
+# ------------------------------------------------
+# 2. BM25 (impact 미리 계산 + 8비트 양자화)
+# ------------------------------------------------
+
+def bm25_impacts(counts: sp.csc_matrix, k1: float, b: float):
+    """단어 빈도 행렬(CSC) → (float64 impact 행렬(CSC), 평균 문서 길이)"""
+    n_docs = counts.shape[0]
+    doc_len = np.asarray(counts.sum(axis=1)).ravel().astype(np.float64)
+    avg_len = float(doc_len.mean()) if n_docs and doc_len.mean() > 0 else 1.0
+    doc_freq = np.diff(counts.indptr)
+    idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    # nnz 단위로 계산 (CSC 라 data 는 단어 열 순서)
+    tf = counts.data.astype(np.float64)
+    term_of = np.repeat(np.arange(counts.shape[1]), doc_freq)
+    norm = k1 * (1.0 - b + b * doc_len[counts.indices] / avg_len)
+    impact = idf[term_of] * tf * (k1 + 1.0) / (tf + norm)
+    return sp.csc_matrix((impact, counts.indices.copy(), counts.indptr.copy()), shape=counts.shape), avg_len
+
+
+class BM25Scorer(Scorer):
+    """
+    impact[d, t] = idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(d) / avg_len))
+    idf(t)       = log(1 + (N - df + 0.5) / (df + 0.5))
+    score(d, q)  = Σ_t qtf(t) * impact[d, t]
+
+    impact 는 단어(열)마다 최대값을 255 로 맞춰 uint8 로 저장 (scale[t] = 최대값 / 255)
+    → 열 안에서의 상대 오차는 최대 1/510, 0 이 아닌 impact 는 최소 1 로 남김
+    단어 열 단위로 꺼내 쓰도록 CSC (단어별 posting list) 로 보관
+    """
+
+    name = "bm25"
+
+    def __init__(self, texts, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vectorizer = CountVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.int32)
+        counts = self.vectorizer.fit_transform(texts).tocsc()
+        counts.sort_indices()
+        self._analyzer = self.vectorizer.build_analyzer()
+
+        impacts, avg_len = bm25_impacts(counts, k1, b)
+        term_of = np.repeat(np.arange(impacts.shape[1]), np.diff(impacts.indptr))
+
+        col_max = np.zeros(impacts.shape[1], dtype=np.float64)
+        np.maximum.at(col_max, term_of, impacts.data)
+        self.scale = (col_max / 255.0).astype(np.float32)
+        safe_scale = np.where(self.scale > 0, self.scale, 1.0).astype(np.float64)
+        quantized = np.clip(np.rint(impacts.data / safe_scale[term_of]), 1, 255).astype(np.uint8)
+
+        self.impacts = sp.csc_matrix((quantized, impacts.indices, impacts.indptr), shape=impacts.shape)
+        self.avg_len = avg_len
+
+    def query_terms(self, query_text: str) -> Dict[int, int]:
+        """쿼리 문구 → {단어 열: 등장 횟수} (사전에 없는 단어는 무시)"""
+        vocab = self.vectorizer.vocabulary_
+        terms: Dict[int, int] = {}
+        for token in self._analyzer(query_text):
+            j = vocab.get(token)
+            if j is not None:
+                terms[j] = terms.get(j, 0) + 1
+        return terms
+
+    def score_all(self, query_text: str) -> np.ndarray:
+        """전체 장소 점수 (float64)"""
+        terms = self.query_terms(query_text)
+        if not terms:
+            return np.zeros(self.impacts.shape[0], dtype=np.float64)
+        cols = np.fromiter(terms.keys(), dtype=np.int64, count=len(terms))
+        weights = np.fromiter(terms.values(), dtype=np.float64, count=len(terms)) * self.scale[cols]
+        return self.impacts[:, cols] @ weights
+
+    def score(self, query_text: str, rows: Optional[List[int]] = None) -> np.ndarray:
+        scores = self.score_all(query_text)
+        return scores if rows is None else scores[rows]
+
+    def subset(self, rows) -> "BM25Scorer":
+        # 문서 길이 / idf 는 전체 카탈로그 기준 그대로 (shard 로 나눠도 점수가 같도록)
+        sub = BM25Scorer.__new__(BM25Scorer)
+        sub.__dict__.update(self.__dict__)
+        sub.impacts = self.impacts[rows]
+        return sub
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.vectorizer.vocabulary_)
+
+    @property
+    def nbytes(self) -> int:
+        return sparse_nbytes(self.impacts) + int(self.scale.nbytes)
+
+    @property
+    def signature(self) -> str:
+        return f"{self.name}:k1={self.k1:g}:b={self.b:g}"
+
+    def describe(self) -> Dict[str, object]:
+        return dict(super().describe(), k1=self.k1, b=self.b)
+
+
+def build_scorer(name: str, texts, tag_texts: Dict[str, str], k1: float = 1.2, b: float = 0.75) -> Scorer:
+    if name == "bm25":
+        return BM25Scorer(texts, k1=k1, b=b)
+    if name == "tfidf":
+        return TfidfScorer(texts, tag_texts)
+    raise ValueError(f"알 수 없는 scorer: {name!r} (가능: {', '.join(SCORERS)})")
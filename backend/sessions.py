@@ -0,0 +1,146 @@
+# sessions.py
+# ================================================
+# /chat 대화 세션 저장소 (메모리)
+# - 클라이언트가 보낸 session_id 로 이전 턴의 파싱 결과 + 카테고리별 랭킹 + 코스를 보관
+#   → "숙소만 바꿔줘", "하루 더" 같은 후속 요청은 다시 점수 계산하지 않고 처리
+# - TTL 이 지난 세션은 만료, 세션 수 / 전체 바이트가 한도를 넘으면 LRU 로 제거
+# ================================================
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from warmup import CompactRanking
+
+# 세션 하나의 고정 오버헤드 / 코스 한 칸당 대략적인 크기 (바이트)
+SESSION_OVERHEAD_BYTES = 1024
+RECORD_BYTES = 512
+
+
+class ChatSession:
+    def __init__(
+        self,
+        session_id: str,
+        ctx: Dict[str, object],
+        message: str,
+        compact: "CompactRanking",
+        depth: int,
+        records: List[Dict[str, object]],
+        index_version: str = "",
+    ):
+        self.session_id = session_id
+        self.ctx = ctx                # parse_chat_message 결과
+        self.message = message        # 랭킹에 쓴 원래 문장 (freeText)
+        self.compact = compact        # 카테고리 → (orig_idx, similarity) 배열
+        self.depth = depth            # compact 에 사분면별로 보관한 후보 수
+        self.records = records        # 현재 코스 (assemble_itinerary 행 목록)
+        self.index_version = index_version  # compact / records 의 행 위치가 가리키는 인덱스 버전
+        self.excluded: set = set()    # 교체되어 다시 추천하지 않을 후보
+        self.turns = 1
+        self.lock = threading.Lock()  # 같은 세션 동시 요청 직렬화
+        self.nbytes = 0
+        self.resize()
+
+    def resize(self) -> int:
+        """대략적인 메모리 사용량 다시 계산 (랭킹 배열 + 코스 + 고정 오버헤드)"""
+        arrays = sum(idx.nbytes + sim.nbytes for idx, sim in self.compact.values())
+        self.nbytes = (
+            SESSION_OVERHEAD_BYTES
+            + arrays
+            + RECORD_BYTES * len(self.records)
+            + 8 * len(self.excluded)
+            + len(self.message.encode("utf-8"))
+        )
+        return self.nbytes
+
+
+class SessionStore:
+    def __init__(self, max_sessions: int, max_bytes: int, ttl_sec: float):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._bytes = 0
+
+        # 통계
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+        self._follow_ups = 0
+
+    def _drop_locked(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._last_used.pop(session_id, None)
+        self._bytes -= session.nbytes
+
+    def _expire_locked(self, now: float) -> None:
+        # OrderedDict 가 마지막 사용 순이라 앞에서부터 만료 확인
+        while self._sessions:
+            oldest = next(iter(self._sessions))
+            if now - self._last_used[oldest] <= self.ttl_sec:
+                break
+            self._drop_locked(oldest)
+            self._expired += 1
+
+    def _evict_locked(self) -> None:
+        while self._sessions and (
+            len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes
+        ):
+            self._drop_locked(next(iter(self._sessions)))
+            self._evicted += 1
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire_locked(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                self._misses += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self._last_used[session_id] = now
+            self._hits += 1
+            return session
+
+    def put(self, session: ChatSession) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if session.session_id in self._sessions:
+                self._drop_locked(session.session_id)
+            self._sessions[session.session_id] = session
+            self._last_used[session.session_id] = now
+            self._bytes += session.nbytes
+            self._expire_locked(now)
+            self._evict_locked()
+
+    def touch(self, session: ChatSession) -> None:
+        """후속 요청으로 세션 내용이 바뀐 뒤 크기 다시 반영"""
+        with self._lock:
+            self._follow_ups += 1
+            if self._sessions.get(session.session_id) is not session:
+                return
+            self._bytes -= session.nbytes
+            self._bytes += session.resize()
+            self._evict_locked()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            self._expire_locked(time.monotonic())
+            count = len(self._sessions)
+            return {
+                "sessions": count,
+                "max_sessions": self.max_sessions,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "avg_session_bytes": round(self._bytes / count) if count else 0,
+                "hits": self._hits,
+                "misses": self._misses,
+                "follow_ups": self._follow_ups,
+                "expired": self._expired,
+                "evicted": self._evicted,
+            }
@@ -0,0 +1,251 @@
+# settings.py
+# ================================================
+# 백엔드 런타임 설정 (환경변수 기반)
+# - 모든 값은 JEJU_ 접두사 환경변수로 덮어쓸 수 있음
+# - 예) JEJU_MAX_CONCURRENT=8 uvicorn main:app --port 8000
+# ================================================
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_choice(name: str, default: int, allowed: tuple) -> int:
+    """허용된 값이 아니면 default"""
+    value = _env_int(name, default)
+    return value if value in allowed else default
+
+
+# 거절(load shedding) 응답에 쓸 수 있는 상태 코드
+SHED_STATUS_CODES = (429, 503)
+
+
+@dataclass(frozen=True)
+class Settings:
+    # ------------------------------------------------
+    # 장소 카탈로그 (CSV / Parquet / Arrow IPC)
+    # ------------------------------------------------
+    catalog_path: str = str(BACKEND_DIR / "data" / "놀멍쉬멍 데이터.csv")
+
+    # ------------------------------------------------
+    # 추천 엔드포인트 동시성 제한 (admission control)
+    # ------------------------------------------------
+    # 동시에 추천 계산을 돌릴 수 있는 요청 수
+    # (sync 엔드포인트는 anyio 스레드풀(기본 40)에서 돌기 때문에
+    #  max_concurrent + max_queue 는 40보다 작게 두는 게 좋음)
+    max_concurrent: int = 4
+    # 슬롯을 기다릴 수 있는 최대 대기열 길이 (넘으면 바로 거절)
+    max_queue: int = 16
+    # 대기열에서 기다릴 수 있는 최대 시간(초)
+    queue_timeout_sec: float = 2.0
+    # 거절 응답 상태 코드 (503 또는 429, 다른 값이면 503)
+    shed_status_code: int = 503
+
+    # ------------------------------------------------
+    # 요청 deadline (X-Deadline-Ms 헤더)
+    # ------------------------------------------------
+    # 헤더가 없을 때 쓰는 응답 시간 예산 / 헤더로 요청할 수 있는 최대값 (ms)
+    # 시간이 모자라면 저장된 랭킹 → 태그만 계산 → 사분면 맞추기 생략 → 일수 줄이기 순으로 대체
+    deadline_default_ms: int = 5000
+    deadline_max_ms: int = 15000
+
+    # ------------------------------------------------
+    # 추천 결과 캐시 (result_cache.py)
+    # ------------------------------------------------
+    # 프로세스 안에 보관할 결과 수
+    result_cache_size: int = 1024
+    # 워커 / 서버끼리 공유하는 Redis 프로토콜 서버 (예: redis://127.0.0.1:6379/0, 빈 값이면 안 씀)
+    shared_cache_url: str = ""
+    # 공유 서버 읽기 timeout (ms). 넘으면 기다리지 않고 직접 계산
+    shared_cache_timeout_ms: int = 20
+    # 공유 서버에 저장한 결과 유지 시간(초)
+    shared_cache_ttl_sec: int = 3600
+
+    # ------------------------------------------------
+    # 추천 장소 조회 / 선택 이벤트 (POST /events) + 인기도
+    # ------------------------------------------------
+    # append-only 이벤트 로그 (JSON lines)
+    interaction_log_path: str = str(BACKEND_DIR / ".cache" / "interactions.log")
+    # 아직 안 쓴 이벤트 최대 수 (넘으면 버림) / 한 번에 쓰는 수 / 모으는 최대 시간(초)
+    interaction_queue_size: int = 10000
+    interaction_batch_size: int = 256
+    interaction_flush_interval_sec: float = 1.0
+    # 로그를 인기도로 다시 집계하는 주기(초)
+    popularity_fold_interval_sec: float = 300.0
+    # 랭킹 점수 = 유사도 + 인기도(0~1) × 가중치 (0 이면 인기도를 섞지 않음)
+    popularity_weight: float = 0.0
+
+    # ------------------------------------------------
+    # 시작 후 백그라운드 warm-up (태그 조합 미리 계산)
+    # ------------------------------------------------
+    warmup_enabled: bool = True
+    # 카테고리·사분면별로 보관할 상위 후보 수
+    # (days * (max_places_per_day + 2) 가 이 값 이하인 요청만 표를 사용)
+    warmup_top_k: int = 32
+
+    # ------------------------------------------------
+    # 검색 점수 계산기 (tfidf: TF-IDF 코사인, bm25: 8비트 양자화 BM25)
+    # ------------------------------------------------
+    scorer: str = "tfidf"
+    # BM25 파라미터 (k1: 단어 빈도 포화, b: 문서 길이 보정 정도)
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+
+    # ------------------------------------------------
+    # 코스 구성: 관광지 근처 맛집 / 숙소 (nearby.py)
+    # ------------------------------------------------
+    # 장소마다 보관할 가까운 맛집·숙소 수 (0 이면 끄고 사분면만 맞춤)
+    nearby_k: int = 16
+    # 이 거리(km) 안의 후보만 "근처"로 봄 (없으면 같은 사분면 → 유사도 순)
+    nearby_max_km: float = 10.0
+
+    # ------------------------------------------------
+    # 사분면 shard 병렬 계산
+    # ------------------------------------------------
+    # shard 를 동시에 계산할 스레드 수 (0 이면 min(shard 수, CPU 수))
+    shard_workers: int = 0
+    # 계산할 shard 의 장소 수 합이 이 값 이상일 때만 병렬 (작으면 스레드 전환 비용이 더 큼)
+    shard_parallel_min_rows: int = 20000
+
+    # ------------------------------------------------
+    # GET /recommend, GET /recommend_text (CDN / 브라우저 캐시용)
+    # ------------------------------------------------
+    # Cache-Control max-age (초). 결과는 요청 + 카탈로그 버전으로만 정해지므로
+    # 만료 후에도 ETag 가 같으면 304
+    recommend_max_age: int = 600
+
+    # ------------------------------------------------
+    # 장소 조회 API (GET /places)
+    # ------------------------------------------------
+    # Cache-Control max-age (초). 만료 후에는 ETag 로 재검증 → 304
+    places_max_age: int = 300
+
+    # ------------------------------------------------
+    # 썸네일 이미지 (GET /images/{name})
+    # ------------------------------------------------
+    # 원본 이미지 폴더 (프론트 public/spotimage)
+    image_dir: str = str(BACKEND_DIR.parent / "public" / "spotimage")
+    # 리사이즈한 변형을 저장하는 디스크 캐시 폴더 / 최대 크기(MB)
+    image_cache_dir: str = str(BACKEND_DIR / ".cache" / "images")
+    image_cache_max_mb: int = 256
+    # 인코딩 품질 (JPEG / WebP)
+    image_quality: int = 80
+    # Cache-Control max-age (초, 기본 30일). 원본이 바뀌면 ETag 가 바뀜
+    image_max_age: int = 30 * 24 * 3600
+
+    # ------------------------------------------------
+    # /chat 대화 세션 (후속 요청용 랭킹 보관)
+    # ------------------------------------------------
+    # 마지막 요청 후 세션 유지 시간(초)
+    chat_session_ttl_sec: float = 1800.0
+    # 최대 세션 수 / 전체 메모리(MB). 넘으면 오래 안 쓴 세션부터 제거
+    chat_session_max: int = 2000
+    chat_session_max_mb: int = 64
+    # 카테고리·사분면별로 세션에 보관할 후보 수
+    chat_session_top_k: int = 32
+    # 코스 한 칸 교체(/recommend/replace)용으로 보관할 최근 랭킹 수
+    ranking_cache_size: int = 256
+
+    # ------------------------------------------------
+    # 디버그 엔드포인트 (/debug/memory 등) — 운영에서는 끔
+    # ------------------------------------------------
+    debug_endpoints: bool = False
+
+    # ------------------------------------------------
+    # 관리자: 카탈로그 부분 갱신 (POST /admin/catalog/refresh, ingest.py)
+    # ------------------------------------------------
+    # X-Admin-Token 헤더로 받을 값 (비어 있으면 관리자 엔드포인트 자체를 끔 → 404)
+    admin_token: str = ""
+    # 바뀐 장소 수 / 전체 장소 수가 이 비율을 넘으면 부분 갱신 대신 전체 다시 빌드
+    ingest_max_delta_ratio: float = 0.2
+
+    # ------------------------------------------------
+    # 여러 여행지 (?destination=, regions.py) — 기본 목적지(jeju) 외에는 처음 요청될 때 로드
+    # ------------------------------------------------
+    # 목적지 목록 JSON (비어 있으면 제주만)
+    regions_path: str = ""
+    # 기본 목적지 외에 메모리에 올려 둘 목적지 인덱스 크기 합(MB). 넘으면 오래 안 쓴 목적지부터 내림
+    region_memory_budget_mb: int = 512
+    # 인덱스를 만들다 실패한 목적지를 다시 만들어 보기까지 기다릴 시간(초)
+    region_load_retry_sec: float = 30.0
+
+
+def load_settings() -> Settings:
+    return Settings(
+        catalog_path=os.getenv("JEJU_CATALOG_PATH") or Settings.catalog_path,
+        max_concurrent=max(1, _env_int("JEJU_MAX_CONCURRENT", Settings.max_concurrent)),
+        max_queue=max(0, _env_int("JEJU_MAX_QUEUE", Settings.max_queue)),
+        queue_timeout_sec=max(0.0, _env_float("JEJU_QUEUE_TIMEOUT_SEC", Settings.queue_timeout_sec)),
+        shed_status_code=_env_choice("JEJU_SHED_STATUS_CODE", Settings.shed_status_code, SHED_STATUS_CODES),
+        deadline_default_ms=max(1, _env_int("JEJU_DEADLINE_DEFAULT_MS", Settings.deadline_default_ms)),
+        deadline_max_ms=max(1, _env_int("JEJU_DEADLINE_MAX_MS", Settings.deadline_max_ms)),
+        result_cache_size=max(1, _env_int("JEJU_RESULT_CACHE_SIZE", Settings.result_cache_size)),
+        shared_cache_url=(os.getenv("JEJU_SHARED_CACHE_URL") or Settings.shared_cache_url).strip(),
+        shared_cache_timeout_ms=max(1, _env_int("JEJU_SHARED_CACHE_TIMEOUT_MS", Settings.shared_cache_timeout_ms)),
+        shared_cache_ttl_sec=max(1, _env_int("JEJU_SHARED_CACHE_TTL_SEC", Settings.shared_cache_ttl_sec)),
+        interaction_log_path=os.getenv("JEJU_INTERACTION_LOG_PATH") or Settings.interaction_log_path,
+        interaction_queue_size=max(1, _env_int("JEJU_INTERACTION_QUEUE_SIZE", Settings.interaction_queue_size)),
+        interaction_batch_size=max(1, _env_int("JEJU_INTERACTION_BATCH_SIZE", Settings.interaction_batch_size)),
+        interaction_flush_interval_sec=max(0.0, _env_float("JEJU_INTERACTION_FLUSH_INTERVAL_SEC", Settings.interaction_flush_interval_sec)),
+        popularity_fold_interval_sec=max(1.0, _env_float("JEJU_POPULARITY_FOLD_INTERVAL_SEC", Settings.popularity_fold_interval_sec)),
+        popularity_weight=max(0.0, _env_float("JEJU_POPULARITY_WEIGHT", Settings.popularity_weight)),
+        warmup_enabled=_env_bool("JEJU_WARMUP", Settings.warmup_enabled),
+        warmup_top_k=max(1, _env_int("JEJU_WARMUP_TOP_K", Settings.warmup_top_k)),
+        scorer=(os.getenv("JEJU_SCORER") or Settings.scorer).strip().lower(),
+        bm25_k1=max(0.0, _env_float("JEJU_BM25_K1", Settings.bm25_k1)),
+        bm25_b=min(1.0, max(0.0, _env_float("JEJU_BM25_B", Settings.bm25_b))),
+        nearby_k=max(0, _env_int("JEJU_NEARBY_K", Settings.nearby_k)),
+        nearby_max_km=max(0.0, _env_float("JEJU_NEARBY_MAX_KM", Settings.nearby_max_km)),
+        shard_workers=max(0, _env_int("JEJU_SHARD_WORKERS", Settings.shard_workers)),
+        shard_parallel_min_rows=max(0, _env_int("JEJU_SHARD_PARALLEL_MIN_ROWS", Settings.shard_parallel_min_rows)),
+        recommend_max_age=max(0, _env_int("JEJU_RECOMMEND_MAX_AGE", Settings.recommend_max_age)),
+        places_max_age=max(0, _env_int("JEJU_PLACES_MAX_AGE", Settings.places_max_age)),
+        image_dir=os.getenv("JEJU_IMAGE_DIR") or Settings.image_dir,
+        image_cache_dir=os.getenv("JEJU_IMAGE_CACHE_DIR") or Settings.image_cache_dir,
+        image_cache_max_mb=max(1, _env_int("JEJU_IMAGE_CACHE_MAX_MB", Settings.image_cache_max_mb)),
+        image_quality=min(100, max(1, _env_int("JEJU_IMAGE_QUALITY", Settings.image_quality))),
+        image_max_age=max(0, _env_int("JEJU_IMAGE_MAX_AGE", Settings.image_max_age)),
+        chat_session_ttl_sec=max(1.0, _env_float("JEJU_CHAT_SESSION_TTL_SEC", Settings.chat_session_ttl_sec)),
+        chat_session_max=max(1, _env_int("JEJU_CHAT_SESSION_MAX", Settings.chat_session_max)),
+        chat_session_max_mb=max(1, _env_int("JEJU_CHAT_SESSION_MAX_MB", Settings.chat_session_max_mb)),
+        chat_session_top_k=max(1, _env_int("JEJU_CHAT_SESSION_TOP_K", Settings.chat_session_top_k)),
+        ranking_cache_size=max(1, _env_int("JEJU_RANKING_CACHE_SIZE", Settings.ranking_cache_size)),
+        debug_endpoints=_env_bool("JEJU_DEBUG_ENDPOINTS", Settings.debug_endpoints),
+        admin_token=os.getenv("JEJU_ADMIN_TOKEN") or Settings.admin_token,
+        ingest_max_delta_ratio=min(1.0, max(0.0, _env_float("JEJU_INGEST_MAX_DELTA_RATIO", Settings.ingest_max_delta_ratio))),
+        regions_path=os.getenv("JEJU_REGIONS_PATH") or Settings.regions_path,
+        region_memory_budget_mb=max(1, _env_int("JEJU_REGION_MEMORY_BUDGET_MB", Settings.region_memory_budget_mb)),
+        region_load_retry_sec=max(0.0, _env_float("JEJU_REGION_LOAD_RETRY_SEC", Settings.region_load_retry_sec)),
+    )
+
+
+settings = load_settings()
@@ -0,0 +1,282 @@
+# shards.py
+# ================================================
+# 사분면(subregion) 단위 shard + scatter-gather 점수 계산
+# - 추천 순위는 항상 "사분면 순서(지명 사전의 subregion_order) → 유사도" 라서
+#   사분면별 shard 에서 카테고리별 상위 k 개를 뽑아 사분면 순서대로 이어 붙이면
+#   전체를 한 번에 정렬한 결과와 같음
+# - 지역 필터가 있으면 해당 사분면 shard 만 계산
+# - 필터가 없는(또는 여러 shard 를 보는) 큰 카탈로그 요청은 shard 별로 스레드 풀에서
+#   동시에 계산 (scipy 희소 행렬 곱 / NumPy 연산은 GIL 을 놓음)
+# - shard 별 호출 수 / 시간을 /stats 의 "shards" 로 노출
+# - 인기도(popularity) 가중치를 켜면 shard 행 순서로 미리 곱해 둔 배열을 유사도에 더함
+# ================================================
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from scorers import Scorer
+
+# 카테고리 → (행 위치 int32, 유사도 float64)  ※ 사분면 → 유사도 순
+ShardRanking = Dict[str, Tuple[np.ndarray, np.ndarray]]
+
+CATEGORIES = ("place", "food", "stay")
+
+
+def top_k_order(positions: np.ndarray, sims: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """
+    유사도 내림차순(같으면 행 위치 오름차순) 상위 k 개의 인덱스
+    (pandas 안정 정렬과 같은 순서, k 번째와 동점인 후보까지 모아서 정렬)
+    """
+    n = len(sims)
+    if k is None or k >= n:
+        return np.lexsort((positions, -sims))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    kth = np.partition(-sims, k - 1)[k - 1]
+    cand = np.flatnonzero(-sims <= kth)
+    return cand[np.lexsort((positions[cand], -sims[cand]))][:k]
+
+
+class IndexShard:
+    def __init__(self, name: str, rows: np.ndarray, scorer: Scorer, category_codes: np.ndarray):
+        """
+        rows           : 이 shard 에 속한 전체 카탈로그 행 위치 (오름차순)
+        scorer         : rows 만 담은 scorer (Scorer.subset)
+        category_codes : rows 순서의 category_mapped 코드 (CATEGORIES 순서)
+        """
+        self.name = name
+        self.rows = rows.astype(np.int32)
+        self.scorer = scorer
+        # 유사도에 더할 값 (rows 순서, 인기도 × 가중치). None 이면 유사도만
+        self.boost: Optional[np.ndarray] = None
+        # 카테고리 → shard 안 위치
+        self.local_by_cat: Dict[str, np.ndarray] = {
+            cat: np.flatnonzero(category_codes == code).astype(np.int32)
+            for code, cat in enumerate(CATEGORIES)
+        }
+
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def rank(
+        self,
+        query_text: str,
+        tags: Optional[List[str]],
+        row_mask: Optional[np.ndarray],
+        top_k: Optional[int],
+    ) -> ShardRanking:
+        """
+        tags 가 주어지면 태그 점수 표(있으면) 사용, 아니면 query_text 로 점수 계산
+        row_mask: 전체 카탈로그 기준 bool 마스크 (주소 필터)
+        """
+        started = time.perf_counter()
+        sims = self.scorer.score_tags(tags) if tags is not None else None
+        if sims is None:
+            sims = self.scorer.score(query_text)
+        sims = sims.astype(np.float64, copy=False)
+        boost = self.boost
+        if boost is not None:
+            sims = sims + boost
+
+        keep = row_mask[self.rows] if row_mask is not None else None
+        result: ShardRanking = {}
+        for cat, local in self.local_by_cat.items():
+            if keep is not None:
+                local = local[keep[local]]
+            positions = self.rows[local]
+            cat_sims = sims[local]
+            order = top_k_order(positions, cat_sims, top_k)
+            result[cat] = (positions[order], cat_sims[order])
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._calls += 1
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.scorer.nbytes
+            + self.rows.nbytes
+            + (self.boost.nbytes if self.boost is not None else 0)
+            + sum(local.nbytes for local in self.local_by_cat.values())
+        )
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "rows": int(len(self.rows)),
+                "calls": self._calls,
+                "avg_ms": round(self._total_ms / self._calls, 4) if self._calls else None,
+                "max_ms": round(self._max_ms, 4),
+                "bytes": self.nbytes,
+            }
+
+
+class ShardedScorer(Scorer):
+    """
+    사분면 shard 묶음. Scorer 인터페이스(score / score_tags)도 그대로 제공하지만
+    추천 경로에서는 rank() 로 shard 별 상위 k 개만 모아서 씀
+    """
+
+    def __init__(
+        self,
+        base: Scorer,
+        shard_rows: Dict[str, np.ndarray],
+        category_codes: np.ndarray,
+        workers: int = 0,
+        parallel_min_rows: int = 20000,
+    ):
+        """
+        base           : 전체 카탈로그로 학습한 scorer (사전 / idf 기준, shard 로 나눈 뒤 버림)
+        shard_rows     : 사분면 이름 → 행 위치 (사분면 순서대로)
+        category_codes : 전체 행의 category_mapped 코드
+        workers        : 병렬 계산 스레드 수 (0 이면 min(shard 수, CPU 수))
+        """
+        self.name = base.name
+        self.incremental = base.incremental
+        self._signature = base.signature
+        self._boost_tag: Optional[str] = None
+        self.vectorizer = base.vectorizer
+        self.n_rows = int(len(category_codes))
+        self.shards: Dict[str, IndexShard] = {
+            name: IndexShard(name, rows, base.subset(rows), category_codes[rows])
+            for name, rows in shard_rows.items()
+            if len(rows)
+        }
+        self.workers = workers or min(len(self.shards), os.cpu_count() or 1)
+        self.parallel_min_rows = parallel_min_rows
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._parallel_calls = 0
+        self._serial_calls = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shard")
+            return self._pool
+
+    def set_boost(self, boost: Optional[np.ndarray], tag: Optional[str] = None) -> None:
+        """
+        전체 행 순서의 boost 를 shard 별로 나눠 둠 (None 이면 해제)
+        tag 는 signature 에 붙어서 HTTP ETag / 결과 캐시 key 가 바뀜
+        """
+        for shard in self.shards.values():
+            shard.boost = None if boost is None else boost[shard.rows].astype(np.float64)
+        self._boost_tag = None if boost is None else tag
+
+    def select(self, subregions: Optional[Iterable[str]]) -> List[IndexShard]:
+        """지역 필터가 고른 shard (사분면 순서 유지, 필터가 없으면 전체)"""
+        if not subregions:
+            return list(self.shards.values())
+        wanted = set(subregions)
+        return [shard for name, shard in self.shards.items() if name in wanted]
+
+    def rank(
+        self,
+        query_text: str,
+        tags: Optional[List[str]],
+        shards: List[IndexShard],
+        row_mask: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None,
+    ) -> ShardRanking:
+        """
+        scatter: shard 별로 카테고리별 상위 top_k 계산
+        gather : 사분면 순서대로 이어 붙임 (전체 순위 = 사분면 → 유사도)
+        """
+        total_rows = sum(len(shard.rows) for shard in shards)
+        if self.workers > 1 and len(shards) > 1 and total_rows >= self.parallel_min_rows:
+            pool = self._executor()
+            futures = [pool.submit(shard.rank, query_text, tags, row_mask, top_k) for shard in shards]
+            parts = [f.result() for f in futures]
+            parallel = True
+        else:
+            parts = [shard.rank(query_text, tags, row_mask, top_k) for shard in shards]
+            parallel = False
+        with self._pool_lock:
+            if parallel:
+                self._parallel_calls += 1
+            else:
+                self._serial_calls += 1
+
+        merged: ShardRanking = {}
+        for cat in CATEGORIES:
+            pieces = [part[cat] for part in parts]
+            if pieces:
+                merged[cat] = (
+                    np.concatenate([p for p, _ in pieces]),
+                    np.concatenate([s for _, s in pieces]),
+                )
+            else:
+                merged[cat] = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64))
+        return merged
+
+    def gather_rows(self) -> Scorer:
+        """
+        shard 로 나눈 행을 전체 행 순서로 다시 이어 붙인 scorer (카탈로그 부분 갱신용)
+        incremental scorer 만 가능
+        """
+        if not self.incremental:
+            raise NotImplementedError(f"{self.name} scorer 는 행 단위로 다시 합칠 수 없습니다.")
+        shards = list(self.shards.values())
+        rows = np.concatenate([shard.rows for shard in shards])
+        stacked = type(shards[0].scorer).stack([shard.scorer for shard in shards])
+        return stacked.subset(np.argsort(rows, kind="stable"))
+
+    # --- Scorer 인터페이스 (전체 장소 점수가 필요할 때) ---
+
+    def _gather(self, per_shard) -> np.ndarray:
+        scores = np.zeros(self.n_rows, dtype=np.float64)
+        for shard in self.shards.values():
+            scores[shard.rows] = per_shard(shard)
+        return scores
+
+    def score(self, query_text: str, rows: Optional[List[int]] = None) -> np.ndarray:
+        scores = self._gather(lambda shard: shard.scorer.score(query_text))
+        return scores if rows is None else scores[rows]
+
+    def score_tags(self, tags: Iterable[str]) -> Optional[np.ndarray]:
+        tags = list(tags)
+        parts = {name: shard.scorer.score_tags(tags) for name, shard in self.shards.items()}
+        if any(part is None for part in parts.values()):
+            return None
+        return self._gather(lambda shard: parts[shard.name])
+
+    @property
+    def signature(self) -> str:
+        if self._boost_tag is None:
+            return self._signature
+        return f"{self._signature}+{self._boost_tag}"
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.vectorizer.vocabulary_)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shard.nbytes for shard in self.shards.values())
+
+    def describe(self) -> Dict[str, object]:
+        return dict(super().describe(), shards={name: len(s.rows) for name, s in self.shards.items()})
+
+    def stats(self) -> Dict[str, object]:
+        with self._pool_lock:
+            parallel_calls, serial_calls = self._parallel_calls, self._serial_calls
+        return {
+            "scorer": self.name,
+            "workers": self.workers,
+            "parallel_min_rows": self.parallel_min_rows,
+            "parallel_calls": parallel_calls,
+            "serial_calls": serial_calls,
+            "shards": {name: shard.stats() for name, shard in self.shards.items()},
+        }
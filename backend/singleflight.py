@@ -0,0 +1,97 @@
+# singleflight.py
+# ================================================
+# 동일 요청 합치기 (single-flight)
+# - 같은 key 로 계산 중인 요청이 있으면 새 요청은 계산하지 않고 결과를 기다림
+# - 먼저 들어온 요청(leader)만 실제로 계산, 나머지(follower)는 같은 결과를 공유
+# - leader 에서 난 일반 예외는 follower 에게도 그대로 전달
+# - leader 가 취소(CancelledError, KeyboardInterrupt 등 BaseException)되면
+#   follower 는 취소된 게 아니므로 다시 시도해서 새 leader 가 됨
+# - follower 는 timeout(요청 deadline 까지 남은 시간)이 지나면 기다리지 않고 TimeoutError
+# ================================================
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "cancelled")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+        # 통계
+        self._leaders = 0
+        self._deduplicated = 0
+        self._errors = 0
+        self._cancelled = 0
+        self._timeouts = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        key 기준으로 fn() 을 한 번만 실행하고 결과를 공유
+        timeout: follower 가 leader 결과를 기다릴 최대 시간 (None 이면 끝까지)
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                    self._leaders += 1
+                    is_leader = True
+                else:
+                    self._deduplicated += 1
+                    is_leader = False
+
+            if is_leader:
+                return self._run_leader(key, call, fn)
+
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise TimeoutError("single-flight 결과 대기 시간 초과")
+            if call.cancelled:
+                # leader 만 취소된 것 → 이 요청은 다시 계산을 시도
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def _run_leader(self, key: Hashable, call: _Call, fn: Callable[[], Any]) -> Any:
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._errors += 1
+            raise
+        except BaseException:
+            call.cancelled = True
+            with self._lock:
+                self._cancelled += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self._leaders,
+                "deduplicated": self._deduplicated,
+                "leader_errors": self._errors,
+                "leader_cancelled": self._cancelled,
+                "follower_timeouts": self._timeouts,
+            }
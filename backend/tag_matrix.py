@@ -0,0 +1,93 @@
+# tag_matrix.py
+# ================================================
+# 태그 전용 쿼리용 장소 × 태그 점수 행렬
+# - freeText 없는 /recommend 요청은 쿼리 벡터가 "선택한 태그 + 확장 문구" 로만 결정됨
+# - TF-IDF 쿼리 벡터 = normalize(Σ_태그 count(태그 문구) * idf) 이므로
+#     cos(doc, q) = Σ_t S[doc, t] / sqrt(Σ_t Σ_t' G[t, t'])
+#       S[doc, t] = doc · (count_t * idf)   (장소 × 태그, float32)
+#       G[t, t']  = (count_t * idf) · (count_t' * idf)   (태그 × 태그)
+# - 요청 시에는 토크나이즈/transform 없이 열 합 + 정규화만 하면 됨
+# ================================================
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class TagScoreMatrix:
+    def __init__(self, vectorizer, tfidf_matrix, tag_texts: Dict[str, str]):
+        """
+        vectorizer   : fit 된 TfidfVectorizer (norm="l2", sublinear_tf=False 기준)
+        tfidf_matrix : vectorizer 로 만든 장소 × 단어 행렬
+        tag_texts    : 태그 → 쿼리에 들어가는 문구 (태그 + 확장 문구)
+        """
+        self.tags: List[str] = list(tag_texts)
+        self.col: Dict[str, int] = {t: i for i, t in enumerate(self.tags)}
+
+        analyzer = vectorizer.build_analyzer()
+        vocab = vectorizer.vocabulary_
+        idf = vectorizer.idf_
+
+        rows, cols, vals = [], [], []
+        for i, tag in enumerate(self.tags):
+            counts: Dict[int, int] = {}
+            for token in analyzer(tag_texts[tag]):
+                j = vocab.get(token)
+                if j is not None:
+                    counts[j] = counts.get(j, 0) + 1
+            for j, c in counts.items():
+                rows.append(i)
+                cols.append(j)
+                vals.append(c * idf[j])
+
+        # 태그별 (정규화 전) 쿼리 벡터: 태그 × 단어 (카탈로그 부분 갱신 때 새 행 점수 계산에 다시 씀)
+        self.weights = sp.csr_matrix(
+            (vals, (rows, cols)), shape=(len(self.tags), len(vocab)), dtype=np.float64
+        )
+
+        self.scores = self.score_rows(tfidf_matrix)
+        self.gram = np.asarray((self.weights @ self.weights.T).todense(), dtype=np.float64)
+
+    def score_rows(self, tfidf_matrix) -> np.ndarray:
+        """같은 vectorizer 로 만든 장소 행들의 태그 점수 (장소 × 태그, float32)"""
+        return np.asarray((tfidf_matrix @ self.weights.T).todense(), dtype=np.float32)
+
+    def with_scores(self, scores: np.ndarray) -> "TagScoreMatrix":
+        """장소 행만 scores 로 바꾼 행렬 (태그 목록 / 쿼리 벡터 / gram 은 공유)"""
+        other = TagScoreMatrix.__new__(TagScoreMatrix)
+        other.tags = self.tags
+        other.col = self.col
+        other.weights = self.weights
+        other.scores = np.ascontiguousarray(scores, dtype=np.float32)
+        other.gram = self.gram
+        return other
+
+    def subset(self, rows) -> "TagScoreMatrix":
+        """rows 위치 장소만 남긴 행렬 (태그 목록 / gram 은 공유)"""
+        return self.with_scores(self.scores[rows])
+
+    def covers(self, tags: Iterable[str]) -> bool:
+        return all(t in self.col for t in tags)
+
+    def score(self, tags: Iterable[str]) -> Optional[np.ndarray]:
+        """
+        선택한 태그 집합의 장소별 코사인 유사도 (float32).
+        표에 없는 태그가 있으면 None
+        """
+        cols = sorted({self.col[t] for t in tags if t in self.col})
+        if len(cols) != len(set(tags)):
+            return None
+        if not cols:
+            return np.zeros(self.scores.shape[0], dtype=np.float32)
+
+        norm_sq = float(self.gram[np.ix_(cols, cols)].sum())
+        if norm_sq <= 0.0:
+            return np.zeros(self.scores.shape[0], dtype=np.float32)
+
+        summed = self.scores[:, cols].sum(axis=1, dtype=np.float32)
+        return summed / np.float32(np.sqrt(norm_sq))
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.scores.nbytes + self.gram.nbytes)
@@ -0,0 +1,128 @@
+# tags.py
+# ================================================
+# 프론트 태그 정의 & 쿼리 확장 (src/data/tags.ts 와 맞춰서 관리)
+# - 추천 인덱스(recommender.py)와 파서/엔드포인트(main.py)가 같이 사용
+# - pandas 등 무거운 의존성 없이 import 가능해야 함
+# ================================================
+
+import re
+from typing import List, Tuple
+
+# ------------------------------------------------
+# 1. 프론트 태그 정의 & 확장 (TAGS / STAY_TAGS / FOOD_TAGS)
+# ------------------------------------------------
+
+BASE_TAGS = [
+    {"key": "휴식", "icon": "🧘"},
+    {"key": "친구들", "icon": "👫"},
+    {"key": "혼자", "icon": "🧭"},
+    {"key": "문화", "icon": "🏛️"},
+    {"key": "자연", "icon": "🏞️"},
+    {"key": "사진", "icon": "📷"},
+    {"key": "반려동물 동반", "icon": "🐶"},
+    {"key": "가족여행", "icon": "👨‍👩‍👧‍👦"},
+    {"key": "액티비티", "icon": "🎯"},
+    {"key": "더보기", "icon": "➕"},
+]
+
+STAY_TAGS = [
+    {"key": "럭셔리", "icon": "💎"},
+    {"key": "휴식", "icon": "🛌"},
+    {"key": "가족여행", "icon": "👨‍👩‍👧‍👦"},
+    {"key": "커플", "icon": "💑"},
+    {"key": "사진", "icon": "📷"},
+    {"key": "반려동물 동반", "icon": "🐶"},
+    {"key": "자연", "icon": "🏞️"},
+    {"key": "오션뷰", "icon": "🌊"},
+    {"key": "풀빌라", "icon": "🏊"},
+    {"key": "더보기", "icon": "➕"},
+]
+
+FOOD_TAGS = [
+    {"key": "흑돼지", "icon": "🐷"},
+    {"key": "고기국수", "icon": "🍜"},
+    {"key": "해장국", "icon": "🥣"},
+    {"key": "제주향토음식", "icon": "🍲"},
+    {"key": "해산물", "icon": "🐟"},
+    {"key": "한식", "icon": "🍱"},
+    {"key": "일식", "icon": "🍣"},
+    {"key": "중식", "icon": "🥡"},
+    {"key": "양식", "icon": "🍝"},
+    {"key": "더보기", "icon": "➕"},
+]
+
+# 추가 태그(내부용) - '맛집' 같은 것
+EXTRA_TAG_KEYS = [
+    "맛집",
+]
+
+ALL_TAG_KEYS = {t["key"] for t in (BASE_TAGS + STAY_TAGS + FOOD_TAGS)} | set(EXTRA_TAG_KEYS)
+
+TAG_TO_QUERY_EXPANSION = {
+    "휴식": "휴식 힐링 조용한 한적한 여유 카페",
+    "친구들": "친구 동행 단체 모임",
+    "혼자": "혼자 솔로 혼자여행 조용한",
+    "문화": "문화 전시 공연 역사 박물관 갤러리 체험",
+    "자연": "자연 숲 바다 산 오름 전망 풍경 해변 드라이브",
+    "사진": "사진 포토 포토스팟 인생샷 뷰 전망 야경",
+    "반려동물 동반": "반려동물 반려견 애견 동물 동반",
+    "가족여행": "가족 가족여행 아이 어린이 키즈",
+    "액티비티": "액티비티 체험 레저 서핑 승마 카약",
+    "럭셔리": "럭셔리 고급 프리미엄 스파",
+    "커플": "커플 연인 로맨틱 데이트 감성",
+    "오션뷰": "오션뷰 바다뷰 바다전망 해변 해안",
+    "풀빌라": "풀빌라 수영장 프라이빗 독채",
+    "흑돼지": "흑돼지 고기 삼겹살 구이",
+    "고기국수": "고기국수 국수 국밥",
+    "해장국": "해장국 국밥",
+    "제주향토음식": "향토음식 제주음식 토속음식",
+    "해산물": "해산물 회 해물 생선 조개",
+    "한식": "한식 백반 식당",
+    "일식": "일식 초밥 스시",
+    "중식": "중식 중국집 짜장 짬뽕",
+    "양식": "양식 파스타 피자 스테이크",
+    "맛집": "맛집 음식점 식당 카페 로컬 맛집",
+}
+
+def extract_tags_from_free_text(free_text: str) -> List[str]:
+    if not free_text:
+        return []
+    tokens = re.split(r"[\s,]+", free_text.strip())
+    extra_tags = set()
+    for token in tokens:
+        if not token:
+            continue
+        for tag in ALL_TAG_KEYS:
+            if tag in token or token in tag:
+                extra_tags.add(tag)
+    return list(extra_tags)
+
+def build_query_from_tags(selected_tags: List[str], free_text: str = "") -> Tuple[str, List[str]]:
+    extra_tags = extract_tags_from_free_text(free_text)
+    merged_tags = list(set(selected_tags) | set(extra_tags))
+
+    tokens: List[str] = []
+    for tag in merged_tags:
+        t = tag.strip()
+        if not t:
+            continue
+        tokens.append(t)
+        if t in TAG_TO_QUERY_EXPANSION:
+            tokens.append(TAG_TO_QUERY_EXPANSION[t])
+
+    if free_text:
+        tokens.append(free_text)
+
+    query_text = " ".join(tokens)
+    return query_text, merged_tags
+
+# ------------------------------------------------
+# 2. 카테고리 라벨
+# ------------------------------------------------
+
+# ✅ 사람 읽기용 카테고리 라벨 (이 부분이 새로 들어간 부분)
+CATEGORY_LABEL = {
+    "place": "관광",
+    "food": "식사",
+    "stay": "숙소",
+}
@@ -0,0 +1,28 @@
+# conftest.py
+# ================================================
+# backend 모듈은 패키지가 아니라 평평한 파일이라 (import admission 등)
+# 테스트에서도 그대로 import 할 수 있게 backend 디렉터리를 sys.path 앞에 넣음
+#   cd backend && python -m pytest -q
+# ================================================
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def wait_until():
+    """조건이 참이 될 때까지 잠깐씩 기다림 (스레드가 대기열에 들어갔는지 등, 시간 초과면 실패)"""
+
+    def wait(predicate, timeout: float = 2.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                pytest.fail("조건이 제때 만족되지 않았어요")
+            time.sleep(0.005)
+
+    return wait
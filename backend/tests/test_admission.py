@@ -0,0 +1,149 @@
+# test_admission.py
+# ================================================
+# admission.AdmissionController
+# - 대기열이 꽉 참 / 대기 시간 초과 / deadline 거절
+# - FIFO: 먼저 줄 선 요청부터 슬롯을 받고, 대기 요청이 있으면 새 요청이 끼어들지 못함
+# - 거절 상태 코드(JEJU_SHED_STATUS_CODE)는 429 / 503 만
+# ================================================
+
+import threading
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+from settings import load_settings
+
+
+class Holder:
+    """다른 스레드에서 슬롯을 잡고 release() 할 때까지 놓지 않음"""
+
+    def __init__(self, controller: AdmissionController, max_wait_sec=None, on_enter=None):
+        self.controller = controller
+        self.max_wait_sec = max_wait_sec
+        self.on_enter = on_enter
+        self.entered = threading.Event()
+        self.error = None
+        self._release = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            with self.controller.slot(self.max_wait_sec):
+                if self.on_enter is not None:
+                    self.on_enter()
+                self.entered.set()
+                self._release.wait(5)
+        except AdmissionRejected as e:
+            self.error = e
+
+    def release(self):
+        self._release.set()
+        self.thread.join(5)
+
+
+def test_queue_full_rejected_immediately():
+    controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout_sec=5)
+    holder = Holder(controller)
+    assert holder.entered.wait(2)
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with controller.slot():
+            pass
+    assert exc.value.reason == "queue_full"
+    assert exc.value.status_code == 503
+    assert exc.value.retry_after >= 1
+
+    holder.release()
+    stats = controller.stats()
+    assert stats["rejected_queue_full"] == 1
+    assert stats["active"] == 0
+
+
+def test_queue_timeout():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_sec=0.05)
+    holder = Holder(controller)
+    assert holder.entered.wait(2)
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with controller.slot():
+            pass
+    assert exc.value.reason == "queue_timeout"
+
+    holder.release()
+    stats = controller.stats()
+    assert stats["rejected_timeout"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["active"] == 0
+
+
+def test_deadline_shorter_than_queue_timeout():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_sec=5)
+    holder = Holder(controller)
+    assert holder.entered.wait(2)
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with controller.slot(max_wait_sec=0.05):
+            pass
+    assert exc.value.reason == "deadline"
+
+    holder.release()
+    stats = controller.stats()
+    assert stats["rejected_deadline"] == 1
+    assert stats["rejected_timeout"] == 0
+
+
+def test_waiters_admitted_in_fifo_order(wait_until):
+    controller = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout_sec=5)
+    first = Holder(controller)
+    assert first.entered.wait(2)
+
+    order = []
+    waiters = []
+    for i in range(4):
+        waiters.append(Holder(controller, on_enter=lambda i=i: order.append(i)))
+        # 줄 선 순서를 고정하려고 하나씩 대기열에 들어간 걸 확인하고 다음 요청
+        wait_until(lambda n=i + 1: controller.stats()["queue_depth"] == n)
+
+    first.release()
+    for waiter in waiters:
+        assert waiter.entered.wait(2)
+        waiter.release()
+
+    assert order == [0, 1, 2, 3]
+    assert all(w.error is None for w in waiters)
+    assert controller.stats()["admitted"] == 5
+
+
+def test_released_slot_goes_to_waiter_not_newcomer(wait_until):
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_sec=5)
+    holder = Holder(controller)
+    assert holder.entered.wait(2)
+    waiter = Holder(controller)
+    wait_until(lambda: controller.stats()["queue_depth"] == 1)
+
+    # 반납하는 순간 슬롯은 대기 요청에게 넘어감 → 새 요청은 빈 슬롯을 못 가져가고 줄을 섬
+    holder.release()
+    assert waiter.entered.wait(2)
+    stats = controller.stats()
+    assert stats["active"] == 1
+    assert stats["queue_depth"] == 0
+
+    # 대기열이 비었으므로 queue_full 이 아니라 줄을 서서 기다림
+    newcomer = Holder(controller)
+    wait_until(lambda: controller.stats()["queue_depth"] == 1)
+    assert not newcomer.entered.is_set()
+
+    waiter.release()
+    assert newcomer.entered.wait(2)
+    newcomer.release()
+    stats = controller.stats()
+    assert stats["rejected_total"] == 0
+    assert stats["admitted"] == 3
+    assert stats["active"] == 0
+
+
+@pytest.mark.parametrize("raw, expected", [("429", 429), ("503", 503), ("200", 503), ("500", 503), ("abc", 503)])
+def test_shed_status_code_limited_to_429_or_503(monkeypatch, raw, expected):
+    monkeypatch.setenv("JEJU_SHED_STATUS_CODE", raw)
+    assert load_settings().shed_status_code == expected
@@ -0,0 +1,154 @@
+# test_result_cache.py
+# ================================================
+# result_cache 공유 서버 단계 (resp_server.start_background 로 로컬에서 띄움)
+# - 느린 서버(timeout) / 죽은 서버(연결 실패)는 None → 요청은 로컬 계산으로
+# - 연속 실패면 breaker open → 시간이 지나면 half_open 시험 호출 (성공 closed / 실패 다시 open)
+# - 형식 범위를 벗어나거나 encode 가 실패해도 공유 서버 쓰기만 건너뜀
+# ================================================
+
+import time
+
+import pytest
+
+import resp_server
+from result_cache import (
+    CircuitBreaker,
+    LocalLRU,
+    ResultCache,
+    RespClient,
+    SharedTier,
+    decode_items,
+    encode_items,
+)
+
+ITEMS = [(1, 1, 0, 10, 0.9), (1, 2, 1, 42, 0.5)]
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(delay_ms: float = 0.0):
+        server = resp_server.start_background(delay_ms=delay_ms)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def dead_url() -> str:
+    """방금 닫은 서버 주소 (연결 거부)"""
+    server = resp_server.start_background()
+    url = server.url
+    server.shutdown()
+    server.server_close()
+    return url
+
+
+def test_roundtrip_through_shared_tier(start_server):
+    server = start_server()
+    shared = SharedTier(RespClient(server.url, timeout_sec=1.0), ttl_sec=60)
+    ResultCache(LocalLRU(8), shared).put("k", ITEMS, encode_items)
+    assert shared.flush(2.0)
+
+    # 다른 워커 (로컬 LRU 는 비어 있음)
+    other = ResultCache(LocalLRU(8), SharedTier(RespClient(server.url, timeout_sec=1.0), ttl_sec=60))
+    assert other.get("k", decode_items) == ITEMS
+    assert other.stats()["shared_hits"] == 1
+
+
+def test_slow_server_times_out_as_miss(start_server):
+    server = start_server(delay_ms=300)
+    shared = SharedTier(RespClient(server.url, timeout_sec=0.02), ttl_sec=60)
+
+    started = time.perf_counter()
+    assert shared.get("k") is None
+    assert time.perf_counter() - started < 0.25
+    stats = shared.stats()
+    assert stats["errors"] == 1
+    assert stats["hits"] == 0
+
+
+def test_outage_is_a_miss():
+    cache = ResultCache(LocalLRU(8), SharedTier(RespClient(dead_url(), timeout_sec=0.05), ttl_sec=60))
+    assert cache.get("k", decode_items) is None
+    assert cache.shared.stats()["errors"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_breaker_opens_after_consecutive_failures(start_server):
+    server = start_server(delay_ms=300)
+    breaker = CircuitBreaker(failure_threshold=3, reset_after_sec=60)
+    shared = SharedTier(RespClient(server.url, timeout_sec=0.02), ttl_sec=60, breaker=breaker)
+
+    for _ in range(3):
+        assert shared.get("k") is None
+    assert breaker.stats()["state"] == "open"
+
+    # open 동안은 서버에 묻지 않고 바로 None
+    started = time.perf_counter()
+    assert shared.get("k") is None
+    assert time.perf_counter() - started < 0.01
+    stats = shared.stats()
+    assert stats["errors"] == 3
+    assert stats["skipped_open"] == 1
+
+
+def test_breaker_half_open_success_closes(start_server):
+    server = start_server(delay_ms=300)
+    breaker = CircuitBreaker(failure_threshold=1, reset_after_sec=0.05)
+    shared = SharedTier(RespClient(server.url, timeout_sec=0.02), ttl_sec=60, breaker=breaker)
+
+    assert shared.get("k") is None
+    assert breaker.stats()["state"] == "open"
+
+    # 서버가 다시 빨라짐 → reset 시간이 지나면 시험 호출 한 번이 성공해서 closed
+    server.delay_sec = 0.0
+    time.sleep(0.06)
+    assert shared.get("k") is None  # miss 지만 응답은 받음
+    assert breaker.stats() == {"state": "closed", "consecutive_failures": 0, "opens": 1}
+    assert shared.stats()["misses"] == 1
+
+
+def test_breaker_half_open_failure_reopens(start_server):
+    server = start_server(delay_ms=300)
+    breaker = CircuitBreaker(failure_threshold=1, reset_after_sec=0.05)
+    shared = SharedTier(RespClient(server.url, timeout_sec=0.02), ttl_sec=60, breaker=breaker)
+
+    assert shared.get("k") is None
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.stats()["state"] == "half_open"
+
+    # 시험 호출도 실패 → 다시 open (다음 시험까지 또 기다림)
+    breaker.record_failure()
+    assert breaker.stats()["state"] == "open"
+    assert breaker.stats()["opens"] == 2
+    assert shared.get("k") is None
+    assert shared.stats()["skipped_open"] == 1
+
+
+def test_out_of_range_items_skip_shared_write(start_server):
+    server = start_server()
+    shared = SharedTier(RespClient(server.url, timeout_sec=1.0), ttl_sec=60)
+    cache = ResultCache(LocalLRU(8), shared)
+
+    too_many_days = [(256, 1, 0, 10, 0.9)]
+    assert encode_items(too_many_days) is None
+    cache.put("days", too_many_days, encode_items)
+
+    def broken(_value):
+        raise TypeError("not encodable")
+
+    cache.put("broken", ITEMS, broken)
+    assert shared.flush(2.0)
+
+    # 응답(로컬 LRU)에는 그대로, 공유 서버에는 안 씀
+    assert cache.get("days", decode_items) == too_many_days
+    assert cache.get("broken", decode_items) == ITEMS
+    assert shared.stats()["writes"] == 0
+    assert cache.stats()["encode_errors"] == 1
+    assert server.store.size(0) == 0
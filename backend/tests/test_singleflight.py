@@ -0,0 +1,157 @@
+# test_singleflight.py
+# ================================================
+# singleflight.SingleFlight
+# - leader 예외는 follower 에게도 그대로 전달
+# - leader 가 취소되면 follower 는 취소를 보지 않고 직접 다시 계산
+# - follower 는 timeout 이 지나면 TimeoutError (leader 는 계속 계산)
+# ================================================
+
+import asyncio
+import threading
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def start_leader(flight: SingleFlight, key, fn):
+    """다른 스레드에서 leader 로 fn 실행 → (스레드, 결과/예외 담을 dict)"""
+    out = {}
+
+    def run():
+        try:
+            out["result"] = flight.do(key, fn)
+        except BaseException as e:
+            out["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, out
+
+
+def test_followers_share_leader_result(wait_until):
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(2)
+        return "course"
+
+    thread, out = start_leader(flight, "k", compute)
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+
+    follower_out = {}
+    follower = threading.Thread(target=lambda: follower_out.update(result=flight.do("k", compute)), daemon=True)
+    follower.start()
+    wait_until(lambda: flight.stats()["deduplicated"] == 1)
+    release.set()
+    thread.join(2)
+    follower.join(2)
+
+    assert out["result"] == "course"
+    assert follower_out["result"] == "course"
+    assert len(calls) == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_leader_exception_propagates_to_follower(wait_until):
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(2)
+        raise ValueError("boom")
+
+    thread, out = start_leader(flight, "k", compute)
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+
+    follower_out = {}
+
+    def follow():
+        try:
+            flight.do("k", lambda: "never")
+        except ValueError as e:
+            follower_out["error"] = e
+
+    follower = threading.Thread(target=follow, daemon=True)
+    follower.start()
+    wait_until(lambda: flight.stats()["deduplicated"] == 1)
+    release.set()
+    thread.join(2)
+    follower.join(2)
+
+    assert isinstance(out["error"], ValueError)
+    assert follower_out["error"] is out["error"]
+    stats = flight.stats()
+    assert stats["leader_errors"] == 1
+    assert stats["in_flight"] == 0
+
+    # 실패한 key 는 남지 않으므로 다음 요청은 새 leader 로 다시 계산
+    assert flight.do("k", lambda: "retry") == "retry"
+
+
+def test_follower_timeout(wait_until):
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(2)
+        return "slow"
+
+    thread, out = start_leader(flight, "k", compute)
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+
+    with pytest.raises(TimeoutError):
+        flight.do("k", lambda: "never", timeout=0.05)
+    assert flight.stats()["follower_timeouts"] == 1
+
+    # follower 가 포기해도 leader 는 끝까지 계산
+    release.set()
+    thread.join(2)
+    assert out["result"] == "slow"
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_leader_lets_follower_recompute(wait_until):
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def cancelled():
+        release.wait(2)
+        raise asyncio.CancelledError()
+
+    thread, out = start_leader(flight, "k", cancelled)
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+
+    follower_calls = []
+    follower_out = {}
+
+    def follow():
+        def compute():
+            follower_calls.append(1)
+            return "own"
+
+        try:
+            follower_out["result"] = flight.do("k", compute)
+        except BaseException as e:
+            follower_out["error"] = e
+
+    follower = threading.Thread(target=follow, daemon=True)
+    follower.start()
+    wait_until(lambda: flight.stats()["deduplicated"] == 1)
+    release.set()
+    thread.join(2)
+    follower.join(2)
+
+    assert isinstance(out["error"], asyncio.CancelledError)
+    # follower 는 취소를 전달받지 않고 새 leader 로 자기 fn 을 실행
+    assert "error" not in follower_out
+    assert follower_out["result"] == "own"
+    assert follower_calls == [1]
+    stats = flight.stats()
+    assert stats["leader_cancelled"] == 1
+    assert stats["leader_errors"] == 0
+    assert stats["leaders"] == 2
+    assert stats["in_flight"] == 0
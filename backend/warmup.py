@@ -0,0 +1,152 @@
+# warmup.py
+# ================================================
+# 자주 쓰이는 태그 조합 미리 계산해두기 (startup warm-up)
+# - UI 태그 그리드(BASE/STAY/FOOD)의 단일 태그 + 태그 2개 조합
+#   × 사분면/방향(동·서·남·북) 범위별로 카테고리별 상위 후보를 미리 계산
+# - 결과는 (orig_idx int32, similarity float32) 배열로만 보관해서 작게 유지
+# - 요청 경로에서는 freeText 없는 태그 전용 요청이면 이 표를 바로 읽음
+# ================================================
+
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# 카테고리 → (orig_idx 배열, similarity 배열)
+CompactRanking = Dict[str, Tuple["np.ndarray", "np.ndarray"]]
+
+
+def tag_combinations(tag_keys: Iterable[str], max_size: int = 2) -> List[Tuple[str, ...]]:
+    """단일 태그 + 태그 쌍 (정렬된 tuple)"""
+    keys = sorted(set(tag_keys))
+    combos: List[Tuple[str, ...]] = []
+    for size in range(1, max_size + 1):
+        combos.extend(itertools.combinations(keys, size))
+    return combos
+
+
+class WarmupTable:
+    def __init__(self):
+        self._entries: Dict[Hashable, CompactRanking] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # invalidate 할 때마다 증가 (이전 점수로 계산 중이던 항목은 버림)
+        self._generation = 0
+        # stop() 이후에는 계산을 이어가지 않음 (카탈로그 갱신으로 교체된 인덱스)
+        self._stopped = False
+
+        # 진행 상황
+        self.state = "idle"          # idle / running / done / failed / stopped
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        # 요청 경로 적중률
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(self, key: Hashable) -> Optional[CompactRanking]:
+        entry = self._entries.get(key)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return entry
+
+    def run(
+        self,
+        keys: List[Hashable],
+        compute: Callable[[Hashable], Optional[CompactRanking]],
+    ) -> None:
+        self.state = "running"
+        self.total = len(keys)
+        self.started_at = time.time()
+        try:
+            while True:
+                generation = self._generation
+                self.done = 0
+                self.failed = 0
+                for key in keys:
+                    if self._generation != generation or self._stopped:
+                        break
+                    try:
+                        entry = compute(key)
+                    except Exception:
+                        self.failed += 1
+                        entry = None
+                    if entry is not None:
+                        with self._lock:
+                            if self._generation == generation:
+                                self._entries[key] = entry
+                    self.done += 1
+                else:
+                    break
+                if self._stopped:
+                    break
+                # 도중에 invalidate 됨 → 처음부터 다시
+            self.state = "stopped" if self._stopped else "done"
+        except BaseException:
+            self.state = "failed"
+            raise
+        finally:
+            self.finished_at = time.time()
+
+    def invalidate(self) -> None:
+        """
+        랭킹 점수가 바뀌었을 때 (인기도 갱신) 저장된 표를 비움
+        실행 중이면 처음부터 다시 계산, 끝났으면 다음 start_background 부터 다시 채움
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries = {}
+
+    def stop(self) -> None:
+        """실행 중이면 지금 항목까지만 하고 멈춤 (표는 그대로)"""
+        self._stopped = True
+
+    def start_background(
+        self,
+        keys: List[Hashable],
+        compute: Callable[[Hashable], Optional[CompactRanking]],
+    ) -> threading.Thread:
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._thread = threading.Thread(
+            target=self.run, args=(keys, compute), name="warmup", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def nbytes(self) -> int:
+        total = 0
+        for entry in list(self._entries.values()):
+            for idx, sim in entry.values():
+                total += idx.nbytes + sim.nbytes
+        return total
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        lookups = hits + misses
+        return {
+            "state": self.state,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "progress": round(self.done / self.total, 4) if self.total else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.nbytes(),
+            "elapsed_sec": elapsed,
+            "hits": hits,
+            "misses": misses,
+            "coverage": round(hits / lookups, 4) if lookups else None,
+        }